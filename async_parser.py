@@ -0,0 +1,188 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional
+
+try:
+    import aiohttp
+except ImportError:  # aiohttp нужен только для асинхронного парсера
+    aiohttp = None
+
+import exporters
+from extractor import SelectorStrategy, extract_cards, load_fields
+from fetchers import DEFAULT_HEADERS, FetchError
+from metrics import Metrics
+from prices import normalize_batch
+from scheduler import CrawlState, PageScheduler, RateLimiter
+
+
+class AsyncDivanParser:
+    """
+    Асинхронный парсер товаров с сайта divan.ru (asyncio + aiohttp, без браузера).
+
+    Страницы всех категорий загружаются одновременно (до concurrency запросов
+    в полёте), HTML разбирается в пуле потоков, чтобы не держать event loop,
+    а товары через асинхронную очередь уходят в экспортер (AsyncExportSink).
+    Ожидание сети, разбор и запись на диск идут параллельно.
+
+    Страницы, которым нужен JS, не поддерживаются — для них есть DivanParser.
+    """
+
+    BASE_URL = "https://www.divan.ru/category/"
+    PAGE_LIMIT = PageScheduler.PAGE_LIMIT  # страниц на категорию, если max_pages не задан
+
+    def __init__(self, export_format: str = "sqlite", base_url: str = None,
+                 max_pages: int = None, concurrency: int = 8, rate: float = 0.5,
+                 parse_workers: int = None, queue_size: int = 100, timeout: float = 20,
+                 selectors: str = None, learn_selectors: bool = True):
+        """
+        :param export_format: Формат сохранения ('csv', 'json', 'sqlite', 'parquet')
+        :param base_url: Адрес, к которому дописывается категория (по умолчанию BASE_URL)
+        :param max_pages: Сколько страниц категории обходить (None — все)
+        :param concurrency: Сколько запросов одновременно (на все категории вместе)
+        :param rate: Запросов в секунду к сайту (0 — без ограничения)
+        :param parse_workers: Потоков для разбора HTML (None — по числу ядер)
+        :param queue_size: Сколько страниц может ждать записи в экспорт
+        :param timeout: Таймаут запроса в секундах
+        :param selectors: Файл конфигурации полей и селекторов (см. extractor.load_fields)
+        :param learn_selectors: Пробовать первым селектор, который чаще срабатывает
+        """
+        if aiohttp is None:
+            raise ImportError("Для асинхронного парсера установи aiohttp: pip install aiohttp")
+        self.export_format = export_format.lower()
+        self.base_url = base_url or self.BASE_URL
+        self.max_pages = max_pages
+        self.concurrency = max(1, concurrency)
+        self.rate_limiter = RateLimiter(rate)
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.logger = logging.getLogger("DivanParser")
+        self.metrics = Metrics()
+        self.selectors = SelectorStrategy(
+            load_fields(selectors) if selectors else None, learn=learn_selectors
+        )
+        self._parse_pool = ThreadPoolExecutor(max_workers=parse_workers, thread_name_prefix="parse")
+        self.products = []  # товары, если экспорт не открыт
+        self.sink = None  # асинхронная очередь в экспортер
+
+    async def start_export(self, output_path: str = None):
+        """
+        Открываем экспорт: товары страниц пишутся в файл/базу в фоне по мере готовности.
+        :param output_path: Путь к файлу для сохранения. Если None, создаётся в examples/
+        """
+        # Экспортер импортируется только выбранный (pyarrow — лишь для parquet)
+        exporter = exporters.create_exporter(self.export_format, output_path)
+        self.sink = exporters.AsyncExportSink(exporter, queue_size=self.queue_size)
+        await self.sink.start()
+
+    async def finish_export(self) -> int:
+        """
+        Дописываем очередь и закрываем экспорт.
+        :return: Сколько записей сохранено
+        """
+        if self.sink is None:
+            return 0
+        sink, self.sink = self.sink, None
+        return await sink.close()
+
+    async def crawl(self, categories: List[str]) -> int:
+        """
+        Обходим все страницы всех категорий одновременно.
+        :return: Число страниц с товарами
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        connector = aiohttp.TCPConnector(limit=self.concurrency)
+        async with aiohttp.ClientSession(
+            headers=DEFAULT_HEADERS,
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        ) as session:
+            pages = await asyncio.gather(*(
+                self._crawl_category(session, semaphore, category) for category in categories
+            ))
+        return sum(pages)
+
+    async def _crawl_category(self, session, semaphore: asyncio.Semaphore, category: str) -> int:
+        """
+        Обход страниц одной категории: до concurrency страниц вперёд,
+        до первой страницы без новых товаров (CrawlState, как у PageScheduler).
+        """
+        url = self.base_url + category
+        self.logger.info(f"Начинаю парсинг категории: {category} ({url})")
+        state = CrawlState(url, self.max_pages, self.PAGE_LIMIT)
+        in_flight = {}
+
+        while True:
+            while len(in_flight) < self.concurrency and state.has_next():
+                number, address = state.take()
+                task = asyncio.create_task(self._fetch_page(session, semaphore, category, address))
+                in_flight[task] = number
+
+            if not in_flight:
+                break
+
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                fresh = state.accept(in_flight.pop(task), task.result())
+                if fresh is not None:
+                    await self._collect(fresh)
+
+        state.report(self.logger)
+        self.logger.info(f"✅ Парсинг категории {category} завершён, страниц: {state.pages}")
+        return state.pages
+
+    async def _fetch_page(self, session, semaphore: asyncio.Semaphore,
+                          category: str, url: str) -> Optional[List[Dict]]:
+        """Загружаем страницу и разбираем её в пуле потоков. None — страница не загрузилась."""
+        throttled = self.rate_limiter.reserve(url)
+        if throttled:
+            await asyncio.sleep(throttled)
+        self.metrics.observe("phase_seconds", throttled, phase="throttle")
+
+        async with semaphore:
+            start = time.monotonic()
+            try:
+                page_source = await self._download(session, url)
+            except FetchError as e:
+                self.metrics.inc("page_errors")
+                self.logger.error(f"Ошибка загрузки страницы {url}: {e}")
+                return None
+            loaded = time.monotonic() - start
+        self.rate_limiter.observe(url, loaded)
+        self.metrics.observe("phase_seconds", loaded, phase="page_load")
+
+        loop = asyncio.get_running_loop()
+        with self.metrics.timer("phase_seconds", phase="extraction"):
+            return await loop.run_in_executor(
+                self._parse_pool, self._parse, page_source, category, url
+            )
+
+    async def _download(self, session, url: str) -> str:
+        try:
+            async with session.get(url) as response:
+                if response.status >= 400:
+                    raise FetchError(f"{url}: HTTP {response.status}", status=response.status)
+                return await response.text(errors="replace")
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise FetchError(f"{url}: {e!r}") from e
+
+    def _parse(self, page_source: str, category: str, url: str) -> List[Dict]:
+        """Разбор страницы и нормализация цен (выполняется в пуле потоков)."""
+        products = extract_cards(
+            page_source, category, base_url=url,
+            logger=self.logger, metrics=self.metrics, strategy=self.selectors,
+        )
+        return normalize_batch(products)
+
+    async def _collect(self, products: List[Dict]):
+        """Передаём товары страницы в очередь экспорта или копим их в self.products."""
+        if self.sink is not None:
+            await self.sink.put(products)
+        else:
+            self.products.extend(products)
+
+    async def close(self):
+        """Закрываем экспорт и пул потоков разбора."""
+        await self.finish_export()
+        self._parse_pool.shutdown()
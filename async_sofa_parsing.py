@@ -0,0 +1,95 @@
+import argparse
+import asyncio
+import os
+
+from async_parser import AsyncDivanParser
+
+
+async def run(args):
+    """Обход категорий и экспорт в одном event loop."""
+    divan_parser = AsyncDivanParser(
+        export_format=args.format,
+        max_pages=args.max_pages,
+        concurrency=args.concurrency,
+        rate=args.rate,
+        parse_workers=args.parse_workers,
+        selectors=args.selectors,
+    )
+    output_path = args.output or os.path.join("examples", f"products.{args.format}")
+
+    try:
+        # Товары пишутся в файл в фоне, пока загружаются следующие страницы
+        await divan_parser.start_export(output_path)
+        await divan_parser.crawl(args.category)
+        count = await divan_parser.finish_export()
+        print(f"\n✅ Парсинг завершён. Сохранено записей: {count}, файл: {output_path}")
+    finally:
+        await divan_parser.close()
+        if args.metrics:
+            divan_parser.metrics.write_json(args.metrics)
+
+
+def main():
+    """Асинхронный запуск парсинга товаров с divan.ru (без браузера)."""
+    parser_args = argparse.ArgumentParser(
+        description="Асинхронный парсер товаров с divan.ru (aiohttp, без браузера)"
+    )
+    parser_args.add_argument(
+        "--category",
+        nargs="+",
+        default=["svet", "divany-i-kresla", "stoly-i-stulya"],
+        help="Категории для парсинга (через пробел). "
+        "Пример: --category svet divany-i-kresla",
+    )
+    parser_args.add_argument(
+        "--format",
+        choices=["csv", "json", "sqlite", "parquet"],
+        default="csv",
+        help="Формат сохранения данных (csv, json, sqlite, parquet)",
+    )
+    parser_args.add_argument(
+        "--output",
+        default=None,
+        help="Путь к файлу для сохранения. Пример: --output examples/products.csv",
+    )
+    parser_args.add_argument(
+        "--max-pages",
+        type=int,
+        default=None,
+        help="Сколько страниц каждой категории обходить (по умолчанию все)",
+    )
+    parser_args.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Сколько запросов одновременно (на все категории вместе)",
+    )
+    parser_args.add_argument(
+        "--rate",
+        type=float,
+        default=0.5,
+        help="Запросов в секунду к сайту, чтобы сайт не забанил (0 — без ограничения)",
+    )
+    parser_args.add_argument(
+        "--parse-workers",
+        type=int,
+        default=None,
+        help="Потоков для разбора HTML (по умолчанию по числу ядер)",
+    )
+    parser_args.add_argument(
+        "--selectors",
+        default=None,
+        help="Файл с полями и цепочками селекторов (YAML / JSON)",
+    )
+    parser_args.add_argument(
+        "--metrics",
+        default=None,
+        help="Сохранить JSON-сводку метрик",
+    )
+    args = parser_args.parse_args()
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
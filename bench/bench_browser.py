@@ -0,0 +1,83 @@
+"""
+Бенчмарк профиля Chrome: полная загрузка страниц против лёгкого профиля
+(без картинок, шрифтов, медиа и сторонних счётчиков, стратегия eager).
+
+Нужны установленный Chrome и доступ к divan.ru: страницы категории открываются
+по-настоящему. Для каждого профиля считаются страницы в минуту и переданные байты
+(по Resource Timing API: документ и все загруженные ресурсы, заблокированные
+запросы в сумму не попадают).
+
+Запуск:
+    python -m bench.bench_browser --category svet --pages 5
+"""
+import argparse
+import logging
+import time
+
+from parser import DivanParser
+from scheduler import page_url
+
+# Байты, переданные по сети для текущей страницы (документ + ресурсы)
+TRANSFERRED_SCRIPT = """
+return performance.getEntriesByType('navigation')
+    .concat(performance.getEntriesByType('resource'))
+    .reduce(function (total, entry) { return total + (entry.transferSize || 0); }, 0);
+"""
+
+
+def run(lean: bool, url: str, pages: int, settle: float) -> dict:
+    """Открываем pages страниц категории в профиле и меряем время и трафик."""
+    divan_parser = DivanParser(extraction="batch", lean_browser=lean, headless=True)
+    transferred = 0
+    products = 0
+    try:
+        driver = divan_parser._get_driver()  # запуск Chrome в замер не входит
+        start = time.perf_counter()
+        for page in range(1, pages + 1):
+            address = page_url(url, page)
+            products += len(divan_parser._fetch_with_driver("bench", address) or [])
+            # Догружающиеся после готовности ресурсы тоже считаем в трафик
+            time.sleep(settle)
+            transferred += driver.execute_script(TRANSFERRED_SCRIPT)
+        elapsed = time.perf_counter() - start - settle * pages
+    finally:
+        divan_parser.close()
+
+    return {
+        "profile": "lean" if lean else "full",
+        "pages_per_min": pages / elapsed * 60,
+        "megabytes": transferred / 1024 / 1024,
+        "products": products,
+    }
+
+
+def main():
+    args = argparse.ArgumentParser(description="Бенчмарк лёгкого профиля Chrome")
+    args.add_argument("--category", default="svet", help="Категория divan.ru")
+    args.add_argument("--pages", type=int, default=5, help="Страниц на профиль")
+    args.add_argument(
+        "--settle", type=float, default=1.0,
+        help="Пауза после готовности страницы перед подсчётом трафика, с (в скорость не входит)",
+    )
+    args = args.parse_args()
+
+    logging.getLogger("DivanParser").setLevel(logging.WARNING)
+
+    url = DivanParser.BASE_URL + args.category
+    results = [run(lean, url, args.pages, args.settle) for lean in (False, True)]
+
+    print(f"Категория: {url}, страниц: {args.pages}")
+    for result in results:
+        print(
+            f"{result['profile']:>5}: {result['pages_per_min']:6.1f} стр/мин, "
+            f"{result['megabytes']:7.2f} МБ, товаров: {result['products']}"
+        )
+    full, lean = results
+    print(
+        f"Скорость: x{lean['pages_per_min'] / full['pages_per_min']:.1f}, "
+        f"трафик: x{full['megabytes'] / max(lean['megabytes'], 1e-9):.1f} меньше"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Бенчмарк извлечения карточек: по-элементный WebDriver против одного снимка page_source.
+
+Реальный браузер не нужен: мок-страница из tests/mock_pages размножается до
+нужного числа карточек, а WebDriver имитируется объектами поверх lxml, где
+каждый вызов (find_element, .text, get_attribute, page_source) — это один
+«round-trip» с настраиваемой задержкой.
+
+Запуск:
+    python -m bench.bench_extraction --cards 200 --latency-ms 2
+"""
+import argparse
+import logging
+import os
+import time
+
+from lxml import html as lxml_html
+from lxml.cssselect import CSSSelector
+from selenium.common.exceptions import NoSuchElementException
+
+from extractor import CARD_SELECTOR
+from parser import DivanParser
+
+MOCK_PAGE = os.path.join(
+    os.path.dirname(__file__), os.pardir, "tests", "mock_pages", "mock_divan.html"
+)
+
+
+def build_page(cards: int) -> str:
+    """Размножаем карточки мок-страницы до нужного количества."""
+    with open(MOCK_PAGE, "r", encoding="utf-8") as f:
+        document = lxml_html.fromstring(f.read())
+
+    container = document.cssselect("div.products")[0]
+    templates = CSSSelector(CARD_SELECTOR)(container)
+    for card in templates:
+        container.remove(card)
+    for i in range(cards):
+        container.append(lxml_html.fromstring(
+            lxml_html.tostring(templates[i % len(templates)], encoding="unicode")
+        ))
+    return lxml_html.tostring(document, encoding="unicode")
+
+
+class RoundTripCounter:
+    """Счётчик и имитация задержки WebDriver-запросов."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+
+    def hit(self):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+
+class FakeElement:
+    """WebElement поверх lxml: каждый вызов — отдельный round-trip."""
+
+    _selectors = {}
+
+    def __init__(self, element, counter: RoundTripCounter):
+        self._element = element
+        self._counter = counter
+
+    @classmethod
+    def _css(cls, by: str, value: str) -> CSSSelector:
+        if by == "class name":
+            value = "." + value
+        if value not in cls._selectors:
+            cls._selectors[value] = CSSSelector(value)
+        return cls._selectors[value]
+
+    def find_element(self, by, value):
+        self._counter.hit()
+        found = self._css(by, value)(self._element)
+        if not found:
+            raise NoSuchElementException(value)
+        return FakeElement(found[0], self._counter)
+
+    @property
+    def text(self):
+        self._counter.hit()
+        return " ".join(self._element.text_content().split())
+
+    def get_attribute(self, name):
+        self._counter.hit()
+        if name == "outerHTML":
+            return lxml_html.tostring(self._element, encoding="unicode")
+        return self._element.get(name)
+
+
+class FakeDriver:
+    """Минимальный WebDriver для DivanParser.parse_category."""
+
+    def __init__(self, page: str, counter: RoundTripCounter):
+        self._page = page
+        self._document = lxml_html.fromstring(page)
+        self._counter = counter
+
+    def get(self, url):
+        pass
+
+    def execute_script(self, script, selector, empty_selectors):
+        """Опрос готовности страницы (utils.wait_for_cards) — тоже один round-trip."""
+        self._counter.hit()
+        cards = len(CSSSelector(selector)(self._document))
+        return {"cards": cards, "empty": False, "ready": "complete"}
+
+    def find_elements(self, by, value):
+        self._counter.hit()
+        return [
+            FakeElement(card, self._counter)
+            for card in CSSSelector(value)(self._document)
+        ]
+
+    @property
+    def page_source(self):
+        self._counter.hit()
+        return self._page
+
+    def quit(self):
+        pass
+
+
+def run(extraction: str, page: str, latency: float, repeat: int) -> dict:
+    """Прогоняем parse_category в выбранном режиме и меряем время."""
+    timings = []
+    calls = 0
+    products = []
+    for _ in range(repeat):
+        counter = RoundTripCounter(latency)
+        # Карточки — копии нескольких карточек мок-страницы: отсев повторов оставил бы их три
+        divan_parser = DivanParser(extraction=extraction, max_pages=1, rate=0, dedup=False)
+        divan_parser.driver = FakeDriver(page, counter)
+        start = time.perf_counter()
+        divan_parser.parse_category("svet")
+        timings.append(time.perf_counter() - start)
+        calls = counter.calls
+        products = divan_parser.products
+        divan_parser.close()
+    return {
+        "extraction": extraction,
+        "best": min(timings),
+        "round_trips": calls,
+        "products": products,
+    }
+
+
+def main():
+    args = argparse.ArgumentParser(description="Бенчмарк извлечения карточек")
+    args.add_argument("--cards", type=int, default=200, help="Карточек на странице")
+    args.add_argument(
+        "--latency-ms", type=float, default=2.0,
+        help="Имитируемая задержка одного запроса к WebDriver, мс",
+    )
+    args.add_argument("--repeat", type=int, default=3, help="Число повторов")
+    args = args.parse_args()
+
+    # Логи по каждому товару не должны влиять на замер
+    logging.getLogger("DivanParser").setLevel(logging.WARNING)
+
+    page = build_page(args.cards)
+    latency = args.latency_ms / 1000
+    results = [run(mode, page, latency, args.repeat) for mode in DivanParser.EXTRACTION_MODES]
+
+    assert results[0]["products"] == results[1]["products"], "Режимы дали разные данные"
+
+    print(f"Карточек: {args.cards}, задержка WebDriver: {args.latency_ms} мс")
+    for result in results:
+        print(
+            f"{result['extraction']:>10}: {result['best'] * 1000:9.1f} мс, "
+            f"round-trips: {result['round_trips']}, "
+            f"товаров: {len(result['products'])}"
+        )
+    print(f"Ускорение: x{results[0]['best'] / results[1]['best']:.1f}")
+
+
+if __name__ == "__main__":
+    main()
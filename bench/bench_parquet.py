@@ -0,0 +1,109 @@
+"""
+Бенчмарк форматов экспорта: размер файла, время записи и время загрузки
+для CSV, JSON, JSON Lines, SQLite и Parquet на синтетическом каталоге.
+
+Запуск:
+    python -m bench.bench_parquet --rows 1000000
+"""
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import sqlite3
+import tempfile
+import time
+
+import pyarrow.parquet as pq
+
+from exporters import CSVExporter, JSONExporter, SQLiteExporter, ParquetExporter
+from prices import normalize_batch
+
+PAGE_SIZE = 100  # товаров на странице категории
+CATEGORIES = ["svet", "divany-i-kresla", "stoly-i-stulya", "krovati", "shkafy"]
+
+
+def synthetic_pages(rows: int):
+    """Генератор страниц синтетических товаров с нормализованной ценой."""
+    for start in range(0, rows, PAGE_SIZE):
+        yield normalize_batch([
+            {
+                "name": f"Диван прямой Модель {i}",
+                "price": f"{10000 + i % 90000} ₽",
+                "link": f"https://www.divan.ru/product/divan-{i}",
+                "category": CATEGORIES[i % len(CATEGORIES)],
+            }
+            for i in range(start, min(start + PAGE_SIZE, rows))
+        ])
+
+
+def load_csv(path):
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        return list(csv.DictReader(f, delimiter=";"))
+
+
+def load_json(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_jsonl(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def load_sqlite(path):
+    with contextlib.closing(sqlite3.connect(path)) as conn:
+        return conn.execute("SELECT * FROM products").fetchall()
+
+
+def load_parquet(path):
+    return pq.read_table(path)
+
+
+FORMATS = [
+    ("csv", "products.csv", CSVExporter, load_csv),
+    ("json", "products.json", JSONExporter, load_json),
+    ("jsonl", "products.jsonl", JSONExporter, load_jsonl),
+    ("sqlite", "products.db", SQLiteExporter, load_sqlite),
+    ("parquet", "products.parquet", ParquetExporter, load_parquet),
+]
+
+
+def file_size(path: str) -> int:
+    """Размер файла вместе с WAL-журналом SQLite, если он остался."""
+    return sum(
+        os.path.getsize(name) for name in (path, path + "-wal") if os.path.exists(name)
+    )
+
+
+def main():
+    args = argparse.ArgumentParser(description="Бенчмарк форматов экспорта")
+    args.add_argument("--rows", type=int, default=1_000_000, help="Число товаров")
+    args = args.parse_args()
+
+    print(f"Товаров: {args.rows}")
+    print(f"{'формат':>8} {'размер, МБ':>11} {'запись, с':>10} {'загрузка, с':>12}")
+    with tempfile.TemporaryDirectory() as directory:
+        for title, filename, exporter_class, load in FORMATS:
+            path = os.path.join(directory, filename)
+
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()), exporter_class(path) as exporter:
+                for page in synthetic_pages(args.rows):
+                    exporter.write_batch(page)
+            written = time.perf_counter() - start
+
+            start = time.perf_counter()
+            load(path)
+            loaded = time.perf_counter() - start
+
+            print(
+                f"{title:>8} {file_size(path) / 2**20:>11.1f} "
+                f"{written:>10.2f} {loaded:>12.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
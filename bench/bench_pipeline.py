@@ -0,0 +1,295 @@
+"""
+Офлайн-бенчмарк всего конвейера DivanParser: загрузка (из корпуса), извлечение
+карточек, нормализация цен, отсев повторов и запись каждым экспортером.
+
+Сеть не нужна: страницы отдаёт CorpusFetcher вместо HTTPFetcher. Корпус —
+записанные страницы (по умолчанию tests/mock_pages/mock_divan.html, свои — через
+--corpus DIR с *.html или --cache FILE с кэшем страниц из --cache) и синтетические
+категории: карточки записанных страниц размножаются до --cards на странице
+с уникальными ссылками.
+
+Каждый экспортер мерится в отдельном процессе: пропускная способность (товаров
+и страниц в секунду), перцентили времени обработки страницы и пиковый RSS.
+Результаты сравниваются с сохранённым базовым замером: просадка больше
+--tolerance считается регрессией (код выхода 1).
+
+Запуск:
+    python -m bench.bench_pipeline                      # сравнить с базовым замером
+    python -m bench.bench_pipeline --save-baseline      # записать новый базовый замер
+    python -m bench.bench_pipeline --categories 10 --pages 20 --cards 100
+"""
+import argparse
+import glob
+import json
+import logging
+import multiprocessing
+import os
+import resource
+import sqlite3
+import sys
+import tempfile
+import time
+from typing import List, Dict
+from urllib.parse import parse_qsl, urlsplit
+
+from lxml import html as lxml_html
+from lxml.cssselect import CSSSelector
+
+from exporters import parquet_exporter
+from extractor import CARD_SELECTOR
+from parser import DivanParser
+
+MOCK_PAGE = os.path.join(
+    os.path.dirname(__file__), os.pardir, "tests", "mock_pages", "mock_divan.html"
+)
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline_pipeline.json")
+BASE_URL = "http://corpus.local/category/"
+RECORDED = "recorded"
+
+# Страница за последней: признак пустой категории, на нём обход категории заканчивается
+EMPTY_PAGE = '<html><body><div data-testid="empty-catalog"></div></body></html>'
+
+_CARDS = CSSSelector(CARD_SELECTOR)
+
+
+def load_recorded(corpus: str = None, cache: str = None) -> List[str]:
+    """Записанные страницы: файлы *.html из папки, тела из кэша страниц или мок-страница."""
+    if cache:
+        with sqlite3.connect(cache) as conn:
+            return [body for (body,) in conn.execute("SELECT body FROM pages ORDER BY url")]
+    paths = sorted(glob.glob(os.path.join(corpus, "*.html"))) if corpus else [MOCK_PAGE]
+    pages = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            pages.append(f.read())
+    return pages
+
+
+def scale_page(recorded: List[str], cards: int, tag: str) -> str:
+    """
+    Синтетическая страница категории: оболочка первой записанной страницы
+    и cards карточек из всех записанных страниц по кругу, ссылки уникальны по tag.
+    """
+    templates = [
+        lxml_html.tostring(card, encoding="unicode")
+        for page in recorded for card in _CARDS(lxml_html.fromstring(page))
+    ]
+    document = lxml_html.fromstring(recorded[0])
+    existing = _CARDS(document)
+    container = existing[0].getparent()
+    for card in existing:
+        container.remove(card)
+    for i in range(cards):
+        card = lxml_html.fromstring(templates[i % len(templates)])
+        for link in card.iter("a"):
+            if link.get("href"):
+                link.set("href", f"{link.get('href').rstrip('/')}-{tag}-{i}")
+        container.append(card)
+    return lxml_html.tostring(document, encoding="unicode")
+
+
+def build_corpus(recorded: List[str], categories: int, pages: int, cards: int) -> Dict[str, List[str]]:
+    """Категория -> страницы: записанная категория и categories синтетических."""
+    corpus = {RECORDED: recorded}
+    for c in range(categories):
+        category = f"synthetic-{c}"
+        corpus[category] = [scale_page(recorded, cards, f"{c}-{p}") for p in range(pages)]
+    return corpus
+
+
+class CorpusFetcher:
+    """Вместо HTTPFetcher: отдаёт страницы корпуса по адресу категории и ?page=N."""
+
+    def __init__(self, corpus: Dict[str, List[str]]):
+        self.corpus = corpus
+
+    def fetch_conditional(self, url: str, etag: str = None, last_modified: str = None):
+        parts = urlsplit(url)
+        category = parts.path.rsplit("/", 1)[-1]
+        number = int(dict(parse_qsl(parts.query)).get("page", 1))
+        pages = self.corpus.get(category, [])
+        body = pages[number - 1] if number <= len(pages) else EMPTY_PAGE
+        return body, None, None
+
+    def fetch(self, url: str) -> str:
+        return self.fetch_conditional(url)[0]
+
+    def close(self):
+        pass
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Перцентиль по ближайшему рангу."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(q * len(ordered)) - 1))]
+
+
+def run_once(export_format: str, corpus: Dict[str, List[str]], concurrency: int) -> Dict:
+    """Один проход конвейера: время, число товаров и время обработки каждой страницы."""
+    streaming = export_format != "memory"
+    parser = DivanParser(
+        export_format=export_format if streaming else "csv",
+        engine="http", base_url=BASE_URL, js_fallback=False, rate=0, concurrency=concurrency,
+    )
+    parser.fetcher.close()
+    parser.fetcher = CorpusFetcher(corpus)
+
+    # Время страницы — извлечение и нормализация плюс передача в экспорт
+    page_seconds = []
+    fetch_page, collect = parser._fetch_page, parser._collect
+
+    def timed_fetch(category, url):
+        start = time.perf_counter()
+        products = fetch_page(category, url)
+        page_seconds.append(time.perf_counter() - start)
+        return products
+
+    def timed_collect(products):
+        start = time.perf_counter()
+        collect(products)
+        page_seconds[-1] += time.perf_counter() - start
+
+    parser._fetch_page, parser._collect = timed_fetch, timed_collect
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        if streaming:
+            parser.start_export(os.path.join(directory, f"products.{export_format}"))
+        pages = sum(parser.parse_category(category) for category in corpus)
+        products = parser.finish_export() if streaming else len(parser.products)
+        elapsed = time.perf_counter() - start
+        parser.close()
+    return {"seconds": elapsed, "pages": pages, "products": products, "page_seconds": page_seconds}
+
+
+def run_case(export_format: str, corpus: Dict[str, List[str]], concurrency: int,
+             repeat: int, results):
+    """Замер одного экспортера в дочернем процессе: лучший из repeat проходов и пиковый RSS."""
+    logging.getLogger("DivanParser").setLevel(logging.WARNING)
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    best = min((run_once(export_format, corpus, concurrency) for _ in range(repeat)),
+               key=lambda run: run["seconds"])
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # КиБ (Linux)
+    results.put((export_format, {
+        "products": best["products"],
+        "pages": best["pages"],
+        "seconds": round(best["seconds"], 4),
+        "products_per_s": round(best["products"] / best["seconds"], 1),
+        "pages_per_s": round(best["pages"] / best["seconds"], 1),
+        "p50_ms": round(percentile(best["page_seconds"], 0.50) * 1000, 3),
+        "p95_ms": round(percentile(best["page_seconds"], 0.95) * 1000, 3),
+        "p99_ms": round(percentile(best["page_seconds"], 0.99) * 1000, 3),
+        "peak_mb": round(peak / 1024, 1),
+        "growth_mb": round((peak - before) / 1024, 1),
+    }))
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float) -> List[str]:
+    """Регрессии относительно базового замера: медленнее, дольше в p95 или больше памяти."""
+    regressions = []
+    for export_format, current in results.items():
+        previous = baseline.get(export_format)
+        if previous is None:
+            continue
+        checks = [
+            ("товаров/с", previous["products_per_s"], current["products_per_s"], False),
+            ("p95, мс", previous["p95_ms"], current["p95_ms"], True),
+            ("пик RSS, МБ", previous["peak_mb"], current["peak_mb"], True),
+        ]
+        for label, old, new, higher_is_worse in checks:
+            change = (new - old) / old if old else 0.0
+            if (change if higher_is_worse else -change) > tolerance:
+                regressions.append(f"{export_format}: {label} {old} → {new} ({change:+.0%})")
+    return regressions
+
+
+def main():
+    args = argparse.ArgumentParser(description="Офлайн-бенчмарк конвейера DivanParser")
+    args.add_argument("--corpus", default=None, help="Папка с записанными страницами *.html")
+    args.add_argument("--cache", default=None, help="Кэш страниц (--cache парсера) как корпус")
+    args.add_argument("--categories", type=int, default=8, help="Синтетических категорий")
+    args.add_argument("--pages", type=int, default=20, help="Страниц в синтетической категории")
+    args.add_argument("--cards", type=int, default=60, help="Карточек на синтетической странице")
+    args.add_argument("--concurrency", type=int, default=1, help="Страниц одновременно")
+    args.add_argument("--repeat", type=int, default=3, help="Проходов на экспортер (берётся лучший)")
+    args.add_argument(
+        "--exporters", nargs="+", default=["memory", "csv", "json", "sqlite", "parquet"],
+        help="Какие экспортеры мерить (memory — без экспорта, товары в списке)",
+    )
+    args.add_argument("--baseline", default=BASELINE, help="Файл базового замера")
+    args.add_argument("--save-baseline", action="store_true", help="Записать замер как базовый")
+    args.add_argument(
+        "--tolerance", type=float, default=0.2,
+        help="Допустимое ухудшение относительно базового замера (0.2 — 20%%)",
+    )
+    args = args.parse_args()
+
+    exporters = [
+        name for name in args.exporters
+        if name != "parquet" or parquet_exporter.pa is not None
+    ]
+    recorded = load_recorded(args.corpus, args.cache)
+    corpus = build_corpus(recorded, args.categories, args.pages, args.cards)
+    params = {
+        "corpus": args.cache or args.corpus or "mock_divan.html",
+        "recorded_pages": len(recorded),
+        "categories": args.categories,
+        "pages": args.pages,
+        "cards": args.cards,
+        "concurrency": args.concurrency,
+    }
+
+    queue = multiprocessing.Queue()
+    results = {}
+    for name in exporters:
+        process = multiprocessing.Process(
+            target=run_case, args=(name, corpus, args.concurrency, args.repeat, queue)
+        )
+        process.start()
+        export_format, result = queue.get()
+        process.join()
+        results[export_format] = result
+
+    print(
+        f"Корпус: {params['corpus']} ({len(recorded)} записанных стр.) + "
+        f"{args.categories} синтетических категорий × {args.pages} стр. × {args.cards} карточек"
+    )
+    print(
+        f"{'экспорт':>8} {'товаров':>8} {'товаров/с':>10} {'стр./с':>8} "
+        f"{'p50, мс':>8} {'p95, мс':>8} {'p99, мс':>8} {'пик RSS, МБ':>12}"
+    )
+    for name, result in results.items():
+        print(
+            f"{name:>8} {result['products']:>8} {result['products_per_s']:>10} "
+            f"{result['pages_per_s']:>8} {result['p50_ms']:>8} {result['p95_ms']:>8} "
+            f"{result['p99_ms']:>8} {result['peak_mb']:>12}"
+        )
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"params": params, "results": results}, f, ensure_ascii=False, indent=4)
+        print(f"\nБазовый замер сохранён в {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print("\nБазового замера нет — сохрани его: --save-baseline")
+        return
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline["params"] != params:
+        print("\nПараметры отличаются от базового замера — сравнение пропущено")
+        return
+
+    regressions = compare(results, baseline["results"], args.tolerance)
+    if regressions:
+        print(f"\nРегрессии (больше {args.tolerance:.0%}):")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"\nРегрессий относительно базового замера нет (допуск {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Бенчмарк нормализации цен: один проход по всей странице (normalize_prices)
+против разбора каждой строки отдельно.
+
+Цены берутся из примеров products.csv / products.json (в корне и в examples/)
+и размножаются до нужного числа строк.
+
+Запуск:
+    python -m bench.bench_prices --rows 1000000 --page-size 100
+"""
+import argparse
+import csv
+import json
+import os
+import time
+
+from prices import normalize_prices, _PRICE_LINE, _SEPARATORS, _currency
+
+ROOT = os.path.join(os.path.dirname(__file__), os.pardir)
+SAMPLES = [
+    "products.csv",
+    "products.json",
+    os.path.join("examples", "products.csv"),
+    os.path.join("examples", "products.json"),
+]
+
+def load_sample_prices() -> list:
+    """Все цены из файлов-примеров."""
+    prices = []
+    for name in SAMPLES:
+        path = os.path.join(ROOT, name)
+        if name.endswith(".csv"):
+            with open(path, encoding="utf-8-sig", newline="") as f:
+                prices.extend(row["price"] for row in csv.DictReader(f, delimiter=";"))
+        else:
+            with open(path, encoding="utf-8") as f:
+                prices.extend(item["price"] for item in json.load(f))
+    return prices
+
+
+def per_item(raw_prices: list) -> list:
+    """Тот же разбор, но отдельным вызовом регулярного выражения на каждую цену."""
+    result = []
+    for price in raw_prices:
+        text = (price or "").replace("\n", " ")
+        for separator in _SEPARATORS:
+            text = text.replace(separator, "")
+        prefix, units, cents, suffix = _PRICE_LINE.match(text + "\n").groups()
+        if units is None:
+            result.append((None, None))
+        else:
+            result.append((
+                int(units) * 100 + (int(cents.ljust(2, "0")) if cents else 0),
+                _currency(prefix + suffix),
+            ))
+    return result
+
+
+def run(normalize, prices: list, page_size: int) -> float:
+    start = time.perf_counter()
+    for page in range(0, len(prices), page_size):
+        normalize(prices[page:page + page_size])
+    return time.perf_counter() - start
+
+
+def main():
+    args = argparse.ArgumentParser(description="Бенчмарк нормализации цен")
+    args.add_argument("--rows", type=int, default=1_000_000, help="Число цен")
+    args.add_argument("--page-size", type=int, default=100, help="Цен за один вызов (страница)")
+    args = args.parse_args()
+
+    sample = load_sample_prices()
+    prices = (sample * (args.rows // len(sample) + 1))[:args.rows]
+    with_number = sum(1 for kopecks, _ in normalize_prices(sample) if kopecks is not None)
+    print(f"Цен в примерах: {len(sample)} (с числом: {with_number}), в замере: {len(prices)}")
+    assert normalize_prices(sample) == per_item(sample), "Способы разбора дали разные результаты"
+
+    for title, normalize in (("страницей", normalize_prices), ("по одной", per_item)):
+        elapsed = run(normalize, prices, args.page_size)
+        print(f"{title:>10}: {elapsed:6.2f} с, {len(prices) / elapsed:>12,.0f} цен/с")
+
+
+if __name__ == "__main__":
+    main()
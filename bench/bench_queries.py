@@ -0,0 +1,189 @@
+"""
+Бенчмарк запросов к базе товаров (queries.py) на синтетической базе в --rows товаров.
+
+Сравниваются два способа ответить на вопросы дашборда:
+- полный проход: вся таблица читается в Python, фильтруется и сортируется там —
+  так дашборды работали до queries.py;
+- индексные итераторы queries.py: keyset-страницы по индексам.
+
+Для каждого запроса печатается время до первой строки, время всей выборки
+и число строк. База строится один раз и переиспользуется (--db), пока не
+изменились её параметры.
+
+Запуск:
+    python -m bench.bench_queries                       # 1 000 000 товаров
+    python -m bench.bench_queries --rows 200000 --db /tmp/bench.sqlite
+"""
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from typing import Callable, Dict, Iterator
+
+from database import add_categories, init_db, upsert_products
+from queries import cheapest, ensure_indexes, price_changes, price_range
+
+SALE = "rasprodazha"
+OLD_RUN = "2025-01-01 00:00:00"
+SINCE = "2025-06-01"
+
+
+def build(db_name: str, rows: int, categories: int, seed: int = 1):
+    """
+    Синтетическая база: rows товаров в categories категориях, каждый двадцатый
+    товар ещё и в распродаже, у каждого пятидесятого цена менялась после SINCE.
+    """
+    rng = random.Random(seed)
+    conn = sqlite3.connect(db_name)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    init_db(db_name, None, conn=conn)
+
+    def products(start: int, stop: int, step: int = 1, markup: float = 1.0) -> Iterator[Dict]:
+        for i in range(start, stop, step):
+            kopecks = round(rng.randint(500, 300000) * markup) * 100
+            yield {
+                "name": f"Товар {i}",
+                "price": f"{kopecks // 100} руб.",
+                "link": f"https://www.divan.ru/product/item-{i}",
+                "category": f"category-{i % categories}",
+                "price_kopecks": kopecks,
+                "currency": "RUB",
+            }
+
+    chunk = 100000
+    for start in range(0, rows, chunk):
+        upsert_products(conn, products(start, min(rows, start + chunk)), chunk_size=chunk)
+    add_categories(conn, ((f"https://www.divan.ru/product/item-{i}", SALE) for i in range(0, rows, 20)))
+
+    # Первая загрузка — «давний запуск», затем новые цены у каждого пятидесятого товара
+    with conn:
+        conn.execute("UPDATE price_history SET changed_at = ?", (OLD_RUN,))
+    upsert_products(conn, products(0, rows, step=50, markup=0.9), chunk_size=chunk)
+    with conn:
+        conn.execute("CREATE TABLE bench_params (rows INTEGER, categories INTEGER)")
+        conn.execute("INSERT INTO bench_params VALUES (?, ?)", (rows, categories))
+    conn.close()
+
+
+def is_built(db_name: str, rows: int, categories: int) -> bool:
+    if not os.path.exists(db_name):
+        return False
+    with sqlite3.connect(db_name) as conn:
+        try:
+            return conn.execute("SELECT rows, categories FROM bench_params").fetchone() == (rows, categories)
+        except sqlite3.OperationalError:
+            return False
+
+
+# ====== Полный проход в Python ======
+def scan_products(conn: sqlite3.Connection):
+    return conn.execute(
+        "SELECT id, name, price, price_kopecks, currency, link, category FROM products"
+    ).fetchall()
+
+
+def scan_range(conn, category, low, high):
+    members = {link for (link,) in conn.execute(
+        "SELECT link FROM product_categories WHERE category = ?", (category,)
+    )}
+    rows = [row for row in scan_products(conn)
+            if row[5] in members and row[3] is not None and low <= row[3] <= high]
+    return iter(sorted(rows, key=lambda row: (row[3], row[0])))
+
+
+def scan_cheapest(conn, limit):
+    rows = [row for row in scan_products(conn) if row[3] is not None]
+    return iter(sorted(rows, key=lambda row: (row[3], row[0]))[:limit])
+
+
+def scan_changes(conn, since):
+    history = conn.execute("SELECT id, link, changed_at, price FROM price_history").fetchall()
+    previous, changes = {}, []
+    for row_id, link, changed_at, price in sorted(history, key=lambda row: row[0]):
+        if changed_at >= since and link in previous:
+            changes.append((row_id, link, changed_at, price, previous[link]))
+        previous[link] = price
+    return iter(changes)
+
+
+def measure(rows: Callable[[], Iterator]) -> Dict:
+    """Время до первой строки и до последней, число строк."""
+    start = time.perf_counter()
+    iterator = rows()
+    first = None
+    count = 0
+    for _ in iterator:
+        if first is None:
+            first = time.perf_counter() - start
+        count += 1
+    total = time.perf_counter() - start
+    return {"first_ms": round((first or total) * 1000, 2), "total_ms": round(total * 1000, 2), "rows": count}
+
+
+def main():
+    args = argparse.ArgumentParser(description="Бенчмарк индексных запросов queries.py")
+    args.add_argument("--rows", type=int, default=1000000, help="Товаров в синтетической базе")
+    args.add_argument("--categories", type=int, default=20, help="Категорий")
+    args.add_argument("--db", default=None, help="Файл базы (сохраняется между запусками)")
+    args.add_argument("--page-size", type=int, default=1000, help="Строк на страницу итератора")
+    args = args.parse_args()
+
+    directory = None
+    db_name = args.db
+    if db_name is None:
+        directory = tempfile.TemporaryDirectory()
+        db_name = os.path.join(directory.name, "bench.sqlite")
+    if not is_built(db_name, args.rows, args.categories):
+        if os.path.exists(db_name):
+            os.remove(db_name)
+        start = time.perf_counter()
+        build(db_name, args.rows, args.categories)
+        print(f"База: {args.rows} товаров построена за {time.perf_counter() - start:.1f} с")
+
+    conn = sqlite3.connect(db_name)
+    start = time.perf_counter()
+    ensure_indexes(conn)
+    print(f"Индексы: {(time.perf_counter() - start) * 1000:.0f} мс (один раз на базу)")
+    conn.row_factory = sqlite3.Row
+
+    category, low, high = "category-3", 1000000, 2000000  # 10–20 тыс. руб.
+    size = args.page_size
+    cases = [
+        ("диапазон цен в категории",
+         lambda: scan_range(conn, category, low, high),
+         lambda: price_range(conn, category, low, high, page_size=size)),
+        ("диапазон цен в распродаже",
+         lambda: scan_range(conn, SALE, low, high),
+         lambda: price_range(conn, SALE, low, high, page_size=size)),
+        ("вся категория по цене",
+         lambda: scan_range(conn, category, -2 ** 63, 2 ** 63 - 1),
+         lambda: price_range(conn, category, page_size=size)),
+        ("20 самых дешёвых",
+         lambda: scan_cheapest(conn, 20),
+         lambda: cheapest(conn, 20, page_size=size)),
+        ("20 самых дешёвых в категории",
+         lambda: iter(list(scan_range(conn, category, -2 ** 63, 2 ** 63 - 1))[:20]),
+         lambda: cheapest(conn, 20, category, page_size=size)),
+        (f"изменения цен с {SINCE}",
+         lambda: scan_changes(conn, SINCE),
+         lambda: price_changes(conn, SINCE, page_size=size)),
+    ]
+
+    print(f"\n{'запрос':<30} {'способ':<10} {'1-я строка, мс':>15} {'всего, мс':>11} {'строк':>8}")
+    for title, scan, indexed in cases:
+        for method, rows in (("проход", scan), ("индекс", indexed)):
+            result = measure(rows)
+            print(
+                f"{title:<30} {method:<10} {result['first_ms']:>15} "
+                f"{result['total_ms']:>11} {result['rows']:>8}"
+            )
+    conn.close()
+    if directory is not None:
+        directory.cleanup()
+
+
+if __name__ == "__main__":
+    main()
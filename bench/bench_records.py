@@ -0,0 +1,109 @@
+"""
+Бенчмарк памяти записей товаров: словари против Product (records.py).
+
+В отдельном процессе на каждый вид строится --rows товаров так же, как их
+собирает парсер в self.products: поля карточки, категория, нормализованная цена
+страницами по 60 карточек. Затем все товары пишутся CSVExporter'ом — записи
+уходят в экспорт без перевода в словари.
+
+Печатаются прирост RSS процесса (всего и на товар) и время сборки и записи CSV.
+
+Запуск:
+    python -m bench.bench_records                 # 1 000 000 товаров
+    python -m bench.bench_records --rows 200000
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+
+from exporters.csv_exporter import CSVExporter
+from extractor import NO_PRICE
+from prices import normalize_batch
+from records import Product
+
+PAGE = 60
+CATEGORIES = ["svet", "divany-i-kresla", "stoly-i-stulya", "krovati", "shkafy"]
+
+
+def build(kind: str, rows: int) -> list:
+    """Товары в том виде, в каком они копятся в DivanParser.products."""
+    products = []
+    for start in range(0, rows, PAGE):
+        category = CATEGORIES[start // PAGE % len(CATEGORIES)]
+        page = []
+        for i in range(start, min(rows, start + PAGE)):
+            # Строки создаются заново для каждой карточки, как при разборе HTML
+            price = NO_PRICE if i % 50 == 0 else f"{i % 2000 * 10 + 990:,} руб.".replace(",", " ")
+            values = (
+                ("name", f"Диван прямой Ральф {i % 5000}"),
+                ("price", price),
+                ("link", f"https://www.divan.ru/product/divan-ralf-{i}"),
+            )
+            item = {} if kind == "dict" else Product()
+            for field, value in values:
+                item[field] = value
+            item["category"] = category
+            page.append(item)
+        normalize_batch(page)
+        products.extend(page)
+    return products
+
+
+def run_case(kind: str, rows: int, results):
+    """Замер одного вида записей в дочернем процессе."""
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    products = build(kind, rows)
+    build_seconds = time.perf_counter() - start
+    growth = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before) * 1024  # КиБ (Linux)
+
+    with tempfile.TemporaryDirectory() as directory:
+        exporter = CSVExporter(os.path.join(directory, "products.csv"))
+        start = time.perf_counter()
+        exporter.open()
+        for offset in range(0, len(products), PAGE):
+            exporter.write_batch(products[offset:offset + PAGE])
+        exporter.close()
+        csv_seconds = time.perf_counter() - start
+
+    results.put((kind, {
+        "bytes_per_product": round(growth / rows),
+        "rss_growth_mb": round(growth / 2 ** 20, 1),
+        "build_s": round(build_seconds, 2),
+        "csv_s": round(csv_seconds, 2),
+    }))
+
+
+def main():
+    args = argparse.ArgumentParser(description="Память записей товаров: словари против Product")
+    args.add_argument("--rows", type=int, default=1000000, help="Сколько товаров собрать")
+    args = args.parse_args()
+
+    queue = multiprocessing.Queue()
+    results = {}
+    for kind in ("dict", "Product"):
+        process = multiprocessing.Process(target=run_case, args=(kind, args.rows, queue))
+        process.start()
+        name, result = queue.get()
+        process.join()
+        results[name] = result
+
+    print(f"Товаров: {args.rows}")
+    print(
+        f"{'запись':>8} {'байт/товар':>11} {'рост RSS, МБ':>13} "
+        f"{'сборка, с':>10} {'CSV, с':>7}"
+    )
+    for name, result in results.items():
+        print(
+            f"{name:>8} {result['bytes_per_product']:>11} "
+            f"{result['rss_growth_mb']:>13} {result['build_s']:>10} {result['csv_s']:>7}"
+        )
+    saved = 1 - results["Product"]["rss_growth_mb"] / results["dict"]["rss_growth_mb"]
+    print(f"\nProduct экономит {saved:.0%} памяти на записях")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Бенчмарк записи в SQLite: прежний путь (на каждую страницу — новое соединение,
+execute на каждую строку и коммит в журнале по умолчанию) против SQLiteExporter
+(одно соединение, executemany порциями, WAL). Отдельно меряется повторный
+запуск по тем же данным: неизменившиеся товары не перезаписываются.
+
+Запуск:
+    python -m bench.bench_sqlite --rows 10000 100000 1000000
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+
+from database import init_db
+from exporters import SQLiteExporter
+
+PAGE_SIZE = 100  # товаров на странице категории
+
+
+def synthetic_products(rows: int) -> list:
+    return [
+        {
+            "name": f"Диван прямой Модель {i}",
+            "price": f"{10000 + i % 90000} ₽",
+            "link": f"https://www.divan.ru/product/divan-{i}",
+            "category": "divany-i-kresla",
+        }
+        for i in range(rows)
+    ]
+
+
+def legacy_save(db_name: str, data: list):
+    """Прежний save_to_db: новое соединение и INSERT на каждую строку."""
+    with sqlite3.connect(db_name) as conn:
+        cursor = conn.cursor()
+        for item in data:
+            cursor.execute(
+                "INSERT INTO products (name, price, link, category) VALUES (?, ?, ?, ?)",
+                (item.get("name"), item.get("price"), item.get("link"), item.get("category")),
+            )
+        conn.commit()
+    conn.close()
+
+
+def run_legacy(db_name: str, data: list) -> float:
+    init_db(db_name, logger=_Silent())
+    start = time.perf_counter()
+    for page in range(0, len(data), PAGE_SIZE):
+        legacy_save(db_name, data[page:page + PAGE_SIZE])
+    return time.perf_counter() - start
+
+
+def run_bulk(db_name: str, data: list, synchronous: str, cache_size: int) -> float:
+    exporter = SQLiteExporter(
+        db_name, logger=_Silent(), synchronous=synchronous, cache_size=cache_size
+    )
+    start = time.perf_counter()
+    with exporter:
+        for page in range(0, len(data), PAGE_SIZE):
+            exporter.write_batch(data[page:page + PAGE_SIZE])
+    return time.perf_counter() - start
+
+
+class _Silent:
+    """Логгер, который ничего не пишет (чтобы не мешать замеру)."""
+
+    def info(self, *args):
+        pass
+
+    warning = info
+
+
+def main():
+    args = argparse.ArgumentParser(description="Бенчмарк записи в SQLite")
+    args.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args.add_argument("--synchronous", default="NORMAL", help="PRAGMA synchronous для нового пути")
+    args.add_argument("--cache-size", type=int, default=-64000, help="PRAGMA cache_size для нового пути")
+    args = args.parse_args()
+
+    print(
+        f"{'строк':>9} {'построчно, стр/с':>18} {'пачками, стр/с':>16} "
+        f"{'ускорение':>10} {'повторно, стр/с':>17}"
+    )
+    for rows in args.rows:
+        data = synthetic_products(rows)
+        with tempfile.TemporaryDirectory() as directory:
+            legacy = run_legacy(os.path.join(directory, "legacy.db"), data)
+            bulk_db = os.path.join(directory, "bulk.db")
+            bulk = run_bulk(bulk_db, data, args.synchronous, args.cache_size)
+            repeat = run_bulk(bulk_db, data, args.synchronous, args.cache_size)
+        print(
+            f"{rows:>9} {rows / legacy:>18,.0f} {rows / bulk:>16,.0f} "
+            f"{legacy / bulk:>9.1f}x {rows / repeat:>17,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Бенчмарк потокового экспорта: пиковая память (RSS) при записи N синтетических товаров.
+
+Каждый случай запускается в отдельном процессе, чтобы пиковый RSS не смешивался.
+Для сравнения прогоняется и прежняя схема: всё копится в списке и пишется в конце.
+
+Запуск:
+    python -m bench.bench_streaming --rows 1000000
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+
+from exporters import CSVExporter, JSONExporter, SQLiteExporter
+
+PAGE_SIZE = 100  # товаров на странице категории
+
+
+def synthetic_pages(rows: int):
+    """Генератор порций товаров по PAGE_SIZE штук."""
+    for start in range(0, rows, PAGE_SIZE):
+        yield [
+            {
+                "name": f"Диван прямой Модель {i}",
+                "price": f"{10000 + i % 90000} ₽",
+                "link": f"https://www.divan.ru/product/divan-{i}",
+                "category": "divany-i-kresla",
+            }
+            for i in range(start, min(start + PAGE_SIZE, rows))
+        ]
+
+
+def make_exporter(name: str, directory: str):
+    return {
+        "csv": lambda: CSVExporter(os.path.join(directory, "products.csv")),
+        "json": lambda: JSONExporter(os.path.join(directory, "products.json")),
+        "jsonl": lambda: JSONExporter(os.path.join(directory, "products.jsonl")),
+        "sqlite": lambda: SQLiteExporter(os.path.join(directory, "products.db")),
+    }[name]()
+
+
+def run_case(name: str, mode: str, rows: int, results):
+    """Один замер в дочернем процессе: время и пиковый RSS (МБ)."""
+    with tempfile.TemporaryDirectory() as directory:
+        exporter = make_exporter(name, directory)
+        start = time.perf_counter()
+        if mode == "stream":
+            with exporter:
+                for page in synthetic_pages(rows):
+                    exporter.write_batch(page)
+        else:
+            products = []
+            for page in synthetic_pages(rows):
+                products.extend(page)
+            exporter.export(products)
+        elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB → MiB (Linux)
+    results.put((name, mode, elapsed, peak))
+
+
+def main():
+    args = argparse.ArgumentParser(description="Бенчмарк потокового экспорта")
+    args.add_argument("--rows", type=int, default=1_000_000, help="Число товаров")
+    args.add_argument(
+        "--exporters", nargs="+", default=["csv", "json", "jsonl", "sqlite"],
+        help="Какие экспортеры мерить",
+    )
+    args = args.parse_args()
+
+    results = multiprocessing.Queue()
+    print(f"Товаров: {args.rows}")
+    print(f"{'формат':>8} {'режим':>8} {'время, с':>10} {'пик RSS, МБ':>12}")
+    for name in args.exporters:
+        for mode in ("stream", "list"):
+            process = multiprocessing.Process(
+                target=run_case, args=(name, mode, args.rows, results)
+            )
+            process.start()
+            name_, mode_, elapsed, peak = results.get()
+            process.join()
+            print(f"{name_:>8} {mode_:>8} {elapsed:>10.2f} {peak:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+import json
+import os
+from typing import List
+
+
+class CrawlCheckpoint:
+    """
+    Журнал прогресса обхода для продолжения после сбоя (--resume).
+
+    Файл в формате JSON Lines, только дозапись: какие страницы уже записаны
+    в экспорт и какие категории обойдены целиком. С отсевом повторов запись
+    хранит и ссылки записанных товаров: по ним индекс повторов восстанавливается
+    при продолжении, и товары из законченных категорий не пишутся второй раз.
+    Страница попадает в журнал
+    лишь после того, как её товары сброшены на диск (commit вызывается после
+    flush экспортера, а flush Parquet закрывает законченную часть файла),
+    поэтому журнал не обгоняет данные.
+    """
+
+    def __init__(self, path: str, resume: bool = False):
+        """
+        :param path: Путь к файлу журнала
+        :param resume: Продолжить по существующему журналу (иначе он начинается заново)
+        """
+        self.path = path
+        self.done_pages = set()
+        self.done_categories = set()
+        self.rows = 0  # товаров записано по журналу
+        self.links = []  # ссылки записанных товаров (если их передавали)
+        self._pending = []
+
+        if resume and os.path.exists(path):
+            self._load()
+        self._file = open(path, "a" if resume else "w", encoding="utf-8")
+
+    def _load(self):
+        """Читаем журнал; недописанная последняя строка (сбой во время записи) пропускается."""
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if entry["event"] == "page":
+                    self.done_pages.add(entry["url"])
+                    self.rows += entry["rows"]
+                elif entry["event"] == "category":
+                    self.done_categories.add(entry["category"])
+                self.links.extend(entry.get("links", ()))
+
+    @property
+    def pending(self) -> int:
+        """Сколько записей ждут commit."""
+        return len(self._pending)
+
+    def is_page_done(self, url: str) -> bool:
+        return url in self.done_pages
+
+    def is_category_done(self, category: str) -> bool:
+        return category in self.done_categories
+
+    def page_done(self, url: str, rows: int, links: List[str] = None):
+        """
+        Страница передана в экспорт (в журнал попадёт при commit).
+        :param links: Ссылки записанных товаров страницы
+        """
+        entry = {"event": "page", "url": url, "rows": rows}
+        if links:
+            entry["links"] = links
+        self._pending.append(entry)
+
+    def category_done(self, category: str, links: List[str] = None):
+        """
+        Категория обойдена целиком (в журнал попадёт при commit).
+        :param links: Ссылки товаров, записанных вместе с отметкой категории (--workers)
+        """
+        entry = {"event": "category", "category": category}
+        if links:
+            entry["links"] = links
+        self._pending.append(entry)
+
+    def commit(self):
+        """Дописываем накопленные записи и сбрасываем журнал на диск."""
+        if not self._pending:
+            return
+        for entry in self._pending:
+            self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            if entry["event"] == "page":
+                self.done_pages.add(entry["url"])
+                self.rows += entry["rows"]
+            else:
+                self.done_categories.add(entry["category"])
+        self._pending = []
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self, completed: bool = False):
+        """
+        Закрываем журнал.
+        :param completed: Обход завершён — продолжать нечего, журнал удаляется
+        """
+        if self._file is None:
+            return
+        self.commit()
+        self._file.close()
+        self._file = None
+        if completed:
+            os.remove(self.path)
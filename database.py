@@ -1,37 +1,326 @@
+import hashlib
 import sqlite3
 import logging
-from typing import List, Dict
+from contextlib import contextmanager
+from typing import List, Dict, Iterable, Tuple
 
+from extractor import NO_LINK
+from prices import normalize_batch, normalize_prices
 
-def init_db(db_name: str, logger=None):
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    price TEXT NOT NULL,
+    link TEXT NOT NULL,
+    category TEXT NOT NULL,
+    content_hash TEXT NOT NULL DEFAULT '',
+    price_kopecks INTEGER,
+    currency TEXT,
+    article TEXT,
+    dimensions TEXT,
+    material TEXT,
+    availability TEXT,
+    old_price TEXT,
+    old_price_kopecks INTEGER
+);
+
+CREATE TABLE IF NOT EXISTS price_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    link TEXT NOT NULL,
+    price TEXT NOT NULL,
+    changed_at TEXT NOT NULL DEFAULT (datetime('now'))
+);
+
+CREATE INDEX IF NOT EXISTS idx_price_history_link ON price_history (link, changed_at);
+
+-- Все категории товара: строка товара одна, категорий может быть несколько
+CREATE TABLE IF NOT EXISTS product_categories (
+    link TEXT NOT NULL,
+    category TEXT NOT NULL,
+    PRIMARY KEY (link, category)
+) WITHOUT ROWID;
+
+-- История цен пополняется только когда цена действительно изменилась.
+-- Первую цену нового товара пишет upsert_products одним запросом на порцию
+CREATE TRIGGER IF NOT EXISTS trg_products_price_update AFTER UPDATE OF price ON products
+WHEN OLD.price IS NOT NEW.price
+BEGIN
+    INSERT INTO price_history (link, price) VALUES (NEW.link, NEW.price);
+END;
+"""
+
+INSERT_CATEGORY = "INSERT OR IGNORE INTO product_categories (link, category) VALUES (?, ?)"
+
+# Строки, вставленные порцией (id больше прежнего максимума): первая цена и первая категория
+INSERT_NEW_HISTORY = "INSERT INTO price_history (link, price) SELECT link, price FROM products WHERE id > ?"
+INSERT_NEW_CATEGORIES = (
+    "INSERT OR IGNORE INTO product_categories (link, category) "
+    "SELECT link, category FROM products WHERE id > ?"
+)
+
+# Поля страницы товара (enrichment.DETAIL_COLUMNS): заполняются только при обогащении
+DETAIL_COLUMNS = ("article", "dimensions", "material", "availability", "old_price", "old_price_kopecks")
+
+# Новые товары (ссылки ещё нет в базе). Без обогащения поля страницы товара
+# не передаются вовсе: шесть пустых параметров почти удваивают цену вставки
+INSERT_PRODUCT = """
+INSERT INTO products (name, price, link, category, content_hash, price_kopecks, currency)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_PRODUCT_DETAILS = """
+INSERT INTO products (name, price, link, category, content_hash, price_kopecks, currency,
+                      article, dimensions, material, availability, old_price, old_price_kopecks)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Уже записанные товары, у которых изменилось содержимое.
+# Строка с тем же content_hash не перезаписывается вовсе.
+# Поля страницы товара не затираются пустыми значениями из запуска без обогащения
+UPSERT_PRODUCT = """
+INSERT INTO products (name, price, link, category, content_hash, price_kopecks, currency,
+                      article, dimensions, material, availability, old_price, old_price_kopecks)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (link) DO UPDATE SET
+    name = excluded.name,
+    price = excluded.price,
+    content_hash = excluded.content_hash,
+    price_kopecks = excluded.price_kopecks,
+    currency = excluded.currency,
+    article = COALESCE(excluded.article, products.article),
+    dimensions = COALESCE(excluded.dimensions, products.dimensions),
+    material = COALESCE(excluded.material, products.material),
+    availability = COALESCE(excluded.availability, products.availability),
+    old_price = COALESCE(excluded.old_price, products.old_price),
+    old_price_kopecks = COALESCE(excluded.old_price_kopecks, products.old_price_kopecks)
+WHERE products.content_hash != excluded.content_hash
+"""
+
+
+def connect(db_name: str, journal_mode: str = "WAL", synchronous: str = "NORMAL",
+            cache_size: int = -64000) -> sqlite3.Connection:
     """
-    Создание таблицы и очистка её перед новым парсингом.
+    Открываем соединение с настройками для массовой записи.
+
+    :param db_name: Имя файла базы данных
+    :param journal_mode: Режим журнала (WAL — запись не блокирует чтение)
+    :param synchronous: Уровень fsync: OFF / NORMAL / FULL (NORMAL безопасен в WAL)
+    :param cache_size: Размер кэша страниц (отрицательное число — в КиБ)
     """
-    with sqlite3.connect(db_name) as conn:
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS products (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                price TEXT NOT NULL,
-                link TEXT NOT NULL,
-                category TEXT NOT NULL
-            )
-            """
+    conn = sqlite3.connect(db_name)
+    conn.execute(f"PRAGMA journal_mode={journal_mode}")
+    conn.execute(f"PRAGMA synchronous={synchronous}")
+    conn.execute(f"PRAGMA cache_size={int(cache_size)}")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    return conn
+
+
+@contextmanager
+def _connection(db_name: str, conn: sqlite3.Connection = None):
+    """Переданное соединение или новое, которое закроется после блока."""
+    if conn is not None:
+        yield conn
+        return
+    own = sqlite3.connect(db_name)
+    try:
+        yield own
+    finally:
+        own.close()
+
+
+def content_hash(item: Dict) -> str:
+    """
+    Хэш изменяемых полей товара: по нему пропускаются неизменившиеся строки.
+    Поля страницы товара входят в хэш, только если товар обогащён.
+    """
+    return _digest(item.get("name"), item.get("price"), tuple(map(item.get, DETAIL_COLUMNS)))
+
+
+def _digest(name, price, details: Tuple) -> str:
+    """content_hash по уже прочитанным полям (details — значения DETAIL_COLUMNS)."""
+    content = f"{name}\x1f{price}"
+    if details.count(None) != len(details):
+        content += "\x1e" + "\x1f".join(str(value) for value in details if value is not None)
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _stored(conn: sqlite3.Connection, links: List[str], batch: int = 500) -> Dict[str, Tuple[str, str]]:
+    """Уже записанные товары из links: ссылка -> (content_hash, категория)."""
+    stored = {}
+    for start in range(0, len(links), batch):
+        part = links[start:start + batch]
+        rows = conn.execute(
+            f"SELECT link, content_hash, category FROM products WHERE link IN ({', '.join('?' * len(part))})",
+            part,
         )
-        cursor.execute("DELETE FROM products")
+        stored.update((link, (digest, category)) for link, digest, category in rows)
+    return stored
+
+
+def upsert_products(conn: sqlite3.Connection, data: Iterable[Dict], chunk_size: int = 10000) -> int:
+    """
+    Массовая запись товаров по ключу link: новые вставляются, изменившиеся
+    обновляются, неизменившиеся не трогаются. executemany порциями,
+    каждая порция — одна транзакция.
+
+    Товары без ссылки пропускаются: их не с чем сопоставить между запусками.
+    Если у товаров ещё нет числовой цены (price_kopecks), она вычисляется здесь.
+    Категория каждого товара записывается и в таблицу связей product_categories.
+
+    Хэши и категории уже записанных товаров порции читаются по индексу ссылки:
+    новые товары вставляются без ON CONFLICT, неизменившиеся в запись не попадают
+    вовсе, upsert получают только изменившиеся. Связь с категорией для известного
+    товара пишется, только если категория не та, что в его строке. Первая цена
+    и категория новых строк дописываются двумя запросами на порцию, а не
+    триггером на каждую строку.
+
+    :return: Сколько строк вставлено или обновлено
+    """
+    data = [item for item in data if item.get("link") not in (None, "", NO_LINK)]
+    if any("price_kopecks" not in item for item in data):
+        normalize_batch(data)
+
+    changed = 0
+    for start in range(0, len(data), chunk_size):
+        chunk = data[start:start + chunk_size]
+        stored = _stored(conn, [item["link"] for item in chunk])
+        new, new_detailed, updated, pairs = [], [], [], []
+        for item in chunk:
+            get = item.get
+            name, price, link, category = get("name"), get("price"), item["link"], get("category")
+            details = tuple(map(get, DETAIL_COLUMNS))
+            digest = _digest(name, price, details)
+            row = (name, price, link, category, digest, get("price_kopecks"), get("currency"))
+            known = stored.get(link)
+            if known is None:
+                stored[link] = (digest, category)  # повтор ссылки в той же порции — уже не новый
+                if details.count(None) == len(details):
+                    new.append(row)
+                else:
+                    new_detailed.append(row + details)
+                continue
+            if known[1] != category:
+                pairs.append((link, category))
+            if known[0] != digest:
+                stored[link] = (digest, known[1])
+                updated.append(row + details)
+
+        with conn:
+            if new or new_detailed:
+                last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM products").fetchone()[0]
+                for sql, rows in ((INSERT_PRODUCT, new), (INSERT_PRODUCT_DETAILS, new_detailed)):
+                    if rows:
+                        changed += conn.executemany(sql, rows).rowcount
+                conn.execute(INSERT_NEW_HISTORY, (last_id,))
+                conn.execute(INSERT_NEW_CATEGORIES, (last_id,))
+            if updated:
+                changed += conn.executemany(UPSERT_PRODUCT, updated).rowcount
+            if pairs:
+                conn.executemany(INSERT_CATEGORY, pairs)
+    return changed
+
+
+def add_categories(conn: sqlite3.Connection, pairs: Iterable[Tuple[str, str]]) -> None:
+    """Записываем принадлежность товаров категориям: пары (ссылка, категория)."""
+    with conn:
+        conn.executemany(INSERT_CATEGORY, pairs)
+
+
+def _migrate(conn: sqlite3.Connection, logger=None):
+    """
+    Приводим базу старого формата к текущей схеме:
+    - без content_hash (и с дублями ссылок) — из дублей остаётся последняя запись;
+    - без числовой цены — добавляем колонки и заполняем их из текста цены;
+    - без таблицы связей — заполняем product_categories из products;
+    - с триггером первой цены — удаляем: её теперь пишет upsert_products.
+    """
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(products)")}
+
+    with conn:
+        conn.execute("DROP TRIGGER IF EXISTS trg_products_price_insert")
+        if "content_hash" not in columns:
+            conn.execute("ALTER TABLE products ADD COLUMN content_hash TEXT NOT NULL DEFAULT ''")
+            conn.execute(
+                "DELETE FROM products WHERE id NOT IN (SELECT MAX(id) FROM products GROUP BY link)"
+            )
+            conn.execute(
+                "INSERT INTO price_history (link, price) SELECT link, price FROM products"
+            )
+            _log(logger, "База данных переведена на хранение по ссылке товара")
+
+        if "price_kopecks" not in columns:
+            conn.execute("ALTER TABLE products ADD COLUMN price_kopecks INTEGER")
+            conn.execute("ALTER TABLE products ADD COLUMN currency TEXT")
+            rows = conn.execute("SELECT id, price FROM products").fetchall()
+            normalized = normalize_prices([price for _, price in rows])
+            conn.executemany(
+                "UPDATE products SET price_kopecks = ?, currency = ? WHERE id = ?",
+                [(kopecks, currency, row_id) for (row_id, _), (kopecks, currency) in zip(rows, normalized)],
+            )
+            _log(logger, "В базу добавлена числовая цена (price_kopecks)")
+
+        missing = [column for column in DETAIL_COLUMNS if column not in columns]
+        for column in missing:
+            kind = "INTEGER" if column.endswith("_kopecks") else "TEXT"
+            conn.execute(f"ALTER TABLE products ADD COLUMN {column} {kind}")
+        if missing:
+            _log(logger, "В базу добавлены поля страницы товара")
+
+        # Таблица связей появилась позже товаров — заполняем её категориями из products
+        if (conn.execute("SELECT 1 FROM product_categories LIMIT 1").fetchone() is None
+                and conn.execute("SELECT 1 FROM products LIMIT 1").fetchone() is not None):
+            conn.execute(
+                "INSERT OR IGNORE INTO product_categories (link, category) "
+                "SELECT link, category FROM products"
+            )
+            _log(logger, "В базу добавлена таблица категорий товаров")
+
+
+def load_details(conn: sqlite3.Connection) -> Dict[str, Dict]:
+    """
+    Поля страницы товара из прошлых запусков: ссылка -> поля.
+    Товары, ещё не обогащённые ни разу, не возвращаются.
+    """
+    condition = " OR ".join(f"{column} IS NOT NULL" for column in DETAIL_COLUMNS)
+    rows = conn.execute(
+        f"SELECT link, {', '.join(DETAIL_COLUMNS)} FROM products WHERE {condition}"
+    )
+    return {row[0]: dict(zip(DETAIL_COLUMNS, row[1:])) for row in rows}
+
+
+def _log(logger, message: str):
+    if logger:
+        logger.info(message)
+    else:
+        print(f"🗄️ {message}")
+
+
+def init_db(db_name: str, logger=None, conn: sqlite3.Connection = None):
+    """
+    Создание таблиц товаров, категорий товаров и истории цен (данные прошлых запусков сохраняются).
+
+    :param conn: Открытое соединение; если не передано, открывается своё
+    """
+    with _connection(db_name, conn) as conn:
+        conn.executescript(SCHEMA)
+        _migrate(conn, logger)
+        conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_products_link ON products (link)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_products_price ON products (price_kopecks)")
         conn.commit()
 
     if logger:
-        logger.info("База данных очищена перед новым парсингом")
+        logger.info("База данных готова к записи")
     else:
-        print("🗄️ База данных создана/очищена")
+        print("🗄️ База данных создана/открыта")
 
 
-def save_to_db(db_name: str, data: List[Dict], logger=None):
+def save_to_db(db_name: str, data: List[Dict], logger=None, conn: sqlite3.Connection = None):
     """
     Сохраняем список товаров в БД.
+
+    :param conn: Открытое соединение; если не передано, открывается своё
     """
     if not data:
         if logger:
@@ -40,21 +329,10 @@ def save_to_db(db_name: str, data: List[Dict], logger=None):
             print("⚠ Нет данных для сохранения в БД")
         return
 
-    with sqlite3.connect(db_name) as conn:
-        cursor = conn.cursor()
-        for item in data:
-            cursor.execute(
-                "INSERT INTO products (name, price, link, category) VALUES (?, ?, ?, ?)",
-                (
-                    item.get("name"),
-                    item.get("price"),
-                    item.get("link"),
-                    item.get("category"),
-                ),
-            )
-        conn.commit()
+    with _connection(db_name, conn) as conn:
+        changed = upsert_products(conn, data)
 
     if logger:
-        logger.info(f"💾 Сохранено {len(data)} записей в {db_name}")
+        logger.info(f"💾 Обработано {len(data)} записей в {db_name}, изменилось {changed}")
     else:
-        print(f"💾 Сохранено {len(data)} записей в {db_name}")
\ No newline at end of file
+        print(f"💾 Обработано {len(data)} записей в {db_name}, изменилось {changed}")
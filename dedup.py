@@ -0,0 +1,110 @@
+import hashlib
+import math
+import threading
+from typing import List, Dict, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from extractor import NO_LINK
+
+
+# Параметры, которые не меняют товар: метки рекламы и переходов
+TRACKING_PARAMS = ("utm_", "yclid", "gclid", "fbclid", "_openstat", "from")
+
+
+def normalize_link(link: str) -> str:
+    """
+    Ссылка товара в каноническом виде: схема и хост в нижнем регистре,
+    без якоря, меток рекламы и завершающего слэша, параметры по алфавиту.
+    Так одна и та же карточка из разных категорий и акций даёт один ключ.
+    """
+    if not link or link == NO_LINK:
+        return link
+    parts = urlsplit(link.strip())
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith(TRACKING_PARAMS)
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ""))
+
+
+class BloomFilter:
+    """
+    Фильтр Блума: множество ссылок в ~2,4 байта на элемент (при error_rate=1e-4)
+    вместо сотни байт на строку в set. Ложноотрицательных ответов не бывает,
+    ложноположительные — с вероятностью error_rate (такой товар будет пропущен).
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 1e-4):
+        """
+        :param capacity: Ожидаемое число элементов
+        :param error_rate: Допустимая доля ложных срабатываний при capacity элементах
+        """
+        capacity = max(1, capacity)
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        # Двойное хэширование: k позиций из двух половин одного blake2b
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * second) % self.size for i in range(self.hashes)]
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in self._positions(key))
+
+    def add(self, key: str):
+        for p in self._positions(key):
+            self.bits[p >> 3] |= 1 << (p & 7)
+
+
+class DedupIndex:
+    """
+    Индекс уже встреченных товаров за запуск (по нормализованной ссылке).
+
+    Первая встреча товара проходит дальше (обогащение, экспорт), повторные —
+    из других категорий или акций — отбрасываются, а принадлежность товара
+    категории возвращается парой (ссылка, категория) для таблицы связей
+    product_categories. Между запусками дубли не возникают за счёт уникальной
+    ссылки в базе SQLite: индекс запуска с ней не сверяется, чтобы цены
+    уже известных товаров продолжали обновляться.
+    """
+
+    def __init__(self, capacity: int = None, error_rate: float = 1e-4):
+        """
+        :param capacity: Ожидаемое число товаров для фильтра Блума (None — точное множество)
+        :param error_rate: Доля ложных срабатываний фильтра Блума
+        """
+        self.seen = BloomFilter(capacity, error_rate) if capacity else set()
+        self.duplicates = 0
+        self._lock = threading.Lock()
+
+    def seed(self, links):
+        """Отмечаем ссылки уже записанных товаров (продолжение прерванного обхода)."""
+        with self._lock:
+            for link in links:
+                self.seen.add(link)
+
+    def filter(self, products: List[Dict]) -> Tuple[List[Dict], List[Tuple[str, str]]]:
+        """
+        Отделяем новые товары от повторов. Ссылки новых товаров нормализуются на месте.
+        Товары без ссылки не с чем сравнивать — они всегда новые.
+        :return: (новые товары, пары (ссылка, категория) повторов)
+        """
+        fresh, repeated = [], []
+        with self._lock:
+            for item in products:
+                link = normalize_link(item.get("link"))
+                if not link or link == NO_LINK:
+                    fresh.append(item)
+                    continue
+                if link in self.seen:
+                    repeated.append((link, item.get("category")))
+                    continue
+                self.seen.add(link)
+                item["link"] = link
+                fresh.append(item)
+            self.duplicates += len(repeated)
+        return fresh, repeated
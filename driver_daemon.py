@@ -0,0 +1,281 @@
+"""
+Локальный демон с тёплыми сессиями Chrome.
+
+Запуск Chrome и chromedriver стоит секунды — для частых запусков из cron это
+большая часть времени. Демон держит sessions браузеров запущенными, а
+sofa_parsing.py --daemon SOCKET отправляет ему задание (категории, формат,
+файл) через Unix-сокет и ждёт итог: остаётся только загрузка страниц.
+
+Протокол — одна строка JSON в каждую сторону:
+    {"categories": [...], "format": "sqlite", "output": "/abs/path", "options": {...}}
+    -> {"status": "ok", "count": 120, "pages": 4, "seconds": 3.2, "output": "...", "failed": []}
+    failed — категории, обход которых прервала ошибка загрузки (догружаются с "resume": true)
+    {"command": "ping"} / {"command": "shutdown"}
+
+Запуск:
+    python driver_daemon.py --socket /tmp/divan.sock --sessions 2 --headless
+"""
+import argparse
+import json
+import logging
+import os
+import queue
+import signal
+import socket
+import socketserver
+import threading
+import time
+from typing import Dict
+
+
+class DaemonError(Exception):
+    """Демон недоступен или задание завершилось ошибкой."""
+
+
+def submit_job(socket_path: str, job: Dict, timeout: float = None) -> Dict:
+    """
+    Отправляем задание демону и ждём ответ. Парсер и Selenium не импортируются —
+    клиент запускается за доли секунды.
+
+    :param socket_path: Путь к Unix-сокету демона
+    :param job: Задание (см. описание протокола в начале модуля) или команда
+    :param timeout: Предельное время ожидания ответа, с (None — без ограничения)
+    :raises DaemonError: если демон недоступен или задание завершилось ошибкой
+    """
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(timeout)
+            client.connect(socket_path)
+            client.sendall(json.dumps(job, ensure_ascii=False).encode("utf-8") + b"\n")
+            with client.makefile("rb") as stream:
+                line = stream.readline()
+    except OSError as e:
+        raise DaemonError(f"Демон {socket_path} недоступен: {e}") from e
+
+    if not line:
+        raise DaemonError("Демон закрыл соединение без ответа")
+    response = json.loads(line)
+    if response.get("status") != "ok":
+        raise DaemonError(response.get("error", "неизвестная ошибка"))
+    return response
+
+
+class _Session:
+    """Тёплый браузер: парсер-владелец, который его запустил и перезапускает."""
+
+    def __init__(self, index: int, owner):
+        self.index = index
+        self.owner = owner
+
+    @property
+    def driver(self):
+        return self.owner.driver
+
+
+class DriverDaemon:
+    """
+    Держит sessions запущенных Chrome и выполняет задания из Unix-сокета.
+
+    Каждое задание — новый DivanParser со своими настройками (формат, файл,
+    движок, частота запросов ...), которому отдаётся свободный тёплый браузер.
+    Заданий одновременно выполняется не больше, чем сессий, остальные ждут.
+    Упавший браузер перезапускается перед следующим заданием.
+    """
+
+    # Настройки браузера задаёт демон, а не задание
+    SESSION_OPTIONS = ("headless", "lean_browser", "profile_dir")
+
+    def __init__(self, socket_path: str, sessions: int = 1, headless: bool = True,
+                 lean_browser: bool = True, profile_dir: str = None, logger=None):
+        """
+        :param socket_path: Путь к Unix-сокету
+        :param sessions: Сколько браузеров держать запущенными
+        :param headless: Запуск браузеров в фоновом режиме
+        :param lean_browser: Лёгкий профиль Chrome (см. DivanParser)
+        :param profile_dir: Папка профилей Chrome (у каждой сессии своя подпапка)
+        :param logger: Опциональный логгер
+        """
+        self.socket_path = socket_path
+        self.sessions = max(1, sessions)
+        self.headless = headless
+        self.lean_browser = lean_browser
+        self.profile_dir = profile_dir
+        self.logger = logger or logging.getLogger("DivanParser")
+        self.jobs = 0
+        self._idle = queue.Queue()  # свободные сессии
+        self._all = []
+        self._server = None
+
+    def start(self):
+        """Запускаем браузеры и открываем сокет (без обработки запросов — см. serve_forever)."""
+        from parser import DivanParser
+
+        for index in range(self.sessions):
+            profile = os.path.join(self.profile_dir, f"session-{index}") if self.profile_dir else None
+            owner = DivanParser(
+                headless=self.headless, lean_browser=self.lean_browser, profile_dir=profile
+            )
+            owner._get_driver()
+            session = _Session(index, owner)
+            self._all.append(session)
+            self._idle.put(session)
+
+        self._remove_stale_socket()
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                line = self.rfile.readline()
+                if not line:
+                    return
+                try:
+                    response = daemon.handle(json.loads(line))
+                except Exception as e:
+                    daemon.logger.error(f"Задание завершилось ошибкой: {e!r}")
+                    response = {"status": "error", "error": repr(e)}
+                self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+
+        self._server = socketserver.ThreadingUnixStreamServer(self.socket_path, Handler)
+        self._server.daemon_threads = True
+        os.chmod(self.socket_path, 0o600)  # задания принимаются только от своего пользователя
+        self.logger.info(f"Демон слушает {self.socket_path}, тёплых браузеров: {self.sessions}")
+
+    def _remove_stale_socket(self):
+        """Сокет, оставшийся от упавшего демона, удаляем; работающий демон не трогаем."""
+        if not os.path.exists(self.socket_path):
+            return
+        try:
+            submit_job(self.socket_path, {"command": "ping"}, timeout=1)
+        except DaemonError:
+            os.remove(self.socket_path)
+            return
+        raise RuntimeError(f"Демон уже запущен: {self.socket_path}")
+
+    def serve_forever(self):
+        """Обрабатываем задания до команды shutdown (или shutdown() из другого потока)."""
+        try:
+            self._server.serve_forever()
+        finally:
+            self.close()
+
+    def shutdown(self):
+        """Останавливаем приём заданий (из другого потока или обработчика)."""
+        threading.Thread(target=self._server.shutdown, daemon=True).start()
+
+    def handle(self, request: Dict) -> Dict:
+        """Разбираем запрос: служебная команда или задание на обход."""
+        command = request.get("command", "crawl")
+        if command == "ping":
+            return {"status": "ok", "sessions": self.sessions, "jobs": self.jobs}
+        if command == "shutdown":
+            self.shutdown()
+            return {"status": "ok"}
+        if command != "crawl":
+            raise ValueError(f"Неизвестная команда: {command}")
+        return self.run_job(request)
+
+    def run_job(self, job: Dict) -> Dict:
+        """
+        Обходим категории задания на свободном тёплом браузере.
+        :return: Ответ клиенту: сколько записей сохранено, страниц, секунд
+        """
+        import inspect
+        from parser import DivanParser
+
+        options = dict(job.get("options") or {})
+        allowed = set(inspect.signature(DivanParser.__init__).parameters) - {"self", "export_format"}
+        unknown = set(options) - (allowed - set(self.SESSION_OPTIONS))
+        if unknown:
+            raise ValueError(f"Недопустимые настройки задания: {', '.join(sorted(unknown))}")
+
+        session = self._idle.get()
+        try:
+            self._ensure_alive(session)
+            start = time.monotonic()
+            divan_parser = DivanParser(export_format=job.get("format", "sqlite"), **options)
+            divan_parser.driver = session.driver
+            output_path = divan_parser._output_path(job.get("output"))
+            try:
+                divan_parser.start_export(
+                    output_path, checkpoint=True, resume=job.get("resume", False)
+                )
+                pages = divan_parser.parse_categories(job["categories"])
+                count = divan_parser.finish_export(
+                    completed=not divan_parser.failed_categories
+                )
+            finally:
+                divan_parser.driver = None  # браузер остаётся у демона
+                divan_parser.close()
+                if job.get("metrics"):
+                    divan_parser.metrics.write_json(job["metrics"])
+                if job.get("metrics_prom"):
+                    divan_parser.metrics.write_prometheus(job["metrics_prom"])
+            self.jobs += 1
+            return {
+                "status": "ok",
+                "count": count,
+                "pages": pages,
+                "seconds": round(time.monotonic() - start, 3),
+                "output": output_path,
+                "failed": divan_parser.failed_categories,
+            }
+        finally:
+            self._idle.put(session)
+
+    def _ensure_alive(self, session: _Session):
+        """Проверяем браузер сессии и перезапускаем его, если он упал."""
+        from selenium.common.exceptions import WebDriverException
+
+        try:
+            session.driver.current_url
+            return
+        except WebDriverException as e:
+            self.logger.warning(f"Браузер сессии {session.index} не отвечает ({e.msg}), перезапускаю")
+        try:
+            session.owner.driver.quit()
+        except WebDriverException:
+            pass
+        session.owner.driver = None
+        session.owner._get_driver()
+
+    def close(self):
+        """Закрываем сокет и, дождавшись заданий в работе, браузеры."""
+        if self._server is not None:
+            self._server.server_close()
+            self._server = None
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+        for _ in self._all:
+            self._idle.get()  # сессия занята, пока её задание не закончится
+        for session in self._all:
+            try:
+                session.owner.close()
+            except Exception:
+                pass  # браузер мог уже упасть
+        self._all = []
+
+
+def main():
+    args = argparse.ArgumentParser(description="Демон с тёплыми браузерами для sofa_parsing.py --daemon")
+    args.add_argument("--socket", required=True, help="Путь к Unix-сокету")
+    args.add_argument("--sessions", type=int, default=1, help="Сколько браузеров держать запущенными")
+    args.add_argument("--headless", action="store_true", help="Запуск браузеров в фоновом режиме")
+    args.add_argument("--full-browser", action="store_true", help="Полный профиль Chrome (см. sofa_parsing.py)")
+    args.add_argument("--profile-dir", default=None, help="Папка профилей Chrome между перезапусками демона")
+    args = args.parse_args()
+
+    daemon = DriverDaemon(
+        args.socket, sessions=args.sessions, headless=args.headless,
+        lean_browser=not args.full_browser, profile_dir=args.profile_dir,
+    )
+    daemon.start()
+    # systemd / kill останавливают демон штатно: сокет удаляется, браузеры закрываются
+    signal.signal(signal.SIGTERM, lambda signum, frame: daemon.shutdown())
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple
+
+from lxml import html as lxml_html
+
+from extractor import NO_LINK, SelectorStrategy
+from fetchers import HTTPFetcher, FetchError
+from prices import normalize_prices
+from scheduler import RateLimiter
+
+
+# ====== ПОЛЯ СТРАНИЦЫ ТОВАРА ======
+# Тот же формат, что и extractor.FIELDS; если ни один селектор не сработал — None
+DETAIL_FIELDS: Dict[str, Dict] = {
+    "article": {"default": None, "selectors": [
+        ("[itemprop='sku']", "content"),
+        ("[itemprop='sku']", None),
+        ("[data-testid='product-article']", None),
+    ]},
+    "dimensions": {"default": None, "selectors": [
+        ("[data-testid='product-dimensions']", None),
+        ("[itemprop='size']", None),
+    ]},
+    "material": {"default": None, "selectors": [
+        ("[data-testid='product-material']", None),
+        ("[itemprop='material']", None),
+    ]},
+    "availability": {"default": None, "selectors": [
+        ("link[itemprop='availability']", "href"),
+        ("meta[itemprop='availability']", "content"),
+        ("[data-testid='product-availability']", None),
+    ]},
+    "old_price": {"default": None, "selectors": [
+        ("[data-testid='price-old']", None),
+        ("[data-testid='old-price']", None),
+        ("del", None),
+    ]},
+}
+
+# Колонки, которые добавляет обогащение (порядок — как в экспорте)
+DETAIL_COLUMNS: Tuple[str, ...] = tuple(DETAIL_FIELDS) + ("old_price_kopecks",)
+
+
+class DetailEnricher:
+    """
+    Обогащение товаров данными страницы товара: артикул, размеры, материал,
+    наличие и старая цена.
+
+    Ссылки дедуплицируются (один диван встречается в нескольких категориях),
+    уже обогащённые — и в этом запуске, и в хранилище прошлых запусков (preload) —
+    повторно не загружаются. Новые страницы товаров загружаются параллельно
+    пулом из workers потоков с тем же ограничением частоты запросов, что и категории.
+    """
+
+    def __init__(self, fetcher: HTTPFetcher = None, workers: int = 4,
+                 rate_limiter: RateLimiter = None, fields: Dict[str, Dict] = None,
+                 logger=None, metrics=None):
+        """
+        :param fetcher: Загрузчик страниц (по умолчанию свой HTTPFetcher)
+        :param workers: Сколько страниц товаров загружается одновременно
+        :param rate_limiter: Общий с обходом категорий ограничитель частоты запросов
+        :param fields: Поля страницы товара (по умолчанию DETAIL_FIELDS)
+        :param logger: Опциональный логгер
+        :param metrics: Опциональные метрики (metrics.Metrics)
+        """
+        self._own_fetcher = fetcher is None
+        self.fetcher = fetcher or HTTPFetcher(pool_size=workers)
+        self.rate_limiter = rate_limiter or RateLimiter(0)
+        self.strategy = SelectorStrategy(fields or DETAIL_FIELDS)
+        self.logger = logger
+        self.metrics = metrics
+        self.details = {}  # ссылка -> поля страницы товара
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="details")
+        self._lock = threading.Lock()
+
+    def preload(self, details: Dict[str, Dict]):
+        """Товары, обогащённые в прошлых запусках (ссылка -> поля): их страницы не загружаются."""
+        with self._lock:
+            self.details.update(details)
+
+    def enrich(self, products: List[Dict]) -> List[Dict]:
+        """
+        Добавляем к товарам поля страницы товара (на месте).
+        Товары без ссылки и со страницей, которая не загрузилась, получают None.
+        """
+        with self._lock:
+            links = list(dict.fromkeys(
+                item["link"] for item in products
+                if item.get("link") not in (None, "", NO_LINK) and item["link"] not in self.details
+            ))
+
+        if links:
+            fetched = dict(zip(links, self._pool.map(self._fetch_details, links)))
+            normalized = normalize_prices([
+                details["old_price"] if details else None for details in fetched.values()
+            ])
+            with self._lock:
+                for (link, details), (kopecks, _) in zip(fetched.items(), normalized):
+                    if details is not None:
+                        details["old_price_kopecks"] = kopecks
+                    # Не загрузившаяся страница тоже запоминается: за запуск — один запрос
+                    self.details[link] = details
+            if self.metrics is not None:
+                self.metrics.inc("details_fetched", sum(1 for d in fetched.values() if d))
+
+        empty = dict.fromkeys(DETAIL_COLUMNS)
+        for item in products:
+            item.update(self.details.get(item.get("link")) or empty)
+        return products
+
+    def _fetch_details(self, url: str) -> Optional[Dict]:
+        """Загружаем страницу товара и извлекаем поля (None — страница не загрузилась)."""
+        self.rate_limiter.wait(url)
+        try:
+            page_source = self.fetcher.fetch(url)
+        except FetchError as e:
+            self._log("warning", f"Страница товара не загрузилась: {e}")
+            if self.metrics is not None:
+                self.metrics.inc("detail_errors")
+            return None
+
+        hits = Counter()
+        details = self.strategy.extract(lxml_html.fromstring(page_source), base_url=url, hits=hits)
+        self.strategy.record(hits)
+        if self.metrics is not None:
+            for (field, selector), count in hits.items():
+                self.metrics.inc("selector_hits", count, field=field, selector=selector)
+        return details
+
+    def _log(self, level: str, message: str):
+        if self.logger:
+            getattr(self.logger, level)(message)
+        else:
+            print(f"⚠ {message}")
+
+    def close(self):
+        """Останавливаем пул и закрываем свой загрузчик."""
+        self._pool.shutdown()
+        if self._own_fetcher:
+            self.fetcher.close()
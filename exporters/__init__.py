@@ -1,3 +1,64 @@
-from .csv_exporter import CSVExporter
-from .json_exporter import JSONExporter
-from .sqlite_exporter import SQLiteExporter
\ No newline at end of file
+import importlib
+import os
+
+# Экспортеры импортируются при первом обращении: `from exporters import CSVExporter`
+# не тянет за собой ни SQLite-схему, ни pyarrow
+_MODULES = {
+    "CSVExporter": ".csv_exporter",
+    "JSONExporter": ".json_exporter",
+    "SQLiteExporter": ".sqlite_exporter",
+    "ParquetExporter": ".parquet_exporter",
+    "AsyncExportSink": ".async_sink",
+}
+
+# Формат экспорта -> класс экспортера
+FORMATS = {
+    "csv": "CSVExporter",
+    "json": "JSONExporter",
+    "sqlite": "SQLiteExporter",
+    "parquet": "ParquetExporter",
+}
+
+__all__ = list(_MODULES) + ["FORMATS", "create_exporter", "prepare_output_path"]
+
+
+def __getattr__(name):
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def prepare_output_path(export_format: str, output_path: str = None) -> str:
+    """
+    Путь к файлу для сохранения; директория создаётся, если её нет.
+    :param output_path: Если None, файл создаётся в examples/
+    """
+    # Формируем путь по умолчанию, если не указан
+    if output_path is None:
+        output_path = os.path.join("examples", f"products.{export_format}")
+
+    # Создаём директорию, если её нет
+    output_dir = os.path.dirname(output_path)
+    if output_dir and not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    return output_path
+
+
+def create_exporter(export_format: str, output_path: str = None):
+    """
+    Создаём экспортер формата export_format. Импортируется только выбранный
+    экспортер (pyarrow — лишь для parquet).
+    :param output_path: Путь к файлу для сохранения. Если None, создаётся в examples/
+    """
+    name = FORMATS.get(export_format)
+    if not name:
+        raise ValueError("Неверный формат! Используй: csv / json / sqlite / parquet")
+    return __getattr__(name)(prepare_output_path(export_format, output_path))
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
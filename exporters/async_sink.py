@@ -0,0 +1,79 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict
+
+
+class AsyncExportSink:
+    """
+    Асинхронная очередь перед любым экспортером (CSV / JSON / SQLite / Parquet).
+
+    Парсер кладёт товары страниц в очередь (put) и сразу идёт дальше, а запись
+    на диск идёт в фоне: open(), write_batch() и close() экспортера вызываются
+    в одном отдельном потоке — event loop не блокируется, а соединение SQLite
+    используется из того же потока, в котором открыто. Очередь ограничена
+    queue_size: если диск не успевает, put() ждёт (backpressure), и память не растёт.
+    """
+
+    def __init__(self, exporter, queue_size: int = 100):
+        """
+        :param exporter: Экспортер с методами open / write_batch / close
+        :param queue_size: Сколько страниц может ждать записи
+        """
+        self.exporter = exporter
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="export")
+        self._task = None
+        self._error = None
+
+    async def _run(self, function, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+
+    async def start(self, append: bool = False) -> None:
+        """Открываем экспортер и запускаем фоновую запись."""
+        await self._run(self.exporter.open, append)
+        self._task = asyncio.create_task(self._consume())
+
+    async def put(self, data: List[Dict]) -> None:
+        """
+        Ставим товары страницы в очередь на запись.
+        :raises Exception: ошибка записи, случившаяся раньше в фоне
+        """
+        if self._error is not None:
+            raise self._error
+        await self.queue.put(data)
+
+    async def _consume(self):
+        while True:
+            data = await self.queue.get()
+            if data is None:
+                return
+            if self._error is not None:
+                continue  # после ошибки только разгружаем очередь, чтобы put() не завис
+            try:
+                await self._run(self.exporter.write_batch, data)
+            except Exception as e:
+                self._error = e
+
+    async def close(self) -> int:
+        """
+        Дописываем очередь и закрываем экспортер.
+        :return: Сколько записей сохранено
+        """
+        if self._task is not None:
+            await self.queue.put(None)
+            await self._task
+            self._task = None
+        try:
+            await self._run(self.exporter.close)
+        finally:
+            self._executor.shutdown()
+        if self._error is not None:
+            raise self._error
+        return self.exporter.count
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
@@ -1,36 +1,93 @@
 import csv
+import os
 from typing import List, Dict
 
 
 class CSVExporter:
     """
     Экспортер для сохранения данных в CSV-файл.
+
+    Можно сохранить всё сразу (export) или писать порциями по мере парсинга:
+    open() → write_batch() для каждой страницы → close().
     """
 
-    def __init__(self, filename: str = "products.csv"):
+    def __init__(self, filename: str = "products.csv", fieldnames: List[str] = None):
         """
         :param filename: Имя файла для сохранения CSV
+        :param fieldnames: Колонки файла (по умолчанию — ключи первой записи)
         """
         self.filename = filename
+        self.fieldnames = fieldnames
+        self.count = 0
+        self._file = None
+        self._writer = None
 
-    def export(self, data: List[Dict]) -> None:
+    def open(self, append: bool = False) -> None:
         """
-        Сохраняем данные в CSV.
+        Открываем файл для записи порциями.
+        :param append: Дописывать в существующий файл (продолжение прерванного обхода)
+        """
+        self._has_header = append and os.path.exists(self.filename) and os.path.getsize(self.filename) > 0
+        if self._has_header:
+            with open(self.filename, newline="", encoding="utf-8-sig") as f:
+                self.fieldnames = self.fieldnames or next(csv.reader(f, delimiter=";"))
+            self._file = open(self.filename, "a", newline="", encoding="utf-8")
+        else:
+            self._file = open(self.filename, "w", newline="", encoding="utf-8-sig")
+        self._writer = None
+        self.count = 0
+
+    def write_batch(self, data: List[Dict]) -> None:
+        """
+        Дописываем порцию товаров в открытый файл.
 
         :param data: Список словарей с данными товаров
         """
         if not data:
-            print("⚠ Нет данных для экспорта в CSV")
             return
 
-        keys = data[0].keys()
-        with open(self.filename, "w", newline="", encoding="utf-8-sig") as f:
-            writer = csv.DictWriter(
-                f,
-                fieldnames=keys,
+        if self._writer is None:
+            self._writer = csv.DictWriter(
+                self._file,
+                fieldnames=self.fieldnames or list(data[0].keys()),
                 delimiter=";"
             )
-            writer.writeheader()
-            writer.writerows(data)
+            if not self._has_header:
+                self._writer.writeheader()
+
+        self._writer.writerows(data)
+        self.count += len(data)
+
+    def flush(self) -> None:
+        """Сбрасываем записанное на диск."""
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
 
+    def close(self) -> None:
+        """Закрываем файл."""
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
         print(f"✅ Данные сохранены в {self.filename}")
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def export(self, data: List[Dict]) -> None:
+        """
+        Сохраняем данные в CSV.
+
+        :param data: Список словарей с данными товаров
+        """
+        if not data:
+            print("⚠ Нет данных для экспорта в CSV")
+            return
+
+        with self:
+            self.write_batch(data)
@@ -1,17 +1,118 @@
 import json
+import os
+from textwrap import indent
 from typing import List, Dict
 
 
 class JSONExporter:
     """
     Экспортер для сохранения данных в JSON-файл.
+
+    Записи пишутся в файл по мере поступления и не копятся в памяти:
+    либо как один JSON-массив, либо как JSON Lines (по объекту на строку).
     """
 
-    def __init__(self, filename: str = "products.json"):
+    def __init__(self, filename: str = "products.json", lines: bool = None):
         """
         :param filename: Имя файла для сохранения JSON
+        :param lines: Формат JSON Lines. По умолчанию — если файл *.jsonl
         """
         self.filename = filename
+        self.lines = filename.endswith(".jsonl") if lines is None else lines
+        self.count = 0
+        self._file = None
+        self._continued = False  # дописываем в непустой массив с прошлого запуска
+
+    def open(self, append: bool = False) -> None:
+        """
+        Открываем файл для записи порциями.
+        :param append: Дописывать в существующий файл (продолжение прерванного обхода)
+        """
+        self.count = 0
+        self._continued = False
+        if append and os.path.exists(self.filename):
+            if self.lines:
+                self._file = open(self.filename, "a", encoding="utf-8")
+                return
+            if self._reopen_array():
+                return
+        self._file = open(self.filename, "w", encoding="utf-8")
+        if not self.lines:
+            self._file.write("[")
+
+    def _reopen_array(self) -> bool:
+        """
+        Снимаем закрывающую «]» с сохранённого массива, чтобы дописывать в него.
+        Если процесс был убит до записи «]», массив просто продолжается.
+        :return: False, если файл пустой
+        """
+        with open(self.filename, "rb+") as f:
+            f.seek(0, os.SEEK_END)
+            position = f.tell()
+            tail = b""
+            # Читаем с конца, пока не увидим «]» и символ перед ней
+            while position > 0 and len(tail.strip()) < 2:
+                step = min(position, 4096)
+                position -= step
+                f.seek(position)
+                tail = f.read(step) + tail
+            tail = tail.rstrip()
+            if not tail:
+                return False
+            if tail.endswith(b"]"):
+                body = tail[:-1].rstrip()
+            elif tail.endswith((b"}", b"[")):
+                body = tail
+            else:
+                raise ValueError(f"{self.filename}: файл оборван посреди записи, продолжить нельзя")
+            # Были ли в массиве элементы (иначе перед «]» сразу «[»)
+            self._continued = not body.endswith(b"[")
+            f.truncate(position + len(body))
+        self._file = open(self.filename, "a", encoding="utf-8")
+        return True
+
+    def write_batch(self, data: List[Dict]) -> None:
+        """
+        Дописываем порцию товаров в открытый файл.
+
+        :param data: Список товаров (записи Product или словари)
+        """
+        # Запись Product кодируется через default=dict — по одному товару, без копии всей порции
+        for item in data:
+            if self.lines:
+                self._file.write(json.dumps(item, ensure_ascii=False, default=dict) + "\n")
+            else:
+                # Тот же вид, что у json.dump(data, indent=4)
+                separator = ",\n" if self.count or self._continued else "\n"
+                self._file.write(
+                    separator + indent(
+                        json.dumps(item, ensure_ascii=False, indent=4, default=dict), "    "
+                    )
+                )
+            self.count += 1
+
+    def flush(self) -> None:
+        """Сбрасываем записанное на диск."""
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        """Закрываем массив и файл."""
+        if self._file is None:
+            return
+        if not self.lines:
+            self._file.write("\n]" if self.count or self._continued else "]")
+        self._file.close()
+        self._file = None
+        print(f"✅ Данные сохранены в {self.filename}")
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
 
     def export(self, data: List[Dict]) -> None:
         """
@@ -23,12 +124,5 @@ class JSONExporter:
             print("⚠ Нет данных для экспорта в JSON")
             return
 
-        with open(self.filename, "w", encoding="utf-8") as f:
-            json.dump(
-                data,
-                f,
-                ensure_ascii=False,
-                indent=4
-            )
-
-        print(f"✅ Данные сохранены в {self.filename}")
+        with self:
+            self.write_batch(data)
@@ -0,0 +1,228 @@
+import os
+from typing import List, Dict
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow нужен только для этого формата
+    pa = pq = None
+
+
+def _schema_field(name: str):
+    """Тип колонки: числовая цена, категории и валюты — словарём, остальное — строкой."""
+    if name in ("price_kopecks", "old_price_kopecks"):
+        return pa.field(name, pa.int64())
+    if name in ("category", "currency"):
+        return pa.field(name, pa.dictionary(pa.int32(), pa.string()))
+    return pa.field(name, pa.string())
+
+
+class ParquetExporter:
+    """
+    Экспортер для сохранения данных в колоночный файл Parquet (pyarrow).
+
+    Можно сохранить всё сразу (export) или писать порциями по мере парсинга:
+    open() → write_batch() для каждой страницы → close().
+    Товары копятся до row_group_size и записываются одной группой строк
+    со сжатием, поэтому память не растёт с размером каталога.
+
+    Файл Parquet читается только целиком, с футером, который пишется при закрытии.
+    Поэтому запись идёт в части <файл>.partN: flush() закрывает текущую часть,
+    и всё записанное до него уже лежит на диске законченным файлом. close()
+    сливает части (и файл прошлого запуска при продолжении) в итоговый файл.
+    """
+
+    def __init__(self, filename: str = "products.parquet", row_group_size: int = 100_000,
+                 compression: str = "zstd"):
+        """
+        :param filename: Имя файла для сохранения Parquet
+        :param row_group_size: Сколько записей в одной группе строк
+        :param compression: Сжатие колонок (zstd / snappy / gzip / none)
+        """
+        if pa is None:
+            raise ImportError("Для экспорта в Parquet установи pyarrow: pip install pyarrow")
+        self.filename = filename
+        self.row_group_size = row_group_size
+        self.compression = compression
+        self.count = 0
+        self.schema = None
+        self._writer = None
+        self._pending = []
+        self._parts = []  # законченные части, по порядку записи
+        self._append = False  # при close() слить части с уже существующим файлом
+        self._opened = False
+
+    def open(self, append: bool = False) -> None:
+        """
+        Готовимся к записи (часть создаётся с первой порцией, когда известны колонки).
+        :param append: Дописывать к существующему файлу (продолжение прерванного обхода)
+        """
+        self.count = 0
+        self.schema = None
+        self._writer = None
+        self._pending = []
+        self._append = append
+        self._opened = True
+        self._parts = self._recover() if append else []
+        if not append:
+            for part in self._find_parts():
+                os.remove(part)
+        if self._append and os.path.exists(self.filename):
+            self.schema = pq.read_schema(self.filename)
+        elif self._parts:
+            self.schema = pq.read_schema(self._parts[0])
+
+    def _find_parts(self) -> List[str]:
+        """Части прошлого запуска, отсортированные по номеру, и файл слияния."""
+        directory = os.path.dirname(self.filename) or "."
+        prefix = os.path.basename(self.filename) + ".part"
+        numbered = []
+        for name in os.listdir(directory):
+            if name.startswith(prefix) and name[len(prefix):].isdigit():
+                numbered.append((int(name[len(prefix):]), os.path.join(directory, name)))
+        merged = self.filename + ".resume"
+        return [path for _, path in sorted(numbered)] + (
+            [merged] if os.path.exists(merged) else []
+        )
+
+    def _recover(self) -> List[str]:
+        """
+        Разбираем части прерванного запуска. Законченные (с футером) остаются:
+        их строки могли попасть в журнал прогресса. Часть, оборванная сбоем,
+        удаляется — её flush() не завершился, и в журнале её страниц нет.
+        Если сбой пришёлся на слияние после записи <файл>.resume, слияние
+        доводится до конца.
+        """
+        parts = []
+        for path in self._find_parts():
+            try:
+                pq.read_metadata(path)
+            except (OSError, pa.ArrowInvalid):
+                os.remove(path)
+                continue
+            if path.endswith(".resume"):
+                # Слияние дописано: в нём и прежний файл, и все части
+                for part in parts:
+                    os.remove(part)
+                os.replace(path, self.filename)
+                return []
+            parts.append(path)
+        return parts
+
+    def write_batch(self, data: List[Dict]) -> None:
+        """
+        Добавляем порцию товаров; в файл они уходят группами по row_group_size.
+
+        :param data: Список словарей с данными товаров
+        """
+        if not data:
+            return
+        if self.schema is None:
+            self.schema = pa.schema([_schema_field(name) for name in data[0].keys()])
+        self._pending.extend(data)
+        if len(self._pending) >= self.row_group_size:
+            self._write_group()
+
+    def _write_group(self) -> None:
+        """Записываем накопленные товары одной группой строк в текущую часть."""
+        if not self._pending:
+            return
+        columns = []
+        for field in self.schema:
+            values = pa.array(
+                [item.get(field.name) for item in self._pending],
+                type=field.type.value_type if pa.types.is_dictionary(field.type) else field.type,
+            )
+            if pa.types.is_dictionary(field.type):
+                values = values.dictionary_encode()
+            columns.append(values)
+        if self._writer is None:
+            index = int(self._parts[-1].rsplit(".part", 1)[1]) + 1 if self._parts else 0
+            self._parts.append(f"{self.filename}.part{index}")
+            self._writer = pq.ParquetWriter(
+                self._parts[-1], self.schema, compression=self.compression
+            )
+        self._writer.write_table(pa.Table.from_arrays(columns, schema=self.schema))
+        self.count += len(self._pending)
+        self._pending = []
+
+    def flush(self) -> None:
+        """Дописываем накопленное и закрываем текущую часть: она целиком на диске."""
+        self._write_group()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def close(self) -> None:
+        """
+        Дописываем остаток и собираем итоговый файл. Единственная часть просто
+        переименовывается; иначе части сливаются во временный <файл>.resume,
+        а прежний файл заменяется только законченным (os.replace).
+        """
+        if not self._opened:
+            return
+        self._opened = False
+        self.flush()
+        if not self._parts:
+            return
+        sources = list(self._parts)
+        if self._append and os.path.exists(self.filename):
+            sources.insert(0, self.filename)
+        if len(sources) == 1:
+            os.replace(sources[0], self.filename)
+        else:
+            merged = self.filename + ".resume"
+            self._merge(sources, merged)
+            for part in self._parts:
+                os.remove(part)
+            os.replace(merged, self.filename)
+        self._parts = []
+        print(f"✅ Данные сохранены в {self.filename}")
+
+    def _merge(self, sources: List[str], target: str) -> None:
+        """
+        Переписываем группы строк источников в target, склеивая мелкие группы
+        (по одной на сброс журнала) до row_group_size. Память — одна группа.
+        """
+        writer = pq.ParquetWriter(target, self.schema, compression=self.compression)
+        try:
+            buffered, rows = [], 0
+            for path in sources:
+                source = pq.ParquetFile(path)
+                try:
+                    for index in range(source.num_row_groups):
+                        group = source.read_row_group(index)
+                        buffered.append(group)
+                        rows += group.num_rows
+                        if rows >= self.row_group_size:
+                            writer.write_table(pa.concat_tables(buffered))
+                            buffered, rows = [], 0
+                finally:
+                    source.close()
+            if buffered:
+                writer.write_table(pa.concat_tables(buffered))
+        except BaseException:
+            writer.close()
+            os.remove(target)
+            raise
+        writer.close()
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def export(self, data: List[Dict]) -> None:
+        """
+        Сохраняем данные в Parquet.
+
+        :param data: Список словарей с данными товаров
+        """
+        if not data:
+            print("⚠ Нет данных для экспорта в Parquet")
+            return
+
+        with self:
+            self.write_batch(data)
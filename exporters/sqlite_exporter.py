@@ -1,21 +1,106 @@
-from typing import List, Dict
-from database import init_db, save_to_db
-import sqlite3
+from typing import List, Dict, Tuple
 
 
 class SQLiteExporter:
     """
     Экспортер для сохранения данных в SQLite-базу.
+
+    Можно сохранить всё сразу (export) или писать порциями по мере парсинга:
+    open() → write_batch() для каждой страницы → close().
+    Всё время записи держится одно соединение, товары копятся до chunk_size
+    и записываются одной транзакцией через executemany. Запись инкрементальная:
+    база не очищается, товары обновляются по ссылке, смены цен попадают в price_history.
     """
 
-    def __init__(self, db_name: str = "divan_products.db", logger=None):
+    def __init__(self, db_name: str = "divan_products.db", logger=None,
+                 chunk_size: int = 10000, journal_mode: str = "WAL",
+                 synchronous: str = "NORMAL", cache_size: int = -64000):
         """
         :param db_name: Имя файла базы данных
         :param logger: Опциональный логгер для сообщений
+        :param chunk_size: Сколько записей вставлять одной транзакцией
+        :param journal_mode: PRAGMA journal_mode (WAL / DELETE / ...)
+        :param synchronous: PRAGMA synchronous (OFF / NORMAL / FULL)
+        :param cache_size: PRAGMA cache_size (отрицательное число — в КиБ)
         """
         self.db_name = db_name
         self.logger = logger
-        init_db(self.db_name, self.logger)  # Инициализация базы
+        self.chunk_size = chunk_size
+        self.pragmas = dict(
+            journal_mode=journal_mode, synchronous=synchronous, cache_size=cache_size
+        )
+        self.count = 0
+        self.changed = 0  # вставлено или обновлено строк
+        self.conn = None
+        self._pending = []
+        self._categories = []  # связи товар — категория для повторов
+
+    def open(self, append: bool = False) -> None:
+        """
+        Открываем соединение и готовим базу к записи.
+        :param append: Для совместимости с другими экспортерами: база и так не очищается
+        """
+        # Схема и upsert (с разбором цен) нужны только при записи, а не при импорте экспортеров
+        from database import connect, init_db
+
+        self.conn = connect(self.db_name, **self.pragmas)
+        init_db(self.db_name, self.logger, conn=self.conn)
+        self.count = 0
+        self.changed = 0
+        self._pending = []
+        self._categories = []
+
+    def write_batch(self, data: List[Dict]) -> None:
+        """
+        Добавляем порцию товаров; в базу они уходят пачками по chunk_size.
+
+        :param data: Список словарей с данными товаров
+        """
+        self._pending.extend(data)
+        if len(self._pending) >= self.chunk_size:
+            self.flush()
+
+    def write_categories(self, pairs: List[Tuple[str, str]]) -> None:
+        """
+        Добавляем категории уже записанных товаров (повторы из других категорий):
+        строка товара не дублируется, пополняется только таблица product_categories.
+
+        :param pairs: Пары (ссылка, категория)
+        """
+        self._categories.extend(pairs)
+
+    def flush(self) -> None:
+        """Записываем накопленные товары одной транзакцией."""
+        from database import add_categories, upsert_products
+
+        if self._pending:
+            self.changed += upsert_products(self.conn, self._pending, self.chunk_size)
+            self.count += len(self._pending)
+            self._pending = []
+        if self._categories:
+            add_categories(self.conn, self._categories)
+            self._categories = []
+
+    def close(self) -> None:
+        """Дописываем остаток и закрываем соединение."""
+        if self.conn is None:
+            return
+        self.flush()
+        self.conn.close()
+        self.conn = None
+
+        message = f"✅ Данные сохранены в {self.db_name} (изменилось записей: {self.changed})"
+        if self.logger:
+            self.logger.info(message)
+        else:
+            print(message)
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
 
     def export(self, data: List[Dict]) -> None:
         """
@@ -30,9 +115,5 @@ class SQLiteExporter:
                 print("⚠ Нет данных для экспорта в SQLite")
             return
 
-        save_to_db(self.db_name, data, self.logger)
-
-        if self.logger:
-            self.logger.info(f"✅ Данные сохранены в {self.db_name}")
-        else:
-            print(f"✅ Данные сохранены в {self.db_name}")
+        with self:
+            self.write_batch(data)
@@ -0,0 +1,360 @@
+import json
+import threading
+from collections import Counter
+from typing import List, Dict, Optional, Tuple
+from urllib.parse import urljoin
+
+from lxml import html as lxml_html
+from lxml.cssselect import CSSSelector
+
+from records import Product
+
+
+def _import_yaml():
+    """PyYAML нужен только для конфигурации селекторов в YAML — импортируется по требованию."""
+    try:
+        import yaml
+    except ImportError:
+        return None
+    return yaml
+
+
+# ====== ЦЕПОЧКИ СЕЛЕКТОРОВ ======
+# Каждый элемент цепочки — (CSS-селектор, атрибут). Атрибут None означает,
+# что берётся текст элемента. Селекторы пробуются по порядку до первого совпадения.
+CARD_SELECTOR = "div[data-testid='product-card']"
+
+NAME_SELECTORS: List[Tuple[str, Optional[str]]] = [
+    ("span[itemprop='name']", None),
+    ("a[data-testid='product-title']", None),
+    (".PJZwc", None),
+]
+
+PRICE_SELECTORS: List[Tuple[str, Optional[str]]] = [
+    # Элемент с обоими классами; By.CLASS_NAME "ui-LD-ZU KIkOH" (составной класс)
+    # не совпадал ни с чем и стоил каждой карточке лишнего запроса
+    (".ui-LD-ZU.KIkOH", None),
+    ("meta[itemprop='price']", "content"),
+    (".ui-LD-ZU.TA0JV", None),
+    ("span[data-testid='price']", None),
+]
+
+LINK_SELECTORS: List[Tuple[str, Optional[str]]] = [
+    ("a", "href"),
+]
+
+NO_NAME = "Без названия"
+NO_PRICE = "Не указана"
+NO_LINK = "Нет ссылки"
+
+# Поле товара -> цепочка селекторов и значение, если ни один не сработал
+FIELDS: Dict[str, Dict] = {
+    "name": {"selectors": NAME_SELECTORS, "default": NO_NAME},
+    "price": {"selectors": PRICE_SELECTORS, "default": NO_PRICE},
+    "link": {"selectors": LINK_SELECTORS, "default": NO_LINK},
+}
+
+# Признаки пустой категории или страницы «ничего не найдено»: при них
+# нет смысла ждать карточки до таймаута
+EMPTY_SELECTORS: List[str] = [
+    "[data-testid='empty-catalog']",
+    "[data-testid='catalog-empty']",
+    "[data-testid='not-found']",
+]
+
+# Метка «ни один селектор не сработал, взято значение по умолчанию» в счётчиках
+DEFAULT_HIT = "default"
+
+_CARDS = CSSSelector(CARD_SELECTOR)
+_EMPTY = CSSSelector(", ".join(EMPTY_SELECTORS))
+
+
+def load_fields(path: str) -> Dict[str, Dict]:
+    """
+    Читаем конфигурацию полей из YAML или JSON:
+
+        price:
+          default: Не указана
+          selectors:
+            - css: meta[itemprop='price']
+              attr: content
+            - css: span[data-testid='price']
+
+    Основные поля (name, price, link), которых нет в файле, берутся из FIELDS:
+    конфигурация может переопределить только одно из них или лишь добавить свои.
+
+    :return: Словарь того же вида, что и FIELDS
+    :raises ValueError: Поле описано без непустого списка selectors с ключом css
+    """
+    with open(path, encoding="utf-8") as f:
+        if path.endswith((".yaml", ".yml")):
+            yaml = _import_yaml()
+            if yaml is None:
+                raise ImportError("Для конфигурации в YAML установи PyYAML: pip install pyyaml")
+            config = yaml.safe_load(f)
+        else:
+            config = json.load(f)
+
+    if not isinstance(config, dict):
+        raise ValueError(f"{path}: ожидается словарь «поле -> selectors»")
+    loaded = {field: _load_field(path, field, spec) for field, spec in config.items()}
+    fields = {field: loaded.pop(field, spec) for field, spec in FIELDS.items()}
+    fields.update(loaded)
+    return fields
+
+
+def _load_field(path: str, field: str, spec) -> Dict:
+    """Описание одного поля из файла конфигурации (с проверкой формата)."""
+    selectors = spec.get("selectors") if isinstance(spec, dict) else None
+    if (not isinstance(selectors, list) or not selectors
+            or not all(isinstance(entry, dict) and entry.get("css") for entry in selectors)):
+        raise ValueError(f"{path}: у поля {field} должен быть непустой список selectors с ключом css")
+    return {
+        "selectors": [(entry["css"], entry.get("attr")) for entry in selectors],
+        "default": spec.get("default", FIELDS.get(field, {}).get("default", "")),
+    }
+
+
+class SelectorStrategy:
+    """
+    Извлечение полей карточки по декларативной конфигурации (поле -> цепочка селекторов).
+
+    Считает, какой селектор сколько раз сработал, и, если learn=True, после каждой
+    страницы переставляет цепочки так, чтобы первым пробовался самый удачный
+    селектор, — карточки не платят за заведомо пустые попытки.
+
+    Порядок влияет и на результат: на одной карточке могут сработать несколько
+    селекторов с разными значениями (meta[itemprop='price'] даёт «4999»,
+    .ui-LD-ZU.TA0JV — «4999 ₽»). Поэтому первая карточка каждой страницы
+    проверяется всей цепочкой (probe), и селекторы, давшие разные значения,
+    остаются в порядке конфигурации — обучение переставляет только совпадающие. Безопасен для использования из нескольких потоков.
+    """
+
+    def __init__(self, fields: Dict[str, Dict] = None, learn: bool = True):
+        """
+        :param fields: Конфигурация полей (по умолчанию FIELDS, см. load_fields)
+        :param learn: Переупорядочивать цепочки по частоте срабатывания
+        """
+        self.fields = fields or FIELDS
+        self.learn = learn
+        self.hits = {field: Counter() for field in self.fields}
+        # Пары (раньше в конфигурации, позже), давшие на одной карточке разные значения
+        self.conflicts = {field: set() for field in self.fields}
+        self.compiled = {
+            selector: CSSSelector(selector)
+            for spec in self.fields.values()
+            for selector, _ in spec["selectors"]
+        }
+        # Текущий порядок; заменяется целиком, поэтому читается без блокировки
+        self.chains = {field: list(spec["selectors"]) for field, spec in self.fields.items()}
+        self._lock = threading.Lock()
+
+    def record(self, hits: Counter):
+        """
+        Учитываем срабатывания селекторов страницы: (поле, селектор) -> число.
+        При learn=True цепочки переупорядочиваются по числу срабатываний
+        (при равенстве — в порядке конфигурации); селектор не обгоняет
+        более ранний, с которым разошёлся в значении (см. probe).
+        """
+        with self._lock:
+            for (field, selector), count in hits.items():
+                self.hits[field][selector] += count
+            if not self.learn:
+                return
+            self.chains = {field: self._learned_order(field) for field in self.fields}
+
+    def _learned_order(self, field: str) -> List[Tuple[str, Optional[str]]]:
+        """Цепочка по убыванию срабатываний с сохранением порядка конфликтующих селекторов."""
+        remaining = list(self.fields[field]["selectors"])
+        conflicts = self.conflicts[field]
+        order = []
+        while remaining:
+            # Готов селектор, перед которым не осталось конфликтующего с ним раньше по конфигурации
+            ready = [
+                entry for index, entry in enumerate(remaining)
+                if not any((earlier[0], entry[0]) in conflicts for earlier in remaining[:index])
+            ]
+            best = max(ready, key=lambda entry: self.hits[field][entry[0]])
+            order.append(best)
+            remaining.remove(best)
+        return order
+
+    def probe(self, field: str, lookup, hits: Counter = None) -> str:
+        """
+        Значение поля по порядку конфигурации с проверкой всей цепочки: пары
+        селекторов, давших разные значения, запоминаются в conflicts.
+        :param lookup: lookup(selector, attribute) — значение селектора или None
+        """
+        found = []
+        for selector, attribute in self.fields[field]["selectors"]:
+            value = lookup(selector, attribute)
+            if value is not None:
+                found.append((selector, value))
+        conflicts = {
+            (earlier, later)
+            for index, (earlier, value) in enumerate(found)
+            for later, other in found[index + 1:]
+            if value != other
+        }
+        if conflicts:
+            with self._lock:
+                self.conflicts[field] |= conflicts
+        if hits is not None:
+            hits[(field, found[0][0] if found else DEFAULT_HIT)] += 1
+        return found[0][1] if found else self.fields[field]["default"]
+
+    def extract(self, element, base_url: str = None, hits: Counter = None) -> Dict:
+        """
+        Извлекаем все поля конфигурации из lxml-элемента (карточки или целой страницы).
+        :param hits: Если передан, в нём считается, какой селектор сработал: (поле, селектор)
+        """
+        return {
+            field: self._first(element, field, chain, base_url, hits)
+            for field, chain in self.chains.items()
+        }
+
+    def parse_card(self, card, category: str, base_url: str = None, hits: Counter = None,
+                   probe: bool = False) -> Product:
+        """
+        Извлекаем поля из одной карточки товара (lxml-элемент) в запись Product с категорией.
+        :param probe: Проверить карточку всеми селекторами цепочек (см. probe)
+        """
+        item = Product()
+        for field, chain in self.chains.items():
+            if probe:
+                item[field] = self.probe(
+                    field, lambda selector, attribute: self._value(card, selector, attribute, base_url),
+                    hits,
+                )
+            else:
+                item[field] = self._first(card, field, chain, base_url, hits)
+        item["category"] = category
+        return item
+
+    def _value(self, card, selector: str, attribute: Optional[str],
+               base_url: str = None) -> Optional[str]:
+        """Значение одного селектора в карточке или None, если он не сработал."""
+        found = self.compiled[selector](card)
+        if not found:
+            return None
+        element = found[0]
+        if attribute is None:
+            return _text(element)
+        value = element.get(attribute)
+        if value is not None and attribute == "href" and base_url:
+            # Selenium отдаёт href уже абсолютным — повторяем это поведение
+            value = urljoin(base_url, value)
+        return value
+
+    def _first(self, card, field: str, chain: List[Tuple[str, Optional[str]]],
+               base_url: str = None, hits: Counter = None) -> str:
+        """Значение первого сработавшего селектора из цепочки."""
+        for selector, attribute in chain:
+            value = self._value(card, selector, attribute, base_url)
+            if value is None:
+                continue
+            if hits is not None:
+                hits[(field, selector)] += 1
+            return value
+        if hits is not None:
+            hits[(field, DEFAULT_HIT)] += 1
+        return self.fields[field]["default"]
+
+    def report(self) -> Dict[str, List[Tuple[str, int]]]:
+        """Срабатывания по полям в текущем порядке цепочек: {поле: [(селектор, число), ...]}."""
+        with self._lock:
+            return {
+                field: [(selector, self.hits[field][selector]) for selector, _ in chain]
+                + [(DEFAULT_HIT, self.hits[field][DEFAULT_HIT])]
+                for field, chain in self.chains.items()
+            }
+
+
+# Порядок из конфигурации, без обучения
+DEFAULT_STRATEGY = SelectorStrategy(learn=False)
+
+
+def _text(element) -> str:
+    """Видимый текст элемента с нормализованными пробелами (как .text в Selenium)."""
+    return " ".join(element.text_content().split())
+
+
+def parse_card(card, category: str, base_url: str = None, hits: Counter = None) -> Product:
+    """
+    Извлекаем название, цену и ссылку из одной карточки товара (lxml-элемент).
+    """
+    return DEFAULT_STRATEGY.parse_card(card, category, base_url, hits)
+
+
+def find_cards(page_source: str) -> list:
+    """
+    Разбираем HTML-снимок страницы и возвращаем все карточки товаров.
+    """
+    if not page_source:
+        return []
+    document = lxml_html.fromstring(page_source)
+    return _CARDS(document)
+
+
+def is_empty_page(page_source: str) -> bool:
+    """
+    Есть ли в HTML признак пустой категории (EMPTY_SELECTORS).
+    """
+    if not page_source:
+        return False
+    return bool(_EMPTY(lxml_html.fromstring(page_source)))
+
+
+def extract_cards(page_source: str, category: str, base_url: str = None, logger=None,
+                  metrics=None, strategy: SelectorStrategy = None) -> List[Product]:
+    """
+    Извлекаем все карточки товаров из одного снимка страницы (driver.page_source).
+
+    Заменяет по-элементные вызовы find_element: вместо нескольких HTTP-запросов
+    к WebDriver на каждую карточку страница разбирается целиком в процессе.
+
+    :param page_source: HTML страницы
+    :param category: Категория, которая попадёт в каждую запись
+    :param base_url: URL страницы для приведения ссылок к абсолютному виду
+    :param logger: Опциональный логгер для предупреждений
+    :param metrics: Опциональные метрики (metrics.Metrics): найденные карточки,
+        сработавшие селекторы по полям, ошибки разбора
+    :param strategy: Селекторы полей (по умолчанию DEFAULT_STRATEGY — порядок из FIELDS)
+    :return: Список записей Product (см. records.py) — тех же, что в DivanParser.products
+    """
+    strategy = strategy or DEFAULT_STRATEGY
+    products = []
+    hits = Counter() if metrics is not None or strategy.learn else None
+    failures = 0
+    for index, card in enumerate(find_cards(page_source)):
+        try:
+            # Первая карточка страницы проверяется всей цепочкой — обучение
+            # не переставит селекторы, дающие разные значения
+            probe = strategy.learn and index == 0
+            products.append(strategy.parse_card(card, category, base_url, hits, probe))
+        except Exception as e:
+            failures += 1
+            message = (
+                f"Не удалось распарсить товар. Ошибка: {e}\n"
+                f"HTML:\n{lxml_html.tostring(card, encoding='unicode')}"
+            )
+            if logger:
+                logger.warning(message)
+            else:
+                print(f"⚠ {message}")
+
+    # Счётчики страницы сливаются один раз, а не на каждое поле
+    if strategy.learn:
+        strategy.record(hits)
+    if metrics is not None:
+        record_hits(metrics, hits, len(products), failures)
+    return products
+
+
+def record_hits(metrics, hits: Counter, cards: int, failures: int = 0):
+    """Переносим счётчики разбора страницы в метрики."""
+    metrics.inc("cards_found", cards)
+    for (field, selector), count in hits.items():
+        metrics.inc("selector_hits", count, field=field, selector=selector)
+    if failures:
+        metrics.inc("parse_failures", failures)
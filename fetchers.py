@@ -0,0 +1,108 @@
+from typing import Optional, Tuple
+
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/139.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "ru-RU,ru;q=0.9",
+}
+
+
+class FetchError(Exception):
+    """Страницу не удалось загрузить (сетевая ошибка или код ответа >= 400)."""
+
+    def __init__(self, message: str, status: int = None):
+        """
+        :param message: Описание ошибки
+        :param status: Код ответа сервера (None — сетевая ошибка)
+        """
+        super().__init__(message)
+        self.status = status
+
+
+class HTTPFetcher:
+    """
+    Загрузка HTML страниц без браузера.
+    Держит пул keep-alive соединений, поэтому повторные запросы к тому же хосту
+    не тратят время на установку TCP/TLS. Безопасен для использования из нескольких потоков.
+    """
+
+    def __init__(self, pool_size: int = 10, timeout: float = 20, retries: int = 2, headers: dict = None):
+        """
+        :param pool_size: Максимум открытых соединений на один хост
+        :param timeout: Таймаут запроса в секундах
+        :param retries: Число повторов при сетевых ошибках
+        :param headers: Дополнительные заголовки запроса
+        """
+        # urllib3 импортируется вместе с первым загрузчиком, а не с модулем
+        import urllib3
+
+        self.pool = urllib3.PoolManager(
+            maxsize=pool_size,
+            timeout=urllib3.Timeout(total=timeout),
+            retries=urllib3.Retry(total=retries, backoff_factor=0.5, redirect=5),
+            headers={**DEFAULT_HEADERS, **(headers or {})},
+        )
+
+    def fetch(self, url: str) -> str:
+        """
+        Загружаем страницу и возвращаем её HTML.
+
+        :param url: Адрес страницы
+        :raises FetchError: если страница не загрузилась
+        """
+        return self.fetch_conditional(url)[0]
+
+    def fetch_conditional(self, url: str, etag: str = None,
+                          last_modified: str = None) -> Optional[Tuple[str, str, str]]:
+        """
+        Условный GET: страница скачивается, только если изменилась с прошлой загрузки.
+
+        :param url: Адрес страницы
+        :param etag: ETag из прошлого ответа (If-None-Match)
+        :param last_modified: Last-Modified из прошлого ответа (If-Modified-Since)
+        :return: (HTML, ETag, Last-Modified) или None, если сервер ответил 304 Not Modified
+        :raises FetchError: если страница не загрузилась
+        """
+        headers = None
+        if etag or last_modified:
+            headers = dict(self.pool.headers)
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        from urllib3.exceptions import HTTPError
+
+        try:
+            response = self.pool.request("GET", url, headers=headers)
+        except HTTPError as e:
+            raise FetchError(f"{url}: {e}") from e
+
+        if response.status == 304 and headers:
+            return None
+        if response.status >= 400:
+            raise FetchError(f"{url}: HTTP {response.status}", status=response.status)
+
+        return (
+            response.data.decode(_charset(response.headers), errors="replace"),
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+        )
+
+    def close(self):
+        """Закрываем все соединения пула."""
+        self.pool.clear()
+
+
+def _charset(headers) -> str:
+    """Кодировка из заголовка Content-Type (по умолчанию utf-8)."""
+    content_type = headers.get("Content-Type", "")
+    for part in content_type.split(";")[1:]:
+        key, _, value = part.strip().partition("=")
+        if key.lower() == "charset" and value:
+            return value.strip("\"'")
+    return "utf-8"
@@ -0,0 +1,136 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import List, Dict, Optional
+
+from records import Product
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    body TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    products TEXT,
+    size INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_pages_accessed ON pages (accessed_at);
+"""
+
+
+class CachedPage:
+    """Сохранённая страница: HTML, валидаторы для условного GET и извлечённые товары."""
+
+    def __init__(self, url: str, body: str, etag: Optional[str], last_modified: Optional[str],
+                 products: Optional[str], fetched_at: float):
+        self.url = url
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self._products = products
+        self.fetched_at = fetched_at
+
+    @property
+    def products(self) -> Optional[List[Product]]:
+        """Товары, извлечённые при загрузке (каждый раз новые записи Product)."""
+        return json.loads(self._products, object_hook=Product) if self._products is not None else None
+
+
+class PageCache:
+    """
+    Локальный кэш страниц категорий (файл SQLite).
+
+    По адресу хранится HTML, ETag / Last-Modified и уже извлечённые товары.
+    Пока запись свежее ttl, страница не запрашивается вовсе; позже сервер
+    получает условный GET, и на ответ 304 товары берутся из кэша без
+    повторного разбора. Размер ограничен max_bytes: при переполнении
+    удаляются давно не использованные страницы (LRU).
+
+    В режиме offline (только кэш) сеть не используется: сохранённые страницы
+    разбираются заново, чтобы можно было проверять логику парсера без сайта.
+    Безопасен для использования из нескольких потоков.
+    """
+
+    def __init__(self, path: str, ttl: float = 3600, max_bytes: int = 200 * 1024 * 1024,
+                 offline: bool = False):
+        """
+        :param path: Файл кэша
+        :param ttl: Сколько секунд страница считается свежей и не перезапрашивается
+        :param max_bytes: Предельный размер сохранённых страниц
+        :param offline: Только кэш: сеть не используется
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.hits = 0  # страниц отдано без загрузки (свежие, 304, offline)
+        self._lock = threading.Lock()
+        # Кэш может быть общим для процессов --workers: ждём чужую запись, а не падаем
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        """Сохранённая страница или None; обращение продлевает ей жизнь в LRU."""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT url, body, etag, last_modified, products, fetched_at FROM pages WHERE url = ?",
+                (url,),
+            ).fetchone()
+            if row is None:
+                return None
+            with self.conn:
+                self.conn.execute(
+                    "UPDATE pages SET accessed_at = ? WHERE url = ?", (time.time(), url)
+                )
+        return CachedPage(*row)
+
+    def is_fresh(self, page: CachedPage) -> bool:
+        """Страница моложе ttl — сервер можно не спрашивать."""
+        return time.time() - page.fetched_at < self.ttl
+
+    def put(self, url: str, body: str, etag: str = None, last_modified: str = None,
+            products: List[Dict] = None):
+        """Сохраняем загруженную страницу и её товары, вытесняя старые записи при переполнении."""
+        if products is not None:
+            products = json.dumps(products, ensure_ascii=False, default=dict)
+        size = len(body) + len(products or "")
+        now = time.time()
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, body, etag, last_modified, products, size, now, now),
+            )
+            self._evict()
+
+    def revalidated(self, url: str):
+        """Сервер ответил 304: страница снова свежая."""
+        with self._lock, self.conn:
+            self.conn.execute(
+                "UPDATE pages SET fetched_at = ? WHERE url = ?", (time.time(), url)
+            )
+
+    def _evict(self):
+        """Удаляем давно не использованные страницы, пока кэш больше max_bytes."""
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self.conn.execute("SELECT url, size FROM pages ORDER BY accessed_at").fetchall()
+        stale = []
+        for url, size in rows:
+            if total <= self.max_bytes:
+                break
+            stale.append((url,))
+            total -= size
+        self.conn.executemany("DELETE FROM pages WHERE url = ?", stale)
+
+    def close(self):
+        """Закрываем файл кэша."""
+        with self._lock:
+            self.conn.close()
@@ -0,0 +1,208 @@
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Tuple
+
+
+# Границы корзин гистограмм времени, секунды
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 60)
+
+
+class Histogram:
+    """Гистограмма длительностей с фиксированными корзинами (как в Prometheus)."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # последняя корзина — +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """Оценка квантиля по верхней границе корзины (не больше максимума)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self) -> Dict:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else 0.0,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "max": round(self.max, 6),
+        }
+
+
+def _escape(value) -> str:
+    """Экранирование значения метки Prometheus."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _key(name: str, labels: Dict) -> str:
+    """Имя метрики с метками в нотации Prometheus: name{a="1",b="2"}."""
+    if not labels:
+        return name
+    escaped = ",".join(f'{label}="{_escape(value)}"' for label, value in sorted(labels.items()))
+    return f"{name}{{{escaped}}}"
+
+
+class Metrics:
+    """
+    Метрики обхода: счётчики и гистограммы длительностей по фазам.
+
+    Итог выгружается JSON-сводкой (write_json) и в текстовом формате
+    Prometheus — файлом для textfile-коллектора (write_prometheus)
+    или HTTP-эндпоинтом /metrics (serve). Безопасен для использования
+    из нескольких потоков.
+    """
+
+    def __init__(self, prefix: str = "divan"):
+        """
+        :param prefix: Префикс имён метрик в формате Prometheus
+        """
+        self.prefix = prefix
+        self.counters = {}  # (имя, метки) -> значение
+        self.histograms = {}  # (имя, метки) -> Histogram
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._server = None
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """Увеличиваем счётчик."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, seconds: float, **labels):
+        """Добавляем длительность в гистограмму."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """Замеряем длительность блока: with metrics.timer("phase_seconds", phase="export"): ..."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def counter(self, name: str, **labels) -> float:
+        """Текущее значение счётчика (0, если его ещё не было)."""
+        return self.counters.get((name, tuple(sorted(labels.items()))), 0)
+
+    def summary(self) -> Dict:
+        """Сводка для JSON: счётчики и гистограммы (count / sum / mean / p50 / p95 / max)."""
+        with self._lock:
+            return {
+                "started_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)),
+                "duration_seconds": round(time.time() - self.started, 3),
+                "counters": {
+                    _key(name, dict(labels)): value
+                    for (name, labels), value in sorted(self.counters.items())
+                },
+                "timers": {
+                    _key(name, dict(labels)): histogram.summary()
+                    for (name, labels), histogram in sorted(self.histograms.items())
+                },
+            }
+
+    def write_json(self, path: str):
+        """Сохраняем JSON-сводку."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, ensure_ascii=False, indent=4)
+
+    def to_prometheus(self) -> str:
+        """Метрики в текстовом формате Prometheus (exposition format 0.0.4)."""
+        lines = []
+        with self._lock:
+            counters = sorted(self.counters.items())
+            histograms = sorted(self.histograms.items())
+            typed = set()
+            for (name, labels), value in counters:
+                metric = f"{self.prefix}_{name}_total"
+                if metric not in typed:
+                    typed.add(metric)
+                    lines.append(f"# TYPE {metric} counter")
+                lines.append(f"{_key(metric, dict(labels))} {value}")
+
+            for (name, labels), histogram in histograms:
+                metric = f"{self.prefix}_{name}"
+                if metric not in typed:
+                    typed.add(metric)
+                    lines.append(f"# TYPE {metric} histogram")
+                cumulative = 0
+                bounds = [str(bound) for bound in histogram.buckets] + ["+Inf"]
+                for bound, count in zip(bounds, histogram.counts):
+                    cumulative += count
+                    lines.append(f"{_key(metric + '_bucket', {**dict(labels), 'le': bound})} {cumulative}")
+                lines.append(f"{_key(metric + '_sum', dict(labels))} {histogram.sum}")
+                lines.append(f"{_key(metric + '_count', dict(labels))} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str):
+        """
+        Сохраняем метрики файлом для textfile-коллектора node_exporter.
+        Файл подменяется целиком, чтобы коллектор не прочитал его наполовину.
+        """
+        temporary = path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        os.replace(temporary, path)
+
+    def serve(self, port: int, host: str = "127.0.0.1") -> int:
+        """
+        Отдаём метрики по HTTP (GET /metrics) из фонового потока.
+        :param port: Порт (0 — любой свободный)
+        :return: Фактический порт
+        """
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.to_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self._server.server_port
+
+    def close(self):
+        """Останавливаем HTTP-эндпоинт, если он запущен."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -1,32 +1,148 @@
 import logging
 import os
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import NoSuchElementException
+import threading
+from collections import Counter
 
-from exporters import CSVExporter, JSONExporter, SQLiteExporter
+import exporters
+from extractor import (
+    CARD_SELECTOR, DEFAULT_HIT, EMPTY_SELECTORS, NO_LINK, SelectorStrategy,
+    extract_cards, is_empty_page, load_fields, record_hits,
+)
+from fetchers import HTTPFetcher, FetchError
+from prices import normalize_batch
+from scheduler import PageScheduler
+from checkpoint import CrawlCheckpoint
+from database import load_details
+from dedup import DedupIndex
+from enrichment import DetailEnricher
+from http_cache import PageCache
+from utils import wait_for_cards
+from metrics import Metrics
+from records import Product
 
 
 class DivanParser:
     """
     Парсер товаров с сайта divan.ru.
     Собирает название, цену и ссылку на товар из указанной категории.
-    Результаты сохраняются в выбранный формат (CSV / JSON / SQLite).
+    Результаты сохраняются в выбранный формат (CSV / JSON / SQLite / Parquet).
     """
 
     BASE_URL = "https://www.divan.ru/category/"
 
-    def __init__(self, export_format: str = "sqlite", headless: bool = True):
+    # Лёгкий профиль Chrome: парсеру нужны HTML и скрипты каталога, а не картинки,
+    # шрифты, видео, счётчики и трекеры (Network.setBlockedURLs, * — любые символы)
+    BLOCKED_URLS = [
+        "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+        "*.woff", "*.woff2", "*.ttf", "*.otf",
+        "*.mp4", "*.webm", "*.mp3",
+        "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+        "*mc.yandex.ru*", "*top-fwz1.mail.ru*", "*vk.com/rtrg*", "*connect.facebook.net*",
+        "*criteo.com*", "*mindbox.ru*", "*jivosite.com*",
+    ]
+
+    EXTRACTION_MODES = ("webdriver", "batch")
+    ENGINES = ("selenium", "http")
+
+    def __init__(self, export_format: str = "sqlite", headless: bool = True,
+                 extraction: str = "webdriver", engine: str = "selenium",
+                 base_url: str = None, js_fallback: bool = True,
+                 max_pages: int = None, concurrency: int = 1, rate: float = 0.5,
+                 cache: str = None, cache_ttl: float = 3600, cache_only: bool = False,
+                 lean_browser: bool = True, profile_dir: str = None,
+                 selectors: str = None, learn_selectors: bool = True,
+                 enrich: bool = False, enrich_workers: int = 4,
+                 dedup: bool = True, dedup_capacity: int = None):
         """
-        :param export_format: Формат сохранения ('csv', 'json', 'sqlite')
+        :param export_format: Формат сохранения ('csv', 'json', 'sqlite', 'parquet')
         :param headless: Запуск браузера в фоновом режиме
+        :param extraction: Способ извлечения карточек:
+            'webdriver' — find_element по каждой карточке,
+            'batch' — один снимок page_source, разбираемый в процессе (lxml)
+        :param engine: Способ загрузки страниц:
+            'selenium' — через Chrome,
+            'http' — прямой HTTP-запрос из пула соединений, без браузера
+        :param base_url: Адрес, к которому дописывается категория (по умолчанию BASE_URL)
+        :param js_fallback: Для engine='http': открывать страницу в Chrome,
+            если в полученном HTML нет карточек (страница рендерится через JS)
+        :param max_pages: Сколько страниц категории обходить (None — все)
+        :param concurrency: Сколько страниц загружается одновременно
+            (через Chrome страницы всё равно идут по одной)
+        :param rate: Запросов в секунду к сайту — задержка, чтобы сайт не забанил
+        :param cache: Файл локального кэша страниц (None — без кэша)
+        :param cache_ttl: Сколько секунд страница из кэша не перезапрашивается;
+            позже для engine='http' идёт условный GET (ETag / Last-Modified)
+        :param cache_only: Только кэш, без сети: сохранённые страницы разбираются
+            заново, отсутствующие пропускаются
+        :param lean_browser: Лёгкий профиль Chrome: без картинок, шрифтов, медиа
+            и сторонних счётчиков (BLOCKED_URLS), без расширений, стратегия загрузки eager
+        :param profile_dir: Папка профиля Chrome, переиспользуемая между запусками
+            (кэш браузера и cookies сохраняются); None — временный профиль
+        :param selectors: Файл конфигурации полей и селекторов (YAML / JSON, см. load_fields);
+            None — встроенные цепочки extractor.FIELDS
+        :param learn_selectors: Пробовать первым селектор, который чаще срабатывает
+        :param enrich: Дополнять товары данными страницы товара (артикул, размеры,
+            материал, наличие, старая цена) — по HTTP, каждая ссылка загружается один раз
+        :param enrich_workers: Сколько страниц товаров загружается одновременно
+        :param dedup: Товар, уже встреченный в другой категории за этот запуск,
+            не обогащается и не записывается повторно (в SQLite пополняется product_categories)
+        :param dedup_capacity: Ожидаемое число товаров — индекс повторов в виде фильтра Блума
+            для очень больших обходов (None — точное множество ссылок)
         """
+        if enrich and cache_only:
+            raise ValueError("Обогащение страницами товаров требует сети и несовместимо с cache_only")
         self.export_format = export_format.lower()
+        self.extraction = extraction.lower()
+        if self.extraction not in self.EXTRACTION_MODES:
+            raise ValueError("Неверный режим извлечения! Используй: webdriver / batch")
+        self.engine = engine.lower()
+        if self.engine not in self.ENGINES:
+            raise ValueError("Неверный движок! Используй: selenium / http")
+        self.base_url = base_url or self.BASE_URL
+        self.headless = headless
+        self.lean_browser = lean_browser
+        self.profile_dir = profile_dir
+        self.js_fallback = js_fallback
         self._setup_logging()
-        self.driver = self._init_driver(headless)
-        self.products = []  # список для хранения результатов
+        # Таймеры фаз, счётчики карточек и селекторов (сводка — metrics.summary())
+        self.metrics = Metrics()
+        self.product_log_every = 10  # в DEBUG пишется каждый N-й товар
+        self.selectors = SelectorStrategy(
+            load_fields(selectors) if selectors else None, learn=learn_selectors
+        )
+        self.scheduler = PageScheduler(
+            concurrency=concurrency, rate=rate, max_pages=max_pages,
+            logger=self.logger, metrics=self.metrics,
+        )
+        self._driver_lock = threading.Lock()
+
+        # Chrome запускается лениво, при первой странице, которой он нужен:
+        # для движка http это только страницы с JS-рендерингом
+        self.driver = None
+        self.fetcher = HTTPFetcher() if self.engine == "http" else None
+        self.cache = None
+        if cache or cache_only:
+            if not cache:
+                raise ValueError("Для режима только кэша нужен файл кэша (cache)")
+            self.cache = PageCache(cache, ttl=cache_ttl, offline=cache_only)
+        self.dedup = DedupIndex(dedup_capacity) if dedup else None
+        # Страницы товаров — общий с категориями ограничитель частоты запросов
+        self.enricher = None
+        if enrich:
+            self.enricher = DetailEnricher(
+                fetcher=self.fetcher, workers=enrich_workers,
+                rate_limiter=self.scheduler.rate_limiter,
+                logger=self.logger, metrics=self.metrics,
+            )
+        self.products = []  # результаты: компактные записи Product (records.py)
+        self.exporter = None  # открытый экспортер при потоковом экспорте
+        self.checkpoint = None  # журнал прогресса для --resume
+        self.failed_categories = []  # категории, обход которых прервала ошибка загрузки
+        self._written_links = []  # ссылки товаров, записанных после последней отметки в журнале
+        self.checkpoint_interval = 10  # страниц между сбросами журнала на диск
+        self.page_timeout = 20  # предельное ожидание карточек в Chrome, с
+        # Ожидание готовности страниц в Chrome и число пустых страниц
+        self.stats = {"ready_seconds": 0.0, "empty_pages": 0}
 
     def _setup_logging(self):
         """Настройка логирования."""
@@ -38,128 +154,444 @@ class DivanParser:
 
     def _init_driver(self, headless: bool):
         """Инициализация Selenium WebDriver."""
+        # Selenium (~0,15 с импорта) грузится только здесь: движку http
+        # и режиму только кэша браузер может не понадобиться вовсе
+        from selenium import webdriver
+        from selenium.common.exceptions import WebDriverException
+
         options = webdriver.ChromeOptions()
         if headless:
             options.add_argument("--headless=new")
         options.add_argument("--disable-blink-features=AutomationControlled")
-        return webdriver.Chrome(options=options)
+        if self.profile_dir:
+            options.add_argument(f"--user-data-dir={os.path.abspath(self.profile_dir)}")
+        if not self.lean_browser:
+            return webdriver.Chrome(options=options)
+
+        # Не ждём картинки и стили: карточки ждёт wait_for_cards
+        options.page_load_strategy = "eager"
+        options.add_argument("--disable-extensions")
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_experimental_option(
+            "prefs", {"profile.managed_default_content_settings.images": 2}
+        )
+        driver = webdriver.Chrome(options=options)
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.BLOCKED_URLS})
+        except WebDriverException as e:
+            self.logger.warning(f"Не удалось включить блокировку ресурсов: {e}")
+        return driver
+
+    def _get_driver(self):
+        """Возвращает WebDriver, запуская Chrome при первом обращении."""
+        if self.driver is None:
+            self.logger.info("Запускаю Chrome")
+            with self.metrics.timer("phase_seconds", phase="driver_start"):
+                self.driver = self._init_driver(self.headless)
+        return self.driver
+
+    def parse_category(self, category: str, on_page=None) -> int:
+        """
+        Парсинг товаров указанной категории (все страницы).
+
+        :param category: Категория (часть URL после BASE_URL)
+        :param on_page: Получает список товаров каждой страницы по мере её готовности.
+            По умолчанию товары уходят в открытый экспорт (start_export)
+            или складываются в self.products.
+        :return: Число страниц с товарами
+        """
+        url = self.base_url + category
+        if self.checkpoint is not None and self.checkpoint.is_category_done(category):
+            self.logger.info(f"Категория {category} уже обойдена в прошлом запуске, пропускаю")
+            return 0
 
-    def parse_category(self, category: str):
-        """Парсинг товаров указанной категории."""
-        url = self.BASE_URL + category
         self.logger.info(f"Начинаю парсинг категории: {category} ({url})")
 
-        self.driver.get(url)
+        checkpoint = self.checkpoint
+        failed = []
+        pages = self.scheduler.crawl(
+            url,
+            lambda page: self._fetch_page(category, page),
+            on_page or self._collect,
+            skip=checkpoint.is_page_done if checkpoint else None,
+            on_done=self._page_done if checkpoint else None,
+            on_failed=failed.append,
+            throttle=False,  # пауза — только перед запросом к сети (см. _load_page)
+        )
 
-        try:
-            WebDriverWait(self.driver, 20).until(
-                EC.presence_of_all_elements_located(
-                    (By.CSS_SELECTOR, "div[data-testid='product-card']")
+        if failed:
+            # Категория не отмечается пройденной: --resume догрузит страницы,
+            # которых нет в журнале, начиная с упавшей
+            self.failed_categories.append(category)
+            self.logger.warning(
+                f"Категория {category} обойдена не полностью: не загрузилась {failed[0]}"
+            )
+        elif checkpoint is not None:
+            checkpoint.category_done(category)
+        if checkpoint is not None:
+            self._save_checkpoint()
+
+        if not failed:
+            self.logger.info(f"✅ Парсинг категории {category} завершён")
+        return pages
+
+    def parse_categories(self, categories) -> int:
+        """
+        Обходим категории по очереди и пишем в лог итог: страницы, паузы, ожидание
+        карточек и срабатывания селекторов.
+        :return: Число страниц с товарами
+        """
+        pages = sum(self.parse_category(category) for category in categories)
+
+        stats = {**self.scheduler.stats, **self.stats}
+        self.logger.info(
+            f"Страниц загружено: {stats['pages']}, пустых: {stats['empty_pages']}; "
+            f"паузы между запросами {stats['throttle_seconds']:.1f} с, "
+            f"загрузка {stats['load_seconds']:.1f} с "
+            f"(из них ожидание карточек {stats['ready_seconds']:.1f} с)"
+        )
+        self.log_selector_report()
+        return pages
+
+    def _page_done(self, url: str, rows: int):
+        """Отмечаем страницу в журнале; на диск журнал уходит раз в checkpoint_interval страниц."""
+        self.checkpoint.page_done(url, rows, self._take_written_links())
+        if self.checkpoint.pending >= self.checkpoint_interval:
+            self._save_checkpoint()
+
+    def _take_written_links(self) -> list:
+        """Ссылки товаров, записанных с прошлой отметки, — для журнала прогресса."""
+        links, self._written_links = self._written_links, []
+        return links
+
+    def _save_checkpoint(self):
+        """Сначала данные экспорта на диск, затем журнал — журнал не обгоняет данные."""
+        if self.exporter is not None:
+            self.exporter.flush()
+        self.checkpoint.commit()
+
+    def collect_category(self, category: str, products: list):
+        """
+        Принимаем товары категории, обойденной в другом процессе (--workers):
+        пишем их в экспорт и отмечаем категорию в журнале.
+        """
+        self._collect(products)
+        if self.checkpoint is not None:
+            self.checkpoint.category_done(category, self._take_written_links())
+            self._save_checkpoint()
+
+    def _fetch_page(self, category: str, url: str):
+        """
+        Загружаем одну страницу, извлекаем карточки и нормализуем цены.
+
+        :return: Список товаров или None, если страница не загрузилась
+        """
+        products = self._load_page(category, url)
+        if products:
+            normalize_batch(products)
+        return products
+
+    def _load_page(self, category: str, url: str):
+        """
+        Загружаем одну страницу выбранным движком и извлекаем карточки.
+        С кэшем свежие и не изменившиеся (304) страницы не скачиваются и не разбираются.
+        Ограничитель частоты ждёт только перед запросом к сети: страницы из кэша — без пауз.
+
+        :return: Список товаров или None, если страница не загрузилась
+        """
+        cached = self.cache.get(url) if self.cache is not None else None
+        if self.cache is not None and self.cache.offline:
+            if cached is None:
+                self.logger.error(f"Страницы {url} нет в кэше")
+                return None
+            self.cache.hits += 1
+            return extract_cards(
+                cached.body, category, base_url=url, logger=self.logger, strategy=self.selectors
+            )
+        if cached is not None and self.cache.is_fresh(cached):
+            self.cache.hits += 1
+            self.logger.info(f"Страница {url} взята из кэша")
+            return cached.products
+
+        if self.engine == "http":
+            self.scheduler.throttle(url)
+            try:
+                with self.metrics.timer("phase_seconds", phase="page_load"):
+                    response = self.fetcher.fetch_conditional(
+                        url, *((cached.etag, cached.last_modified) if cached else ())
+                    )
+            except FetchError as e:
+                if e.status == 404:
+                    # Такой страницы нет — это ответ сайта, а не сбой: повтор его не изменит
+                    self.logger.info(f"Страницы {url} нет (HTTP 404)")
+                    return []
+                self.metrics.inc("page_errors")
+                self.logger.error(f"Ошибка загрузки страницы {url}: {e}")
+                return None
+
+            if response is None:
+                # 304 Not Modified: товары страницы не изменились
+                self.cache.revalidated(url)
+                self.cache.hits += 1
+                self.logger.info(f"Страница {url} не изменилась, товары взяты из кэша")
+                return cached.products
+
+            page_source, etag, last_modified = response
+            with self.metrics.timer("phase_seconds", phase="extraction"):
+                products = extract_cards(
+                    page_source, category, base_url=url,
+                    logger=self.logger, metrics=self.metrics, strategy=self.selectors,
                 )
+            if not products and is_empty_page(page_source):
+                # Категория пуста — Chrome не покажет больше
+                self.stats["empty_pages"] += 1
+                self.metrics.inc("empty_pages")
+                self.logger.info(f"На странице {url} нет товаров")
+                return []
+            if products or not self.js_fallback:
+                if products and self.cache is not None:
+                    self.cache.put(url, page_source, etag, last_modified, products)
+                return products
+            self.logger.info(f"В HTML нет карточек, открываю {url} в Chrome")
+
+        # Один Chrome на парсер: страницы через него идут строго по очереди
+        with self._driver_lock:
+            products = self._fetch_with_driver(category, url)
+            if products and self.cache is not None:
+                # Отрисованная страница без валидаторов: повторно запросится по ttl
+                self.cache.put(url, self.driver.page_source, products=products)
+        return products
+
+    def _fetch_with_driver(self, category: str, url: str):
+        """Загрузка страницы через Selenium и извлечение карточек."""
+        driver = self._get_driver()
+        self.scheduler.throttle(url)
+        with self.metrics.timer("phase_seconds", phase="page_load"):
+            driver.get(url)
+
+        try:
+            # Ждём, пока число карточек перестанет расти, а не фиксированные 20 с
+            cards, waited = wait_for_cards(
+                self.driver, CARD_SELECTOR, EMPTY_SELECTORS, timeout=self.page_timeout
             )
         except Exception as e:
+            self.metrics.inc("page_errors")
             self.logger.error(f"Ошибка загрузки страницы {url}: {e}")
-            return
+            return None
 
-        products = self.driver.find_elements(
-            By.CSS_SELECTOR, "div[data-testid='product-card']"
-        )
+        self.stats["ready_seconds"] += waited
+        self.metrics.observe("phase_seconds", waited, phase="wait")
+        if not cards:
+            self.stats["empty_pages"] += 1
+            self.metrics.inc("empty_pages")
+            self.logger.info(f"На странице {url} нет товаров (ожидание {waited:.2f} с)")
+            return []
+        self.logger.info(f"Страница {url} готова за {waited:.2f} с: карточек {cards}")
 
-        for product in products:
+        with self.metrics.timer("phase_seconds", phase="extraction"):
+            if self.extraction == "batch":
+                return extract_cards(
+                    self.driver.page_source, category, base_url=url,
+                    logger=self.logger, metrics=self.metrics, strategy=self.selectors,
+                )
+            return self._parse_elements(category)
+
+    def _collect(self, products: list):
+        """
+        Передаём карточки страницы в экспорт или копим их в self.products.
+        Товары, уже встреченные в других категориях, отсеиваются до обогащения и записи.
+        """
+        if self.dedup is not None:
+            products, repeated = self.dedup.filter(products)
+            if repeated:
+                self.metrics.inc("duplicates_skipped", len(repeated))
+                if self.export_format == "sqlite" and self.exporter is not None:
+                    self.exporter.write_categories(repeated)
+            if not products:
+                return
+            if self.checkpoint is not None:
+                # Индекс повторов восстановится по журналу при продолжении (--resume)
+                self._written_links.extend(
+                    item["link"] for item in products if item.get("link", NO_LINK) != NO_LINK
+                )
+        # Строка лога на каждый товар тормозит большие категории — только DEBUG и выборочно
+        if self.logger.isEnabledFor(logging.DEBUG):
+            for item in products[::self.product_log_every]:
+                self.logger.debug(f"Нашёл товар: {item['name']} — {item['price']}")
+        if self.enricher is not None:
+            with self.metrics.timer("phase_seconds", phase="enrichment"):
+                self.enricher.enrich(products)
+        if self.exporter is not None:
+            with self.metrics.timer("phase_seconds", phase="export"):
+                self.exporter.write_batch(products)
+        else:
+            self.products.extend(products)
+
+    def _parse_elements(self, category: str) -> list:
+        """
+        Извлечение карточек через find_element (по запросу к WebDriver на поле).
+        Поля и цепочки селекторов — из self.selectors, самый удачный селектор пробуется первым.
+        """
+        from selenium.webdriver.common.by import By
+
+        products = self.driver.find_elements(By.CSS_SELECTOR, CARD_SELECTOR)
+        parsed = []
+        hits = Counter()  # какой селектор сработал по каждому полю
+        failures = 0
+
+        for index, product in enumerate(products):
             try:
-                # Название товара
-                try:
-                    name = product.find_element(
-                        By.CSS_SELECTOR, "span[itemprop='name']"
-                    ).text
-                except NoSuchElementException:
-                    try:
-                        name = product.find_element(
-                            By.CSS_SELECTOR, "a[data-testid='product-title']"
-                        ).text
-                    except NoSuchElementException:
-                        try:
-                            name = product.find_element(By.CSS_SELECTOR, ".PJZwc").text
-                        except NoSuchElementException:
-                            name = "Без названия"
-
-                # Цена
-                try:
-                    price = product.find_element(
-                        By.CLASS_NAME, "ui-LD-ZU KIkOH"
-                    ).text
-                except NoSuchElementException:
-                    try:
-                        price = product.find_element(
-                            By.CSS_SELECTOR, "meta[itemprop='price']"
-                        ).get_attribute("content")
-                    except NoSuchElementException:
-                        try:
-                            price = product.find_element(
-                                By.CSS_SELECTOR, ".ui-LD-ZU.TA0JV"
-                            ).text
-                        except NoSuchElementException:
-                            price = "Не указана"
-
-                # Ссылка
-                try:
-                    link = product.find_element(By.TAG_NAME, "a").get_attribute("href")
-                except NoSuchElementException:
-                    link = "Нет ссылки"
-
-                # Сохраняем в список
-                self.products.append({
-                    "name": name,
-                    "price": price,
-                    "link": link,
-                    "category": category
-                })
-
-                self.logger.info(f"Нашёл товар: {name} — {price}")
+                item = Product()
+                for field, chain in self.selectors.chains.items():
+                    if self.selectors.learn and index == 0:
+                        # Первая карточка — всей цепочкой (см. SelectorStrategy.probe)
+                        item[field] = self.selectors.probe(
+                            field,
+                            lambda selector, attribute: self._element_value(product, selector, attribute),
+                            hits,
+                        )
+                    else:
+                        item[field] = self._find_field(product, field, chain, hits)
+                item["category"] = category
+                parsed.append(item)
 
             except Exception as e:
+                failures += 1
                 self.logger.warning(
                     f"Не удалось распарсить товар. Ошибка: {e}\n"
                     f"HTML:\n{product.get_attribute('outerHTML')}"
                 )
 
-        self.logger.info(f"✅ Парсинг категории {category} завершён")
+        if self.selectors.learn:
+            self.selectors.record(hits)
+        record_hits(self.metrics, hits, len(parsed), failures)
+        return parsed
+
+    def _find_field(self, product, field: str, chain: list, hits: Counter) -> str:
+        """Значение поля по первому сработавшему селектору цепочки (WebElement)."""
+        for selector, attribute in chain:
+            value = self._element_value(product, selector, attribute)
+            if value is None:
+                continue
+            hits[(field, selector)] += 1
+            return value
+        hits[(field, DEFAULT_HIT)] += 1
+        return self.selectors.fields[field]["default"]
+
+    def _element_value(self, product, selector: str, attribute: str = None):
+        """Значение одного селектора в карточке (WebElement) или None, если он не сработал."""
+        from selenium.common.exceptions import NoSuchElementException
+        from selenium.webdriver.common.by import By
+
+        # Селектор из одного имени тега ищем по тегу — как и раньше для ссылки
+        by = By.TAG_NAME if selector.isalpha() else By.CSS_SELECTOR
+        try:
+            element = product.find_element(by, selector)
+        except NoSuchElementException:
+            return None
+        return element.text if attribute is None else element.get_attribute(attribute)
+
+    def log_selector_report(self):
+        """Пишем в лог, как часто срабатывал каждый селектор (в текущем порядке цепочек)."""
+        for field, hits in self.selectors.report().items():
+            total = sum(count for _, count in hits)
+            if not total:
+                continue
+            shares = ", ".join(
+                f"{selector} {count / total:.0%}" for selector, count in hits if count
+            )
+            self.logger.info(f"Селекторы поля {field}: {shares}")
+
+    def _output_path(self, output_path: str = None) -> str:
+        """
+        Путь к файлу для сохранения; директория создаётся, если её нет.
+        :param output_path: Если None, файл создаётся в examples/
+        """
+        return exporters.prepare_output_path(self.export_format, output_path)
+
+    def _create_exporter(self, output_path: str = None):
+        """
+        Создаём экспортер выбранного формата.
+        :param output_path: Путь к файлу для сохранения. Если None, создаётся в examples/
+        """
+        return exporters.create_exporter(self.export_format, output_path)
 
     def export_results(self, output_path: str = None):
         """
-        Сохраняем данные в выбранный формат.
+        Сохраняем накопленные в self.products данные в выбранный формат.
         :param output_path: Путь к файлу для сохранения. Если None, создаётся в examples/
         """
         if not self.products:
             self.logger.warning("⚠ Нет данных для экспорта")
             return
 
-        exporters = {
-            "csv": CSVExporter,
-            "json": JSONExporter,
-            "sqlite": SQLiteExporter,
-        }
-
-        ExporterClass = exporters.get(self.export_format)
-        if not ExporterClass:
-            raise ValueError("Неверный формат! Используй: csv / json / sqlite")
+        exporter = self._create_exporter(output_path)
+        exporter.export(self.products)
+        self.logger.info(f"Данные экспортированы в {self.export_format.upper()}: {output_path}")
 
-        # Формируем путь по умолчанию, если не указан
-        if output_path is None:
-            output_path = os.path.join(
-                "examples", f"products.{self.export_format}"
-            )
+    def start_export(self, output_path: str = None, checkpoint: bool = False,
+                     resume: bool = False):
+        """
+        Включаем потоковый экспорт: товары каждой страницы сразу пишутся
+        в файл/базу и не копятся в self.products.
+        :param output_path: Путь к файлу для сохранения. Если None, создаётся в examples/
+        :param checkpoint: Вести журнал прогресса (<output_path>.checkpoint),
+            чтобы после сбоя продолжить с места остановки
+        :param resume: Продолжить прерванный обход: пропустить записанные страницы
+            и категории и дописывать в тот же файл
+        """
+        output_path = self._output_path(output_path)
+        journal = output_path + ".checkpoint"
+        resume = resume and checkpoint and os.path.exists(journal)
 
-        # Создаём директорию, если её нет
-        output_dir = os.path.dirname(output_path)
-        if output_dir and not os.path.exists(output_dir):
-            os.makedirs(output_dir)
+        self.exporter = self._create_exporter(output_path)
+        self.exporter.open(append=resume)
+        if self.enricher is not None and self.export_format == "sqlite":
+            # Товары, обогащённые в прошлых запусках, повторно не загружаются
+            self.enricher.preload(load_details(self.exporter.conn))
+        if checkpoint:
+            self.checkpoint = CrawlCheckpoint(journal, resume=resume)
+            if resume:
+                self.logger.info(
+                    f"Продолжаю обход: уже записано страниц {len(self.checkpoint.done_pages)}, "
+                    f"категорий {len(self.checkpoint.done_categories)}, "
+                    f"товаров {self.checkpoint.rows}"
+                )
+                if self.dedup is not None:
+                    # Товары законченных категорий остаются повторами и после перезапуска
+                    self.dedup.seed(self.checkpoint.links)
+                self.checkpoint.links = []
 
-        exporter = ExporterClass(output_path)
-        exporter.export(self.products)
-        self.logger.info(f"Данные экспортированы в {self.export_format.upper()}: {output_path}")
+    def finish_export(self, completed: bool = False) -> int:
+        """
+        Завершаем потоковый экспорт.
+        :param completed: Обход завершён целиком — журнал прогресса больше не нужен
+        :return: Сколько записей сохранено
+        """
+        if self.exporter is None:
+            return 0
+        exporter, self.exporter = self.exporter, None
+        exporter.close()
+        if self.checkpoint is not None:
+            # Закрытый экспортер уже на диске — журнал можно дописать
+            self.checkpoint.close(completed=completed)
+            self.checkpoint = None
+        self.logger.info(
+            f"Данные экспортированы в {self.export_format.upper()}: {exporter.count} записей"
+        )
+        return exporter.count
 
     def close(self):
-        """Закрываем браузер."""
-        self.driver.quit()
-        self.logger.info("Закрыл браузер")
+        """Закрываем экспорт, браузер и HTTP-соединения."""
+        # Уже записанные страницы остаются в файле, даже если парсинг прервался
+        self.finish_export()
+        if self.enricher is not None:
+            self.enricher.close()
+        if self.fetcher is not None:
+            self.fetcher.close()
+        if self.cache is not None:
+            self.cache.close()
+        if self.driver is not None:
+            self.driver.quit()
+            self.logger.info("Закрыл браузер")
@@ -0,0 +1,73 @@
+import re
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple
+
+
+DEFAULT_CURRENCY = "RUB"  # цены на divan.ru (в т.ч. meta[itemprop='price']) — в рублях
+
+# Разделители разрядов в ценах: пробел, неразрывный и узкие пробелы ("12 990")
+_SEPARATORS = (" ", "\t", "\u00a0", "\u2009", "\u202f")
+
+# Одна строка (до \n) — одна цена: префикс, рубли, копейки (необязательно), хвост.
+# Префикс жадно забирает всё до первой цифры, поэтому строка без цифр
+# ("Неуказана", пустая) совпадает без перебора с пустыми группами
+_PRICE_LINE = re.compile(r"([^\d\n]*)(?:(\d+)(?:[.,](\d\d?)(?!\d))?([^\n]*))?\n")
+
+_CURRENCIES = (
+    ("₽", "RUB"), ("руб", "RUB"), ("р.", "RUB"), ("rub", "RUB"),
+    ("$", "USD"), ("usd", "USD"),
+    ("€", "EUR"), ("eur", "EUR"),
+)
+
+
+@lru_cache(maxsize=256)
+def _currency(text: str) -> str:
+    """Валюта по символу или сокращению рядом с числом (вариантов на сайте единицы)."""
+    text = text.lower()
+    for marker, code in _CURRENCIES:
+        if marker in text:
+            return code
+    return DEFAULT_CURRENCY
+
+
+def normalize_prices(raw_prices: List[Optional[str]]) -> List[Tuple[Optional[int], Optional[str]]]:
+    """
+    Переводим цены страницы из текста в (сумма в копейках, валюта) за один проход.
+
+    Все строки склеиваются в один текст, разделители разрядов удаляются
+    из него целиком, а числа выбираются одним findall по всему тексту — без
+    отдельного вызова регулярного выражения на каждую строку.
+    Для строк без числа ("Не указана", "") возвращается (None, None).
+
+    :param raw_prices: Цены в том виде, в каком они на сайте ("12 990 руб.", "4999")
+    """
+    if not raw_prices:
+        # Пустой текст дал бы одну «строку» без цены
+        return []
+    text = "\n".join([price or "" for price in raw_prices])
+    if text.count("\n") != len(raw_prices) - 1:
+        # Перевод строки внутри цены сдвинул бы строки — заменяем его пробелом
+        text = "\n".join([(price or "").replace("\n", " ") for price in raw_prices])
+    for separator in _SEPARATORS:
+        text = text.replace(separator, "")
+
+    return [
+        (
+            int(units) * 100 + (int(cents.ljust(2, "0")) if cents else 0),
+            _currency(prefix + suffix),
+        )
+        if units else (None, None)
+        for prefix, units, cents, suffix in _PRICE_LINE.findall(text + "\n")
+    ]
+
+
+def normalize_batch(products: List[Dict]) -> List[Dict]:
+    """
+    Добавляем к товарам страницы поля price_kopecks и currency (на месте).
+    Исходный текст цены остаётся в поле price.
+    """
+    normalized = normalize_prices([item.get("price") for item in products])
+    for item, (kopecks, currency) in zip(products, normalized):
+        item["price_kopecks"] = kopecks
+        item["currency"] = currency
+    return products
@@ -0,0 +1,263 @@
+"""
+Чтение базы товаров: индексы и запросы для отчётов и дашбордов.
+
+Запросы возвращают итераторы: строки читаются страницами по page_size
+с keyset-пагинацией (WHERE (цена, id) > (последние) ... LIMIT), поэтому
+ни Python, ни SQLite не держат в памяти всю выборку, а каждая страница —
+короткий проход по индексу, а не OFFSET по уже прочитанным строкам.
+
+Запуск:
+    python queries.py range    --db examples/products.sqlite --category svet --min 1000 --max 5000
+    python queries.py cheapest --db examples/products.sqlite --category svet --limit 20
+    python queries.py changes  --db examples/products.sqlite --since 2025-01-01
+    python sofa_parsing.py query cheapest --db examples/products.sqlite
+"""
+import argparse
+import csv
+import json
+import os
+import pathlib
+import sqlite3
+import sys
+from typing import Dict, Iterator, List
+
+# Индексы под запросы модуля; init_db создаёт только уникальную ссылку и цену
+INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_products_category_price ON products (category, price_kopecks);
+CREATE INDEX IF NOT EXISTS idx_product_categories_category ON product_categories (category, link);
+CREATE INDEX IF NOT EXISTS idx_price_history_changed ON price_history (changed_at);
+"""
+
+PRODUCT_COLUMNS = "p.id, p.name, p.price, p.price_kopecks, p.currency, p.link, p.category"
+
+
+def open_store(db_name: str) -> sqlite3.Connection:
+    """
+    Открываем существующую базу товаров для запросов. Схему приводит к текущей
+    только парсер (init_db); здесь создаются лишь недостающие индексы запросов.
+
+    :raises FileNotFoundError: Файла базы нет — опечатка в пути не создаёт пустую базу
+    :raises ValueError: База старого формата (без числовой цены или таблицы категорий)
+    """
+    try:
+        conn = sqlite3.connect(f"{pathlib.Path(db_name).resolve().as_uri()}?mode=rw", uri=True)
+    except sqlite3.OperationalError:
+        raise FileNotFoundError(f"Нет базы товаров: {db_name}") from None
+    tables = {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(products)")}
+    if "price_kopecks" not in columns or "product_categories" not in tables:
+        conn.close()
+        raise ValueError(f"{db_name}: база старого формата, обнови её запуском парсера с --format sqlite")
+    ensure_indexes(conn)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def ensure_indexes(conn: sqlite3.Connection):
+    """Создаём индексы по категории, числовой цене и дате изменения цены."""
+    conn.executescript(INDEXES)
+    conn.commit()
+
+
+def _paginate(conn: sqlite3.Connection, sql: str, params: List, keys: List[str],
+              page_size: int, limit: int = None) -> Iterator[Dict]:
+    """
+    Keyset-пагинация: sql содержит {after} — условие «после последней строки страницы»
+    по ключам сортировки keys — и заканчивается ORDER BY по тем же ключам.
+    """
+    last = None
+    returned = 0
+    while limit is None or returned < limit:
+        size = page_size if limit is None else min(page_size, limit - returned)
+        if last is None:
+            query, values = sql.format(after="1"), params
+        else:
+            query = sql.format(after=f"({', '.join(keys)}) > ({', '.join('?' * len(keys))})")
+            values = params + list(last)
+        rows = conn.execute(f"{query} LIMIT ?", values + [size]).fetchall()
+        for row in rows:
+            yield dict(row)
+        returned += len(rows)
+        if len(rows) < size:
+            return
+        last = tuple(rows[-1][key.split(".")[-1]] for key in keys)
+
+
+def price_range(conn: sqlite3.Connection, category: str, min_kopecks: int = None,
+                max_kopecks: int = None, page_size: int = 1000) -> Iterator[Dict]:
+    """
+    Товары категории (в том числе попавшие в неё повторно, см. product_categories)
+    в диапазоне цен, от дешёвых к дорогим.
+
+    Обычно все товары категории записаны с ней же в products — тогда страницы
+    читаются прямо из индекса (category, price_kopecks). Если в категории есть
+    товары, сохранённые под другой категорией, выборка идёт через таблицу связей
+    (каждая страница сортируется заново — медленнее на больших категориях).
+
+    :param min_kopecks: Нижняя граница цены в копейках (None — без ограничения)
+    :param max_kopecks: Верхняя граница цены в копейках (None — без ограничения)
+    :param page_size: Сколько строк читать за один запрос
+    """
+    if _has_secondary(conn, category):
+        source = (
+            "FROM product_categories c JOIN products p ON p.link = c.link WHERE c.category = ?"
+        )
+    else:
+        source = "FROM products p WHERE p.category = ?"
+    sql = (
+        f"SELECT {PRODUCT_COLUMNS} {source} "
+        "AND p.price_kopecks BETWEEN ? AND ? AND {after} "
+        "ORDER BY p.price_kopecks, p.id"
+    )
+    params = [
+        category,
+        min_kopecks if min_kopecks is not None else -2 ** 63,
+        max_kopecks if max_kopecks is not None else 2 ** 63 - 1,
+    ]
+    return _paginate(conn, sql, params, ["p.price_kopecks", "p.id"], page_size)
+
+
+def _has_secondary(conn: sqlite3.Connection, category: str) -> bool:
+    """Есть ли в категории товары, сохранённые в products под другой категорией."""
+    return conn.execute(
+        "SELECT 1 FROM product_categories c JOIN products p ON p.link = c.link "
+        "WHERE c.category = ? AND p.category != c.category LIMIT 1",
+        (category,),
+    ).fetchone() is not None
+
+
+def cheapest(conn: sqlite3.Connection, limit: int = 10, category: str = None,
+             page_size: int = 1000) -> Iterator[Dict]:
+    """
+    limit самых дешёвых товаров (без товаров с неизвестной ценой).
+    Без категории читается прямо индекс цены — без сортировки всей таблицы.
+    """
+    if category is None:
+        sql = (
+            f"SELECT {PRODUCT_COLUMNS} FROM products p "
+            "WHERE p.price_kopecks IS NOT NULL AND {after} "
+            "ORDER BY p.price_kopecks, p.id"
+        )
+        return _paginate(conn, sql, [], ["p.price_kopecks", "p.id"], page_size, limit)
+    return _take(price_range(conn, category, page_size=min(page_size, limit)), limit)
+
+
+def _take(rows: Iterator[Dict], limit: int) -> Iterator[Dict]:
+    for number, row in enumerate(rows):
+        if number >= limit:
+            return
+        yield row
+
+
+def price_changes(conn: sqlite3.Connection, since: str, category: str = None,
+                  page_size: int = 1000) -> Iterator[Dict]:
+    """
+    Изменения цен начиная с даты: прежняя и новая цена по каждой записи истории.
+    Первая цена товара (его появление в базе) изменением не считается.
+
+    :param since: Дата или момент в формате SQLite: '2025-01-31' или '2025-01-31 12:00:00' (UTC)
+    :param category: Только товары этой категории (None — все)
+    """
+    sql = (
+        "SELECT h.id, h.link, h.changed_at, h.price AS new_price, "
+        "(SELECT o.price FROM price_history o WHERE o.link = h.link AND o.id < h.id "
+        "ORDER BY o.id DESC LIMIT 1) AS old_price "
+        "FROM price_history h WHERE h.changed_at >= ? "
+        + ("AND EXISTS (SELECT 1 FROM product_categories c "
+           "WHERE c.link = h.link AND c.category = ?) " if category is not None else "")
+        + "AND {after} ORDER BY h.id"
+    )
+    params = [since] + ([category] if category is not None else [])
+    return _changes_only(_paginate(conn, sql, params, ["h.id"], page_size))
+
+
+def _changes_only(rows: Iterator[Dict]) -> Iterator[Dict]:
+    for row in rows:
+        if row["old_price"] is not None:
+            yield row
+
+
+# ====== CLI ======
+def _write(rows: Iterator[Dict], output_format: str, stream=None) -> int:
+    """Пишем строки по мере чтения (CSV через ';' или JSON Lines). :return: Число строк"""
+    stream = stream or sys.stdout
+    count = 0
+    writer = None
+    for row in rows:
+        if output_format == "jsonl":
+            stream.write(json.dumps(row, ensure_ascii=False) + "\n")
+        else:
+            if writer is None:
+                writer = csv.DictWriter(stream, fieldnames=list(row), delimiter=";")
+                writer.writeheader()
+            writer.writerow(row)
+        count += 1
+    return count
+
+
+def add_arguments(args: argparse.ArgumentParser):
+    """
+    Команды запросов (range / cheapest / changes) и их параметры.
+    :param args: Парсер, в который они добавляются: свой у queries.py
+        или подкоманда query у sofa_parsing.py
+    """
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--db", required=True, help="Файл базы SQLite")
+    common.add_argument(
+        "--output-format", choices=["csv", "jsonl"], default="csv",
+        help="Формат вывода в stdout: csv (разделитель ;) или jsonl",
+    )
+    common.add_argument("--page-size", type=int, default=1000, help="Строк за один запрос к базе")
+    commands = args.add_subparsers(dest="command", required=True)
+
+    price = commands.add_parser("range", parents=[common], help="Товары категории в диапазоне цен")
+    price.add_argument("--category", required=True)
+    price.add_argument("--min", type=float, default=None, help="Цена от, руб.")
+    price.add_argument("--max", type=float, default=None, help="Цена до, руб.")
+
+    top = commands.add_parser("cheapest", parents=[common], help="Самые дешёвые товары")
+    top.add_argument("--category", default=None)
+    top.add_argument("--limit", type=int, default=10)
+
+    changes = commands.add_parser("changes", parents=[common], help="Изменения цен с даты")
+    changes.add_argument("--since", required=True, help="Дата: 2025-01-31 или '2025-01-31 12:00:00' (UTC)")
+    changes.add_argument("--category", default=None)
+
+
+def run(args: argparse.Namespace):
+    """Выполняем запрос, разобранный по add_arguments, и пишем строки в stdout."""
+    try:
+        conn = open_store(args.db)
+    except (FileNotFoundError, ValueError) as error:
+        raise SystemExit(f"❌ {error}")
+    try:
+        if args.command == "range":
+            rows = price_range(
+                conn, args.category,
+                min_kopecks=round(args.min * 100) if args.min is not None else None,
+                max_kopecks=round(args.max * 100) if args.max is not None else None,
+                page_size=args.page_size,
+            )
+        elif args.command == "cheapest":
+            rows = cheapest(conn, args.limit, args.category, page_size=args.page_size)
+        else:
+            rows = price_changes(conn, args.since, args.category, page_size=args.page_size)
+        count = _write(rows, args.output_format)
+    except BrokenPipeError:
+        # Вывод оборвали (| head): дочитывать выборку незачем
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return
+    finally:
+        conn.close()
+    print(f"Строк: {count}", file=sys.stderr)
+
+
+def main(argv: List[str] = None):
+    """Запросы к базе товаров из командной строки."""
+    args = argparse.ArgumentParser(description="Запросы к базе товаров divan.ru")
+    add_arguments(args)
+    run(args.parse_args(argv))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Компактная запись товара для больших обходов.
+
+Словарь из шести полей товара занимает 272 байта: у каждой записи своя
+хэш-таблица с одними и теми же ключами. Product хранит поля в __slots__ —
+88 байт, по ссылке на поле, без таблицы ключей. Категория, валюта и текст цены
+интернируются: различных цен в каталоге тысячи, а товаров — миллионы, и все они
+ссылаются на одни и те же строки (в том числе на одну заглушку «Не указана»).
+Заглушки названия и ссылки — общие значения по умолчанию из конфигурации полей.
+
+Product — изменяемое отображение (MutableMapping): item["name"], item.get(...),
+"link" in item, item.keys(), item.update(...) и сравнение со словарём работают как
+у словаря, поэтому нормализация цен, обогащение, отсев повторов и экспортеры
+принимают записи как есть. Поля вне основных (поля страницы товара, свои поля
+из конфигурации селекторов) хранятся в небольшом словаре _extra только у тех
+записей, где они есть.
+"""
+import sys
+from collections.abc import MutableMapping
+
+# Основные поля в порядке колонок экспорта: поля карточки, категория, нормализованная цена
+FIELDS = ("name", "price", "link", "category", "price_kopecks", "currency")
+
+_FIELDS = frozenset(FIELDS)
+_INTERNED = frozenset(("price", "category", "currency"))  # повторяются у тысяч товаров
+
+
+class Product(MutableMapping):
+    """
+    Запись товара в __slots__ с интерфейсом словаря.
+    Незаполненное поле (например, price_kopecks до нормализации) отсутствует
+    в ключах, как отсутствовал бы ключ словаря.
+    """
+
+    __slots__ = FIELDS + ("_extra",)
+
+    def __init__(self, *args, **fields):
+        """Как dict(): Product({"name": ...}), Product(name=..., price=...)."""
+        self._extra = None
+        if args or fields:
+            self.update(*args, **fields)
+
+    def __getitem__(self, key):
+        if key in _FIELDS:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in _FIELDS:
+            if key in _INTERNED and type(value) is str:
+                value = sys.intern(value)
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        if key in _FIELDS and hasattr(self, key):
+            delattr(self, key)
+        elif self._extra is not None and key in self._extra:
+            del self._extra[key]
+        else:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        if key in _FIELDS:
+            return hasattr(self, key)
+        return self._extra is not None and key in self._extra
+
+    def __iter__(self):
+        for field in FIELDS:
+            if hasattr(self, field):
+                yield field
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def get(self, key, default=None):
+        if key in _FIELDS:
+            return getattr(self, key, default)
+        if self._extra is not None:
+            return self._extra.get(key, default)
+        return default
+
+    def __repr__(self):
+        return f"Product({dict(self)!r})"
+
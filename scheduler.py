@@ -0,0 +1,295 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, List, Dict, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from extractor import NO_LINK
+
+
+def page_url(url: str, page: int) -> str:
+    """
+    Адрес N-й страницы категории (?page=N). Первая страница — исходный адрес.
+    Кнопка «Показать ещё» на divan.ru подгружает те же ?page=N.
+    """
+    if page == 1:
+        return url
+    parts = urlsplit(url)
+    query = [(key, value) for key, value in parse_qsl(parts.query) if key != "page"]
+    query.append(("page", str(page)))
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def _card_key(item: Dict):
+    """
+    Ключ карточки для проверки новизны страницы: ссылка или, без неё, название и цена.
+    Иначе страница без ссылок, которую сайт повторяет на любой ?page=,
+    считалась бы новой бесконечно.
+    """
+    link = item["link"]
+    return link if link != NO_LINK else (NO_LINK, item.get("name"), item.get("price"))
+
+
+class RateLimiter:
+    """
+    Ограничение частоты запросов к одному хосту (token bucket).
+
+    Токены пополняются не чаще rate в секунду, но и не быстрее, чем сервер
+    отвечает: интервал между запросами — не меньше latency_factor × среднее
+    время ответа хоста (observe). Медленный сервер сам снижает темп,
+    быстрый получает запросы с заданной частотой.
+    Потокобезопасен: каждый вызов wait() резервирует следующий свободный токен.
+    """
+
+    def __init__(self, rate: float, burst: int = 1, latency_factor: float = 1.0):
+        """
+        :param rate: Запросов в секунду на хост (0 — без ограничения)
+        :param burst: Сколько запросов можно отправить подряд без паузы
+        :param latency_factor: Во сколько раз пауза больше среднего времени ответа (0 — не учитывать)
+        """
+        self.interval = 1 / rate if rate > 0 else 0
+        self.burst = max(1, burst)
+        self.latency_factor = latency_factor
+        self._buckets = {}  # хост -> [токены, время пополнения]
+        self._latency = {}  # хост -> скользящее среднее времени ответа
+        self._lock = threading.Lock()
+
+    def host_interval(self, host: str) -> float:
+        """Текущий интервал между запросами к хосту."""
+        return max(self.interval, self.latency_factor * self._latency.get(host, 0.0))
+
+    def reserve(self, url: str) -> float:
+        """
+        Резервируем токен для запроса к хосту url, не блокируя поток.
+        :return: Через сколько секунд можно слать запрос
+        """
+        if not self.interval:
+            return 0.0
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            interval = self.host_interval(host)
+            tokens, updated = self._buckets.get(host, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) / interval) - 1
+            self._buckets[host] = (tokens, now)
+        return -tokens * interval if tokens < 0 else 0.0
+
+    def wait(self, url: str) -> float:
+        """
+        Блокирует поток до момента, когда к хосту url можно слать запрос.
+        :return: Сколько секунд пришлось ждать
+        """
+        delay = self.reserve(url)
+        if delay:
+            time.sleep(delay)
+        return delay
+
+    def observe(self, url: str, seconds: float):
+        """Учитываем время ответа хоста (экспоненциальное скользящее среднее)."""
+        host = urlsplit(url).netloc
+        with self._lock:
+            average = self._latency.get(host)
+            self._latency[host] = seconds if average is None else 0.7 * average + 0.3 * seconds
+
+
+class CrawlState:
+    """
+    Где остановить обход одной категории — общее правило PageScheduler
+    и AsyncDivanParser.
+
+    Страницы выдаются по порядку (take), пока не встретится страница без новых
+    товаров (пустая или повторяющая уже полученные карточки), страница
+    с ошибкой или предел: max_pages, а без него — page_limit.
+    """
+
+    def __init__(self, url: str, max_pages: Optional[int] = None, page_limit: int = 1000):
+        """
+        :param url: Адрес первой страницы категории
+        :param max_pages: Ограничение числа страниц (None — все, но не больше page_limit)
+        :param page_limit: Предел страниц, если max_pages не задан
+        """
+        self.url = url
+        self.max_pages = max_pages
+        self.limit = max_pages if max_pages is not None else page_limit
+        self.seen = set()  # ключи уже полученных карточек (_card_key)
+        self.next_page = 1
+        self.last_page = None  # первая страница без новых товаров
+        self.failed = None  # первая страница, которая не загрузилась
+        self.pages = 0  # страниц с новыми товарами
+
+    def has_next(self) -> bool:
+        return self.last_page is None and self.next_page <= self.limit
+
+    def take(self) -> Tuple[int, str]:
+        """Следующая страница: (номер, адрес)."""
+        number = self.next_page
+        self.next_page += 1
+        return number, page_url(self.url, number)
+
+    def _stop(self, number: int):
+        self.last_page = number if self.last_page is None else min(self.last_page, number)
+
+    def accept(self, number: int, products: Optional[List[Dict]]) -> Optional[List[Dict]]:
+        """
+        Учитываем загруженную страницу.
+        :param products: Товары страницы (None — страница не загрузилась)
+        :return: Новые товары страницы или None, если на ней обход останавливается
+        """
+        if products is None:
+            self.failed = number if self.failed is None else min(self.failed, number)
+            self._stop(number)
+            return None
+        keys = [_card_key(item) for item in products]
+        if all(key in self.seen for key in keys):
+            self._stop(number)
+            return None
+
+        # Карточки без ссылки не отсеиваются: одинаковые название и цена
+        # не значат, что это тот же товар
+        fresh = [
+            item for item, key in zip(products, keys)
+            if item["link"] == NO_LINK or key not in self.seen
+        ]
+        self.seen.update(keys)
+        self.pages += 1
+        return fresh
+
+    def report(self, logger):
+        """Пишем в лог, почему обход остановился не на последней странице."""
+        if self.failed is not None:
+            logger.warning(
+                f"Обход {self.url} прерван: страница {page_url(self.url, self.failed)} не загрузилась"
+            )
+        elif self.last_page is None and self.max_pages is None:
+            logger.warning(f"Обход {self.url} остановлен на пределе в {self.limit} страниц")
+
+
+class PageScheduler:
+    """
+    Обход всех страниц категории с ограничением числа одновременных загрузок.
+
+    Держит в работе до concurrency страниц; как только страница загружена,
+    её товары сразу передаются в on_page и ставится следующая страница.
+    Где остановиться, решает CrawlState: на первой странице без новых товаров,
+    с ошибкой или по достижении max_pages (без него — PAGE_LIMIT страниц).
+    О странице с ошибкой сообщается отдельно (on_failed) — категория при этом
+    не считается пройденной.
+    """
+
+    PAGE_LIMIT = 1000  # страниц на категорию, если max_pages не задан
+
+    def __init__(self, concurrency: int = 1, rate: float = 0.5,
+                 max_pages: Optional[int] = None, logger=None, metrics=None):
+        """
+        :param concurrency: Сколько страниц загружается одновременно
+        :param rate: Запросов в секунду на хост
+        :param max_pages: Ограничение числа страниц на категорию (None — все)
+        :param logger: Опциональный логгер
+        :param metrics: Опциональные метрики (metrics.Metrics): паузы и время загрузки страниц
+        """
+        self.concurrency = max(1, concurrency)
+        self.rate_limiter = RateLimiter(rate)
+        self.max_pages = max_pages
+        self.logger = logger
+        self.metrics = metrics
+        # Суммарное время по всем страницам: пауза перед запросом и загрузка
+        self.stats = {"pages": 0, "throttle_seconds": 0.0, "load_seconds": 0.0}
+        self._stats_lock = threading.Lock()
+        self._local = threading.local()  # пауза текущей страницы в потоке загрузки
+
+    def throttle(self, url: str) -> float:
+        """
+        Ждём, пока к хосту url можно слать запрос, и учитываем паузу в статистике.
+        Вызывается прямо перед обращением к сети: страницы из кэша не ждут.
+        :return: Сколько секунд пришлось ждать
+        """
+        throttled = self.rate_limiter.wait(url)
+        self._local.requests = getattr(self._local, "requests", 0) + 1
+        self._local.throttled = getattr(self._local, "throttled", 0.0) + throttled
+        with self._stats_lock:
+            self.stats["throttle_seconds"] += throttled
+        if self.metrics is not None:
+            self.metrics.observe("phase_seconds", throttled, phase="throttle")
+        return throttled
+
+    def _fetch(self, fetch_page: Callable[[str], Optional[List[Dict]]], url: str,
+               throttle: bool = True):
+        self._local.requests, self._local.throttled = 0, 0.0
+        if throttle:
+            self.throttle(url)
+        start = time.monotonic()
+        products = fetch_page(url)
+        loaded = time.monotonic() - start
+        throttled = self._local.throttled
+        if not throttle:
+            # Пауза ушла на ожидание внутри fetch_page, а не на загрузку
+            loaded -= throttled
+        if self._local.requests:
+            # Время ответа учитывается только у страниц, загруженных из сети
+            self.rate_limiter.observe(url, loaded)
+
+        with self._stats_lock:
+            self.stats["pages"] += 1
+            self.stats["load_seconds"] += loaded
+        if self.metrics is not None:
+            self.metrics.observe("page_seconds", loaded)
+        if self.logger:
+            self.logger.info(f"Страница {url}: пауза {throttled:.2f} с, загрузка {loaded:.2f} с")
+        return products
+
+    def crawl(self, url: str,
+              fetch_page: Callable[[str], Optional[List[Dict]]],
+              on_page: Callable[[List[Dict]], None],
+              skip: Callable[[str], bool] = None,
+              on_done: Callable[[str, int], None] = None,
+              on_failed: Callable[[str], None] = None,
+              throttle: bool = True) -> int:
+        """
+        Обходим страницы категории.
+
+        :param url: Адрес первой страницы категории
+        :param fetch_page: Загружает страницу и возвращает её товары (None — ошибка)
+        :param on_page: Получает новые товары каждой страницы по мере готовности
+        :param skip: Страницы, для которых он вернул True, не загружаются
+            (уже обработаны в прошлом запуске) и считаются непустыми
+        :param on_done: Вызывается после on_page с адресом страницы и числом товаров
+        :param on_failed: Вызывается с адресом страницы, которая не загрузилась
+            (fetch_page вернул None). Обход на ней останавливается, но это не конец
+            категории: дальние страницы ещё не получены
+        :param throttle: Ждать ограничителя частоты перед каждой страницей. False —
+            fetch_page сам вызывает throttle(url) перед запросом к сети
+            (страницы из кэша тогда загружаются без пауз)
+        :return: Число страниц с товарами
+        """
+        state = CrawlState(url, self.max_pages, self.PAGE_LIMIT)
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            in_flight = {}
+            while True:
+                while len(in_flight) < self.concurrency and state.has_next():
+                    number, address = state.take()
+                    if skip is not None and skip(address):
+                        continue
+                    future = pool.submit(self._fetch, fetch_page, address, throttle)
+                    in_flight[future] = (number, address)
+
+                if not in_flight:
+                    break
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    number, address = in_flight.pop(future)
+                    products = future.result()
+                    fresh = state.accept(number, products)
+                    if fresh is None:
+                        if products is None and on_failed is not None:
+                            on_failed(address)
+                        continue
+                    on_page(fresh)
+                    if on_done is not None:
+                        on_done(address, len(fresh))
+
+        if self.logger:
+            state.report(self.logger)
+            self.logger.info(f"Обработано страниц: {state.pages} ({url})")
+        return state.pages
@@ -1,15 +1,22 @@
 import argparse
 import os
-from time import sleep
 
-from parser import DivanParser
+import queries
 
 
 def main():
     """Главная функция запуска парсинга товаров с divan.ru."""
     parser_args = argparse.ArgumentParser(
-        description="Парсер товаров с divan.ru"
+        description="Парсер товаров с divan.ru. Без команды — обход категорий "
+        "с параметрами ниже"
     )
+    # Команда query — запросы к собранной базе (см. queries.py)
+    commands = parser_args.add_subparsers(title="команды", dest="mode")
+    queries.add_arguments(commands.add_parser(
+        "query",
+        help="Запросы к собранной базе: range / cheapest / changes",
+        description="Запросы к базе товаров divan.ru",
+    ))
     parser_args.add_argument(
         "--category",
         nargs="+",
@@ -21,9 +28,9 @@ def main():
     )
     parser_args.add_argument(
         "--format",
-        choices=["csv", "json", "sqlite"],
+        choices=["csv", "json", "sqlite", "parquet"],
         default="csv",
-        help="Формат сохранения данных (csv, json, sqlite)",
+        help="Формат сохранения данных (csv, json, sqlite, parquet)",
     )
     parser_args.add_argument(
         "--output",
@@ -37,28 +44,260 @@ def main():
         help="Запуск браузера в фоновом режиме",
     )
 
+    parser_args.add_argument(
+        "--engine",
+        choices=["selenium", "http"],
+        default="selenium",
+        help="Загрузка страниц: selenium (Chrome) или http (без браузера, "
+        "Chrome только для страниц, которым нужен JS)",
+    )
+
+    parser_args.add_argument(
+        "--full-browser",
+        action="store_true",
+        help="Грузить страницы в Chrome целиком (по умолчанию картинки, шрифты "
+        "и сторонние счётчики блокируются)",
+    )
+    parser_args.add_argument(
+        "--profile-dir",
+        default=None,
+        help="Папка профиля Chrome, переиспользуемая между запусками",
+    )
+
+    parser_args.add_argument(
+        "--max-pages",
+        type=int,
+        default=None,
+        help="Сколько страниц каждой категории обходить (по умолчанию все)",
+    )
+    parser_args.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Сколько страниц загружать одновременно",
+    )
+    parser_args.add_argument(
+        "--rate",
+        type=float,
+        default=0.5,
+        help="Запросов в секунду к сайту, чтобы сайт не забанил (0 — без ограничения)",
+    )
+
+    parser_args.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Число процессов-парсеров (у каждого свой браузер), "
+        "между которыми делятся категории",
+    )
+
+    parser_args.add_argument(
+        "--cache",
+        default=None,
+        help="Файл локального кэша страниц: не изменившиеся страницы "
+        "не скачиваются и не разбираются заново. Пример: --cache examples/pages.cache",
+    )
+    parser_args.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=3600,
+        help="Сколько секунд страница из кэша не перезапрашивается",
+    )
+    parser_args.add_argument(
+        "--cache-only",
+        action="store_true",
+        help="Без сети: разобрать страницы, сохранённые в --cache",
+    )
+
+    parser_args.add_argument(
+        "--selectors",
+        default=None,
+        help="Файл с полями и цепочками селекторов (YAML / JSON). "
+        "Пример: --selectors examples/selectors.yaml",
+    )
+
+    parser_args.add_argument(
+        "--enrich",
+        action="store_true",
+        help="Дополнить товары данными страницы товара: артикул, размеры, материал, "
+        "наличие, старая цена (каждая ссылка загружается один раз)",
+    )
+    parser_args.add_argument(
+        "--enrich-workers",
+        type=int,
+        default=4,
+        help="Сколько страниц товаров загружать одновременно (по умолчанию 4)",
+    )
+
+    parser_args.add_argument(
+        "--keep-duplicates",
+        action="store_true",
+        help="Не отсеивать товары, уже встреченные в других категориях",
+    )
+    parser_args.add_argument(
+        "--dedup-capacity",
+        type=int,
+        default=None,
+        help="Ожидаемое число товаров: индекс повторов в виде фильтра Блума "
+        "(для очень больших обходов; по умолчанию — точное множество ссылок)",
+    )
+
+    parser_args.add_argument(
+        "--metrics",
+        default=None,
+        help="Сохранить JSON-сводку метрик (время фаз, счётчики карточек и селекторов). "
+        "Пример: --metrics examples/metrics.json",
+    )
+    parser_args.add_argument(
+        "--metrics-prom",
+        default=None,
+        help="Файл метрик в формате Prometheus (для textfile-коллектора node_exporter)",
+    )
+    parser_args.add_argument(
+        "--metrics-port",
+        type=int,
+        default=None,
+        help="Отдавать метрики Prometheus по HTTP на этом порту (/metrics) во время обхода",
+    )
+
+    parser_args.add_argument(
+        "--resume",
+        action="store_true",
+        help="Продолжить прерванный запуск: пропустить уже записанные страницы "
+        "и категории и дописывать в тот же файл",
+    )
+
+    parser_args.add_argument(
+        "--daemon",
+        default=None,
+        metavar="SOCKET",
+        help="Отправить задание демону с тёплыми браузерами (driver_daemon.py) "
+        "вместо запуска своего Chrome. Пример: --daemon /tmp/divan.sock",
+    )
+
     args = parser_args.parse_args()
+    if args.mode == "query":
+        queries.run(args)
+        return
+
+    # Определяем путь для сохранения
+    output_path = args.output or os.path.join(
+        "examples", f"products.{args.format}"
+    )
+
+    if args.daemon:
+        submit_to_daemon(args, output_path)
+        return
+
+    # Парсер и Selenium импортируются только для локального запуска
+    from parser import DivanParser
+    from workers import BrowserWorkerPool
+
+    parser_kwargs = dict(
+        headless=args.headless,
+        engine=args.engine,
+        max_pages=args.max_pages,
+        concurrency=args.concurrency,
+        # Общая частота запросов к сайту делится между процессами
+        rate=args.rate / max(1, args.workers),
+        cache=args.cache,
+        cache_ttl=args.cache_ttl,
+        cache_only=args.cache_only,
+        lean_browser=not args.full_browser,
+        profile_dir=args.profile_dir,
+        selectors=args.selectors,
+    )
 
-    # Создаём парсер
-    divan_parser = DivanParser(export_format=args.format, headless=args.headless)
+    # Создаём парсер (в режиме --workers он только отсеивает повторы,
+    # обогащает и экспортирует результаты)
+    divan_parser = DivanParser(
+        export_format=args.format, enrich=args.enrich,
+        enrich_workers=args.enrich_workers, dedup=not args.keep_duplicates,
+        dedup_capacity=args.dedup_capacity, **parser_kwargs
+    )
+
+    if args.metrics_port is not None:
+        divan_parser.metrics.serve(args.metrics_port)
 
     try:
-        # Парсим все указанные категории
-        for category in args.category:
-            divan_parser.parse_category(category)
-            sleep(2)  # задержка, чтобы сайт не забанил
+        # Товары пишутся в файл по мере готовности страниц,
+        # прогресс — в журнал <output>.checkpoint для --resume
+        divan_parser.start_export(output_path, checkpoint=True, resume=args.resume)
 
-        # Определяем путь для сохранения
-        output_path = args.output or os.path.join(
-            "examples", f"products.{args.format}"
-        )
+        # Парсим все указанные категории
+        # Паузы между запросами выдерживает планировщик страниц (--rate)
+        if args.workers > 1:
+            categories = [
+                category for category in args.category
+                if not divan_parser.checkpoint.is_category_done(category)
+            ]
+            pool = BrowserWorkerPool(
+                args.workers, parser_kwargs, logger=divan_parser.logger
+            )
+            pool.run(categories, on_batch=divan_parser.collect_category)
+            failed = pool.failed
+        else:
+            divan_parser.parse_categories(args.category)
+            failed = divan_parser.failed_categories
 
-        # Экспортируем результаты
-        divan_parser.export_results(output_path)
-        print(f"\n✅ Парсинг завершён. Данные сохранены в: {output_path}")
+        # Экспортируем результаты; журнал нужен, только если обход не завершён
+        divan_parser.finish_export(completed=not failed)
+        if failed:
+            print(f"\n⚠️ Не все страницы загрузились ({', '.join(failed)}). "
+                  f"Данные сохранены в: {output_path}; догрузить — тот же запуск с --resume")
+        else:
+            print(f"\n✅ Парсинг завершён. Данные сохранены в: {output_path}")
 
     finally:
         divan_parser.close()
+        # Метрики сохраняются и после сбоя — по ним видно, где он случился
+        if args.metrics:
+            divan_parser.metrics.write_json(args.metrics)
+        if args.metrics_prom:
+            divan_parser.metrics.write_prometheus(args.metrics_prom)
+        divan_parser.metrics.close()
+
+
+def submit_to_daemon(args, output_path: str):
+    """Запуск через демон: браузер уже запущен, клиент только ждёт итог."""
+    from driver_daemon import DaemonError, submit_job
+
+    job = {
+        "categories": args.category,
+        "format": args.format,
+        # Пути — от каталога запуска клиента, а не демона
+        "output": os.path.abspath(output_path),
+        "resume": args.resume,
+        "metrics": os.path.abspath(args.metrics) if args.metrics else None,
+        "metrics_prom": os.path.abspath(args.metrics_prom) if args.metrics_prom else None,
+        "options": dict(
+            engine=args.engine,
+            max_pages=args.max_pages,
+            concurrency=args.concurrency,
+            rate=args.rate,
+            cache=os.path.abspath(args.cache) if args.cache else None,
+            cache_ttl=args.cache_ttl,
+            cache_only=args.cache_only,
+            selectors=os.path.abspath(args.selectors) if args.selectors else None,
+            enrich=args.enrich,
+            enrich_workers=args.enrich_workers,
+            dedup=not args.keep_duplicates,
+            dedup_capacity=args.dedup_capacity,
+        ),
+    }
+    try:
+        result = submit_job(args.daemon, job)
+    except DaemonError as e:
+        raise SystemExit(f"❌ {e}")
+    failed = result.get("failed")
+    print(
+        f"\n{'⚠️ Обход неполный' if failed else '✅ Парсинг завершён'} "
+        f"за {result['seconds']} с: {result['count']} записей, "
+        f"страниц {result['pages']}. Данные сохранены в: {result['output']}"
+    )
+    if failed:
+        print(f"Не все страницы загрузились ({', '.join(failed)}); "
+              f"догрузить — тот же запуск с --resume")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,53 @@
+import os
+import threading
+import unittest
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+MOCK_PAGES_DIR = os.path.join(os.path.dirname(__file__), "mock_pages")
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    """Раздаёт мок-страницы и не пишет access-лог в консоль."""
+
+    def log_message(self, format, *args):
+        pass
+
+
+class CountingHandler(QuietHandler):
+    """Запоминает коды ответов, чтобы проверить, что ушло в сеть."""
+
+    statuses = []
+
+    def send_response(self, code, message=None):
+        self.statuses.append(code)
+        super().send_response(code, message)
+
+
+def start_server(handler=QuietHandler) -> ThreadingHTTPServer:
+    """Локальный HTTP-сервер, раздающий tests/mock_pages, в фоновом потоке."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(handler, directory=MOCK_PAGES_DIR))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def stop_server(server: ThreadingHTTPServer):
+    server.shutdown()
+    server.server_close()
+
+
+class MockSiteTestCase(unittest.TestCase):
+    """Тесты против локального сервера мок-страниц: cls.server и cls.base_url на весь класс."""
+
+    handler = QuietHandler
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = start_server(cls.handler)
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_port}/"
+
+    @classmethod
+    def tearDownClass(cls):
+        stop_server(cls.server)
+        super().tearDownClass()
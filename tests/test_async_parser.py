@@ -0,0 +1,89 @@
+import asyncio
+import csv
+import os
+import re
+import tempfile
+import unittest
+
+from async_parser import AsyncDivanParser, aiohttp
+from exporters import AsyncExportSink, JSONExporter
+from extractor import NO_LINK
+from tests.helpers import MOCK_PAGES_DIR, MockSiteTestCase, QuietHandler
+
+
+class NoLinksHandler(QuietHandler):
+    """На любой адрес (и любой ?page=) отдаёт мок-страницу без ссылок у карточек."""
+
+    def do_GET(self):
+        with open(os.path.join(MOCK_PAGES_DIR, "mock_divan.html"), encoding="utf-8") as f:
+            body = re.sub(r"<a href=.*?</a>", "", f.read()).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@unittest.skipIf(aiohttp is None, "aiohttp не установлен")
+class TestAsyncParser(MockSiteTestCase, unittest.IsolatedAsyncioTestCase):
+    async def test_crawl_categories_concurrently(self):
+        parser = AsyncDivanParser(base_url=self.base_url, rate=0, concurrency=4)
+        pages = await parser.crawl(["mock_divan.html", "mock_divan.html?copy=1", "no-such-category"])
+        await parser.close()
+
+        # Вторая страница каждой категории повторяет первую — обход на ней останавливается
+        self.assertEqual(pages, 2)
+        self.assertEqual(len(parser.products), 6)
+        self.assertEqual(parser.products[0]["price_kopecks"], 499900)
+        # Несуществующая категория: запросы вперёд (до concurrency) заканчиваются 404
+        self.assertGreaterEqual(parser.metrics.counter("page_errors"), 1)
+
+    async def test_streaming_export(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            output_path = os.path.join(tmp, "products.csv")
+            parser = AsyncDivanParser(export_format="csv", base_url=self.base_url, rate=0)
+            await parser.start_export(output_path)
+            await parser.crawl(["mock_divan.html", "mock_divan.html?copy=1"])
+            count = await parser.finish_export()
+            await parser.close()
+
+            with open(output_path, encoding="utf-8-sig", newline="") as f:
+                rows = list(csv.DictReader(f, delimiter=";"))
+        self.assertEqual(count, 6)
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(parser.products, [])
+
+    async def test_sink_reports_write_errors(self):
+        class BrokenExporter(JSONExporter):
+            def write_batch(self, data):
+                raise OSError("диск переполнен")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            sink = AsyncExportSink(BrokenExporter(os.path.join(tmp, "products.json")), queue_size=1)
+            await sink.start()
+            for _ in range(3):
+                try:
+                    await sink.put([{"name": "Лампа"}])
+                except OSError:
+                    break
+            with self.assertRaises(OSError):
+                await sink.close()
+
+
+@unittest.skipIf(aiohttp is None, "aiohttp не установлен")
+class TestAsyncRepeatedPage(MockSiteTestCase, unittest.IsolatedAsyncioTestCase):
+    handler = NoLinksHandler
+
+    async def test_stops_on_repeated_page_without_links(self):
+        parser = AsyncDivanParser(base_url=self.base_url, rate=0, concurrency=2)
+        pages = await asyncio.wait_for(parser.crawl(["svet"]), timeout=10)
+        await parser.close()
+
+        # Вторая страница повторяет первую: карточки без ссылок сравниваются по названию и цене
+        self.assertEqual(pages, 1)
+        self.assertEqual(len(parser.products), 3)
+        self.assertTrue(all(item["link"] == NO_LINK for item in parser.products))
+
+
+if __name__ == "__main__":
+    unittest.main()
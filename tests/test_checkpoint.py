@@ -0,0 +1,176 @@
+import csv
+import json
+import os
+import tempfile
+import unittest
+
+from checkpoint import CrawlCheckpoint
+from exporters.parquet_exporter import pq
+from parser import DivanParser
+from tests.helpers import MOCK_PAGES_DIR, MockSiteTestCase, QuietHandler
+
+
+class PagedHandler(QuietHandler):
+    """
+    Категория из двух страниц: ?page=N отдаёт мок-страницу с другими ссылками
+    (начиная с третьей — повтор второй). Адреса из fail_once один раз отвечают 500.
+    """
+
+    fail_once = set()
+
+    def do_GET(self):
+        if self.path in self.fail_once:
+            self.fail_once.discard(self.path)
+            self.send_error(500)
+            return
+        if "?page=" not in self.path:
+            super().do_GET()
+            return
+        with open(os.path.join(MOCK_PAGES_DIR, "mock_divan.html"), encoding="utf-8") as f:
+            body = f.read().replace("/product/", "/product/p2-").encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class TestCrawlCheckpoint(unittest.TestCase):
+    def test_journal_roundtrip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "products.csv.checkpoint")
+            checkpoint = CrawlCheckpoint(path)
+            checkpoint.page_done(
+                "https://www.divan.ru/category/svet", 30, ["https://www.divan.ru/product/ralf"]
+            )
+            self.assertEqual(checkpoint.pending, 1)
+            checkpoint.commit()
+            checkpoint.category_done("svet")
+            checkpoint.close()
+
+            # Сбой во время записи оставил недописанную строку
+            with open(path, "a", encoding="utf-8") as f:
+                f.write('{"event": "page", "url": "https://www.div')
+
+            resumed = CrawlCheckpoint(path, resume=True)
+            self.assertTrue(resumed.is_page_done("https://www.divan.ru/category/svet"))
+            self.assertTrue(resumed.is_category_done("svet"))
+            self.assertEqual(resumed.rows, 30)
+            self.assertEqual(resumed.links, ["https://www.divan.ru/product/ralf"])
+
+            resumed.close(completed=True)
+            self.assertFalse(os.path.exists(path))
+
+
+class TestResume(MockSiteTestCase):
+    def crawl(self, output_path, export_format, categories, resume):
+        parser = DivanParser(
+            export_format=export_format, engine="http", base_url=self.base_url, rate=0
+        )
+        parser.start_export(output_path, checkpoint=True, resume=resume)
+        pages = sum(parser.parse_category(category) for category in categories)
+        return parser, pages
+
+    def test_resume_after_interrupt(self):
+        first, second = "mock_divan.html", "mock_divan.html?copy=1"
+        for export_format in ("csv", "json"):
+            with self.subTest(export_format=export_format), tempfile.TemporaryDirectory() as tmp:
+                output_path = os.path.join(tmp, f"products.{export_format}")
+                journal = output_path + ".checkpoint"
+
+                # Первый запуск прервался после первой категории
+                parser, _ = self.crawl(output_path, export_format, [first], resume=False)
+                parser.close()
+                self.assertTrue(os.path.exists(journal))
+
+                # Второй запуск пропускает её и дописывает в тот же файл;
+                # товары второй категории — повторы уже записанных
+                parser, pages = self.crawl(output_path, export_format, [first, second], resume=True)
+                self.assertEqual(pages, 1)
+                self.assertEqual(parser.dedup.duplicates, 3)
+                parser.finish_export(completed=True)
+                parser.close()
+                self.assertFalse(os.path.exists(journal))
+
+                if export_format == "csv":
+                    with open(output_path, encoding="utf-8-sig", newline="") as f:
+                        rows = list(csv.DictReader(f, delimiter=";"))
+                else:
+                    with open(output_path, encoding="utf-8") as f:
+                        rows = json.load(f)
+                # Столько же, сколько дал бы обход без перерыва
+                self.assertEqual(len(rows), 3)
+                self.assertEqual([row["category"] for row in rows], [first] * 3)
+
+    @unittest.skipIf(pq is None, "pyarrow не установлен")
+    def test_parquet_resume_after_kill(self):
+        first, second = "mock_divan.html", "mock_divan.html?copy=1"
+        with tempfile.TemporaryDirectory() as tmp:
+            output_path = os.path.join(tmp, "products.parquet")
+
+            # Процесс убит после первой категории: ни close(), ни футера итогового файла
+            parser, _ = self.crawl(output_path, "parquet", [first], resume=False)
+            parser.exporter = None
+            self.assertFalse(os.path.exists(output_path))
+
+            # Записанное по журналу не теряется и не пишется второй раз
+            parser, pages = self.crawl(output_path, "parquet", [first, second], resume=True)
+            self.assertEqual(pages, 1)
+            parser.finish_export(completed=True)
+            parser.close()
+
+            rows = pq.read_table(output_path).to_pylist()
+            self.assertEqual(os.listdir(tmp), ["products.parquet"])
+        self.assertEqual(len(rows), 3)
+        self.assertEqual([row["category"] for row in rows], [first] * 3)
+
+    def test_resume_without_journal_starts_over(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            output_path = os.path.join(tmp, "products.csv")
+            with open(output_path, "w", encoding="utf-8") as f:
+                f.write("мусор от прошлого запуска\n")
+
+            parser, pages = self.crawl(output_path, "csv", ["mock_divan.html"], resume=True)
+            self.assertEqual(pages, 1)
+            parser.finish_export(completed=True)
+            parser.close()
+
+            with open(output_path, encoding="utf-8-sig", newline="") as f:
+                rows = list(csv.DictReader(f, delimiter=";"))
+        self.assertEqual(len(rows), 3)
+
+
+class TestResumeAfterFailedPage(MockSiteTestCase):
+    handler = PagedHandler
+    crawl = TestResume.crawl
+
+    def test_failed_page_is_retried_on_resume(self):
+        category = "mock_divan.html"
+        PagedHandler.fail_once.add(f"/{category}?page=2")
+        with tempfile.TemporaryDirectory() as tmp:
+            output_path = os.path.join(tmp, "products.csv")
+            journal = output_path + ".checkpoint"
+
+            # Вторая страница не загрузилась — это не конец категории
+            parser, pages = self.crawl(output_path, "csv", [category], resume=False)
+            self.assertEqual(pages, 1)
+            self.assertEqual(parser.failed_categories, [category])
+            parser.finish_export(completed=not parser.failed_categories)
+            parser.close()
+            self.assertFalse(CrawlCheckpoint(journal, resume=True).is_category_done(category))
+
+            # Повторный запуск догружает категорию со второй страницы
+            parser, pages = self.crawl(output_path, "csv", [category], resume=True)
+            self.assertEqual(pages, 1)
+            self.assertEqual(parser.failed_categories, [])
+            parser.finish_export(completed=True)
+            parser.close()
+
+            with open(output_path, encoding="utf-8-sig", newline="") as f:
+                rows = list(csv.DictReader(f, delimiter=";"))
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(sum("/product/p2-" in row["link"] for row in rows), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,180 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from database import connect, init_db, load_details, save_to_db
+
+
+def product(name: str, price: str, category: str = "svet") -> dict:
+    return {
+        "name": name,
+        "price": price,
+        "link": f"https://www.divan.ru/product/{name}",
+        "category": category,
+    }
+
+
+class TestProductStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_name = os.path.join(self.tmp.name, "products.db")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def query(self, sql: str) -> list:
+        with sqlite3.connect(self.db_name) as conn:
+            return conn.execute(sql).fetchall()
+
+    def crawl(self, data: list):
+        """Один запуск парсера: открыть базу и сохранить товары."""
+        init_db(self.db_name)
+        save_to_db(self.db_name, data)
+
+    def test_upsert_keeps_previous_runs(self):
+        self.crawl([product("ralf", "4999"), product("ferum", "2999")])
+        self.crawl([product("ralf", "4999"), product("nidls", "3999")])
+
+        self.assertEqual(
+            self.query("SELECT link, price FROM products ORDER BY id"),
+            [
+                ("https://www.divan.ru/product/ralf", "4999"),
+                ("https://www.divan.ru/product/ferum", "2999"),
+                ("https://www.divan.ru/product/nidls", "3999"),
+            ],
+        )
+
+    def test_price_history_only_on_change(self):
+        self.crawl([product("ralf", "4999")])
+        self.crawl([product("ralf", "4999")])
+        self.crawl([product("ralf", "4499")])
+        self.crawl([product("ralf", "4499")])
+
+        self.assertEqual(
+            self.query("SELECT price FROM price_history ORDER BY id"),
+            [("4999",), ("4499",)],
+        )
+        self.assertEqual(self.query("SELECT price FROM products"), [("4499",)])
+
+    def test_unchanged_rows_are_not_written(self):
+        data = [product(f"lamp-{i}", "1000") for i in range(10)]
+        self.crawl(data)
+
+        with sqlite3.connect(self.db_name) as conn:
+            before = conn.total_changes
+            save_to_db(self.db_name, data, conn=conn)
+            self.assertEqual(conn.total_changes, before)
+
+            data[3] = product("lamp-3", "900")
+            save_to_db(self.db_name, data, conn=conn)
+            # Одна строка товара и одна запись истории цен
+            self.assertEqual(conn.total_changes - before, 2)
+
+    def test_old_first_price_trigger_is_dropped(self):
+        # База прежней версии: первую цену писал триггер на каждую вставку
+        init_db(self.db_name)
+        with sqlite3.connect(self.db_name) as conn:
+            conn.execute(
+                "CREATE TRIGGER trg_products_price_insert AFTER INSERT ON products BEGIN "
+                "INSERT INTO price_history (link, price) VALUES (NEW.link, NEW.price); END"
+            )
+        self.crawl([product("ralf", "4999")])
+        self.assertEqual(self.query("SELECT price FROM price_history"), [("4999",)])
+
+    def test_known_product_in_new_category(self):
+        self.crawl([product("ralf", "4999")])
+
+        with sqlite3.connect(self.db_name) as conn:
+            before = conn.total_changes
+            # Тот же товар в распродаже, а в одной порции — ещё и в новой категории
+            save_to_db(self.db_name, [
+                product("ralf", "4999", category="rasprodazha"),
+                product("ferum", "2999", category="novinki"),
+                product("ferum", "2999", category="svet"),
+            ], conn=conn)
+            # Связь ralf, строка ferum с первой ценой и первой категорией, связь ferum — svet
+            self.assertEqual(conn.total_changes - before, 5)
+
+        self.assertEqual(
+            self.query("SELECT link, category FROM products ORDER BY id"),
+            [("https://www.divan.ru/product/ralf", "svet"),
+             ("https://www.divan.ru/product/ferum", "novinki")],
+        )
+        self.assertEqual(
+            self.query("SELECT link, category FROM product_categories ORDER BY link, category"),
+            [("https://www.divan.ru/product/ferum", "novinki"),
+             ("https://www.divan.ru/product/ferum", "svet"),
+             ("https://www.divan.ru/product/ralf", "rasprodazha"),
+             ("https://www.divan.ru/product/ralf", "svet")],
+        )
+
+    def test_numeric_price_column(self):
+        self.crawl([
+            product("ralf", "13 990 ₽"),
+            product("ferum", "4990"),
+            product("nidls", "Не указана"),
+        ])
+
+        # Диапазон и сортировка по цене считаются в SQL по индексу
+        self.assertEqual(
+            self.query(
+                "SELECT link, price_kopecks, currency FROM products "
+                "WHERE price_kopecks BETWEEN 100000 AND 2000000 ORDER BY price_kopecks"
+            ),
+            [
+                ("https://www.divan.ru/product/ferum", 499000, "RUB"),
+                ("https://www.divan.ru/product/ralf", 1399000, "RUB"),
+            ],
+        )
+        plan = self.query(
+            "EXPLAIN QUERY PLAN SELECT * FROM products WHERE price_kopecks > 100000"
+        )
+        self.assertIn("idx_products_price", plan[0][-1])
+
+    def test_migrate_old_schema(self):
+        # База прежнего формата: без content_hash и с дублями ссылок
+        with sqlite3.connect(self.db_name) as conn:
+            conn.execute(
+                "CREATE TABLE products (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "name TEXT NOT NULL, price TEXT NOT NULL, link TEXT NOT NULL, "
+                "category TEXT NOT NULL)"
+            )
+            conn.executemany(
+                "INSERT INTO products (name, price, link, category) VALUES (?, ?, ?, ?)",
+                [tuple(product("ralf", "4999").values()), tuple(product("ralf", "4899").values())],
+            )
+
+        self.crawl([product("ralf", "4899")])
+
+        self.assertEqual(self.query("SELECT price, price_kopecks FROM products"), [("4899", 489900)])
+        self.assertEqual(self.query("SELECT price FROM price_history"), [("4899",)])
+        self.assertEqual(
+            self.query("SELECT link, category FROM product_categories"),
+            [("https://www.divan.ru/product/ralf", "svet")],
+        )
+
+    def test_details_survive_run_without_enrichment(self):
+        enriched = dict(product("ralf", "4999"), article="318264", material="Металл",
+                        dimensions=None, availability=None, old_price="5999 ₽",
+                        old_price_kopecks=599900)
+        self.crawl([enriched, product("ferum", "2999")])
+        # Запуск без --enrich: поля страницы товара не затираются
+        self.crawl([product("ralf", "4899"), product("ferum", "2999")])
+
+        self.assertEqual(
+            self.query("SELECT price, article, material, old_price_kopecks FROM products "
+                       "WHERE link LIKE '%ralf'"),
+            [("4899", "318264", "Металл", 599900)],
+        )
+        conn = connect(self.db_name)
+        try:
+            details = load_details(conn)
+        finally:
+            conn.close()
+        self.assertEqual(list(details), ["https://www.divan.ru/product/ralf"])
+        self.assertEqual(details["https://www.divan.ru/product/ralf"]["article"], "318264")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from dedup import BloomFilter, DedupIndex, normalize_link
+from parser import DivanParser
+from tests.helpers import MockSiteTestCase
+
+
+class TestDedupIndex(unittest.TestCase):
+    def test_normalize_link(self):
+        self.assertEqual(
+            normalize_link("HTTPS://www.Divan.ru/product/ralf/?utm_source=promo&b=2&a=1#reviews"),
+            "https://www.divan.ru/product/ralf?a=1&b=2",
+        )
+        self.assertEqual(
+            normalize_link("https://www.divan.ru/product/ralf"),
+            normalize_link("https://www.divan.ru/product/ralf/?yclid=123"),
+        )
+
+    def test_repeats_across_categories(self):
+        index = DedupIndex()
+        first, repeated = index.filter([
+            {"link": "https://www.divan.ru/product/ralf", "category": "svet"},
+            {"link": "Нет ссылки", "category": "svet"},
+        ])
+        self.assertEqual(len(first), 2)
+        self.assertEqual(repeated, [])
+
+        second, repeated = index.filter([
+            {"link": "https://www.divan.ru/product/ralf/?utm_campaign=sale", "category": "rasprodazha"},
+            {"link": "Нет ссылки", "category": "rasprodazha"},
+        ])
+        self.assertEqual([item["link"] for item in second], ["Нет ссылки"])
+        self.assertEqual(repeated, [("https://www.divan.ru/product/ralf", "rasprodazha")])
+        self.assertEqual(index.duplicates, 1)
+
+    def test_bloom_filter(self):
+        bloom = BloomFilter(capacity=10000, error_rate=1e-3)
+        for i in range(10000):
+            bloom.add(f"https://www.divan.ru/product/{i}")
+        # Ложноотрицательных ответов нет, ложноположительных — около error_rate
+        self.assertTrue(all(f"https://www.divan.ru/product/{i}" in bloom for i in range(10000)))
+        false_positives = sum(f"https://www.divan.ru/other/{i}" in bloom for i in range(10000))
+        self.assertLess(false_positives, 50)
+        self.assertLess(len(bloom.bits), 10000 * 2)
+
+
+class TestDedupCrawl(MockSiteTestCase):
+    def test_product_in_two_categories_stored_once(self):
+        categories = ["mock_divan.html", "mock_divan.html?copy=1"]
+        with tempfile.TemporaryDirectory() as tmp:
+            output_path = os.path.join(tmp, "products.sqlite")
+            for capacity in (None, 1000):
+                parser = DivanParser(
+                    engine="http", base_url=self.base_url, rate=0, dedup_capacity=capacity
+                )
+                parser.start_export(output_path)
+                for category in categories:
+                    parser.parse_category(category)
+                self.assertEqual(parser.finish_export(), 3)
+                self.assertEqual(parser.metrics.counter("duplicates_skipped"), 3)
+                parser.close()
+
+            with sqlite3.connect(output_path) as conn:
+                self.assertEqual(conn.execute("SELECT COUNT(*) FROM products").fetchone(), (3,))
+                self.assertEqual(
+                    conn.execute(
+                        "SELECT category, COUNT(*) FROM product_categories GROUP BY category"
+                    ).fetchall(),
+                    [(categories[0], 3), (categories[1], 3)],
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import csv
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from driver_daemon import DaemonError, DriverDaemon, submit_job
+from tests.helpers import MockSiteTestCase
+
+ROOT = os.path.join(os.path.dirname(__file__), os.pardir)
+
+
+class TestDriverDaemon(MockSiteTestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.socket_path = os.path.join(self.tmp.name, "divan.sock")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    @patch("selenium.webdriver.Chrome")
+    def test_jobs_reuse_warm_browser(self, mock_chrome):
+        mock_chrome.return_value = MagicMock()
+        daemon = DriverDaemon(self.socket_path, sessions=1)
+        daemon.start()
+        server = threading.Thread(target=daemon.serve_forever)
+        server.start()
+        try:
+            for run in range(2):
+                output_path = os.path.join(self.tmp.name, f"products-{run}.csv")
+                result = submit_job(self.socket_path, {
+                    "categories": ["mock_divan.html"],
+                    "format": "csv",
+                    "output": output_path,
+                    "options": {"engine": "http", "base_url": self.base_url, "rate": 0},
+                })
+                self.assertEqual(result["count"], 3)
+                with open(output_path, encoding="utf-8-sig", newline="") as f:
+                    self.assertEqual(len(list(csv.DictReader(f, delimiter=";"))), 3)
+
+            # Браузер запущен один раз, при старте демона, и задания его не закрывают
+            mock_chrome.assert_called_once()
+            mock_chrome.return_value.quit.assert_not_called()
+            self.assertEqual(submit_job(self.socket_path, {"command": "ping"})["jobs"], 2)
+
+            # Настройки браузера задаёт демон, а не задание
+            with self.assertRaises(DaemonError):
+                submit_job(self.socket_path, {
+                    "categories": ["mock_divan.html"], "options": {"headless": False},
+                })
+        finally:
+            submit_job(self.socket_path, {"command": "shutdown"})
+            server.join(timeout=10)
+
+        self.assertFalse(os.path.exists(self.socket_path))
+        mock_chrome.return_value.quit.assert_called_once()
+
+    def test_client_does_not_import_selenium(self):
+        # Клиент демона и --help не платят за импорт Selenium и парсера
+        code = (
+            "import sys, sofa_parsing, driver_daemon; "
+            "print(any(m.split('.')[0] in ('selenium', 'parser', 'lxml') for m in sys.modules))"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout
+        self.assertEqual(output.strip(), "False")
+
+    def test_daemon_unavailable(self):
+        with self.assertRaises(DaemonError):
+            submit_job(self.socket_path, {"command": "ping"}, timeout=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
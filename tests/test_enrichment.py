@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+
+from enrichment import DETAIL_COLUMNS, DetailEnricher
+from exporters import SQLiteExporter
+from parser import DivanParser
+from tests.helpers import CountingHandler, MockSiteTestCase
+
+
+class TestDetailEnricher(MockSiteTestCase):
+    handler = CountingHandler
+
+    def setUp(self):
+        CountingHandler.statuses.clear()
+
+    def products(self, *categories):
+        # Один и тот же товар в нескольких категориях и один с битой ссылкой
+        return [
+            {"name": "Торшер Ральф", "price": "6990", "category": category,
+             "link": self.base_url + "product_ralf.html"}
+            for category in categories
+        ] + [{"name": "Нет страницы", "price": "1", "category": categories[0],
+              "link": self.base_url + "missing.html"}]
+
+    def test_details_fetched_once_per_link(self):
+        enricher = DetailEnricher(workers=2)
+        try:
+            first = enricher.enrich(self.products("svet", "divany"))
+            second = enricher.enrich(self.products("rasprodazha"))
+        finally:
+            enricher.close()
+
+        self.assertEqual(sorted(CountingHandler.statuses), [200, 404])
+        ralf = first[0]
+        self.assertEqual(ralf["article"], "318264")
+        self.assertEqual(ralf["dimensions"], "40 x 40 x 160 см")
+        self.assertEqual(ralf["material"], "Металл, ткань")
+        self.assertEqual(ralf["availability"], "https://schema.org/InStock")
+        self.assertEqual(ralf["old_price"], "9 990 руб.")
+        self.assertEqual(ralf["old_price_kopecks"], 999000)
+        self.assertEqual(first[1]["article"], "318264")
+        self.assertEqual(second[0]["article"], "318264")
+        # Страница не загрузилась — поля есть, но пустые (одна схема для экспорта)
+        self.assertEqual({column: first[-1][column] for column in DETAIL_COLUMNS},
+                         dict.fromkeys(DETAIL_COLUMNS))
+
+    def test_enriched_in_store_are_skipped(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, "products.sqlite")
+            for _ in range(2):
+                parser = DivanParser(engine="http", base_url=self.base_url, rate=0, enrich=True)
+                parser.start_export(output)
+                parser._collect(self.products("svet")[:1])
+                parser.finish_export()
+                parser.close()
+
+            self.assertEqual(CountingHandler.statuses, [200])
+            exporter = SQLiteExporter(output)
+            exporter.open()
+            try:
+                row = exporter.conn.execute(
+                    "SELECT article, old_price_kopecks FROM products"
+                ).fetchone()
+            finally:
+                exporter.conn.close()
+            self.assertEqual(row, ("318264", 999000))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,206 @@
+import csv
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from exporters import CSVExporter, JSONExporter, SQLiteExporter, ParquetExporter
+from exporters.parquet_exporter import pq
+from prices import normalize_batch
+
+
+def make_batch(start: int, size: int = 3) -> list:
+    """Синтетическая порция товаров одной страницы."""
+    return [
+        {
+            "name": f"Диван {i}",
+            "price": f"{10000 + i} ₽",
+            "link": f"https://www.divan.ru/product/divan-{i}",
+            "category": "divany-i-kresla",
+        }
+        for i in range(start, start + size)
+    ]
+
+
+class TestStreamingExporters(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.batches = [make_batch(0), make_batch(3), make_batch(6)]
+        self.rows = [item for batch in self.batches for item in batch]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.tmp.name, name)
+
+    def stream(self, exporter):
+        with exporter:
+            for batch in self.batches:
+                exporter.write_batch(batch)
+        self.assertEqual(exporter.count, len(self.rows))
+
+    def test_csv(self):
+        self.stream(CSVExporter(self.path("products.csv")))
+
+        with open(self.path("products.csv"), encoding="utf-8-sig", newline="") as f:
+            rows = list(csv.DictReader(f, delimiter=";"))
+        self.assertEqual(rows, self.rows)
+
+    def test_json_array(self):
+        self.stream(JSONExporter(self.path("products.json")))
+
+        with open(self.path("products.json"), encoding="utf-8") as f:
+            content = f.read()
+        self.assertEqual(json.loads(content), self.rows)
+        # Тот же вид файла, что и у прежнего json.dump(indent=4)
+        self.assertEqual(content, json.dumps(self.rows, ensure_ascii=False, indent=4))
+
+    def test_json_lines(self):
+        self.stream(JSONExporter(self.path("products.jsonl")))
+
+        with open(self.path("products.jsonl"), encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f]
+        self.assertEqual(rows, self.rows)
+
+    def test_json_empty_stream(self):
+        with JSONExporter(self.path("empty.json")):
+            pass
+        with open(self.path("empty.json"), encoding="utf-8") as f:
+            self.assertEqual(json.load(f), [])
+
+    def test_sqlite(self):
+        self.stream(SQLiteExporter(self.path("products.db")))
+
+        with sqlite3.connect(self.path("products.db")) as conn:
+            count = conn.execute("SELECT COUNT(*) FROM products").fetchone()[0]
+        self.assertEqual(count, len(self.rows))
+
+    def test_sqlite_bulk_settings(self):
+        exporter = SQLiteExporter(self.path("bulk.db"), chunk_size=4, synchronous="OFF")
+        with exporter:
+            conn = exporter.conn
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+            self.assertEqual(conn.execute("PRAGMA synchronous").fetchone()[0], 0)
+
+            exporter.write_batch(self.batches[0])
+            # Меньше chunk_size — ещё в буфере
+            self.assertEqual(exporter.count, 0)
+            exporter.write_batch(self.batches[1])
+            self.assertEqual(exporter.count, 6)
+            exporter.write_batch(self.batches[2])
+        # Остаток дописан при закрытии
+        self.assertEqual(exporter.count, len(self.rows))
+
+    @unittest.skipIf(pq is None, "pyarrow не установлен")
+    def test_parquet(self):
+        for batch in self.batches:
+            normalize_batch(batch)
+        exporter = ParquetExporter(self.path("products.parquet"), row_group_size=4)
+        self.stream(exporter)
+
+        parquet_file = pq.ParquetFile(self.path("products.parquet"))
+        # Группа пишется, как только накопилось row_group_size: 3 + 3, затем остаток 3
+        self.assertEqual(parquet_file.metadata.num_row_groups, 2)
+
+        table = parquet_file.read()
+        self.assertEqual(str(table.schema.field("price_kopecks").type), "int64")
+        self.assertEqual(str(table.schema.field("category").type), "dictionary<values=string, indices=int32, ordered=0>")
+        self.assertEqual(table.to_pylist(), self.rows)
+
+    @unittest.skipIf(pq is None, "pyarrow не установлен")
+    def test_parquet_resume_keeps_file_on_failure(self):
+        for batch in self.batches:
+            normalize_batch(batch)
+        path = self.path("products.parquet")
+        with ParquetExporter(path, row_group_size=3) as exporter:
+            exporter.write_batch(self.batches[0])
+            exporter.write_batch(self.batches[1])
+
+        # Сбой посреди слияния: исходный файл и дописанная часть целы
+        exporter = ParquetExporter(path, row_group_size=3)
+        exporter.open(append=True)
+        exporter.write_batch(self.batches[2])
+        # До close() дописывается часть, исходный файл не меняется
+        self.assertEqual(pq.read_table(path).num_rows, 6)
+        with patch.object(pq.ParquetWriter, "write_table", side_effect=[None, OSError("диск")]):
+            with self.assertRaises(OSError):
+                exporter.close()
+        self.assertEqual(pq.read_table(path).to_pylist(), self.rows[:6])
+        self.assertFalse(os.path.exists(path + ".resume"))
+
+        # Следующее продолжение подхватывает уцелевшую часть
+        exporter = ParquetExporter(path, row_group_size=3)
+        exporter.open(append=True)
+        exporter.close()
+        self.assertEqual(pq.read_table(path).to_pylist(), self.rows)
+        self.assertEqual(os.listdir(self.tmp.name), ["products.parquet"])
+
+    @unittest.skipIf(pq is None, "pyarrow не установлен")
+    def test_parquet_flushed_rows_survive_crash(self):
+        for batch in self.batches:
+            normalize_batch(batch)
+        path = self.path("products.parquet")
+
+        # Первый запуск оборвался: первая часть закрыта flush(), вторая — без футера
+        exporter = ParquetExporter(path)
+        exporter.open()
+        exporter.write_batch(self.batches[0])
+        exporter.flush()
+        with open(path + ".part1", "wb") as f:
+            f.write(b"PAR1\x15\x04")
+        self.assertFalse(os.path.exists(path))
+
+        # Продолжение оставляет законченную часть и отбрасывает оборванную
+        exporter = ParquetExporter(path)
+        exporter.open(append=True)
+        exporter.write_batch(self.batches[2])
+        exporter.close()
+        self.assertEqual(pq.read_table(path).to_pylist(), self.rows[:3] + self.rows[6:])
+        self.assertEqual(os.listdir(self.tmp.name), ["products.parquet"])
+
+    @unittest.skipIf(pq is None, "pyarrow не установлен")
+    def test_parquet_merge_coalesces_row_groups(self):
+        for batch in self.batches:
+            normalize_batch(batch)
+        path = self.path("products.parquet")
+        with ParquetExporter(path, row_group_size=6) as exporter:
+            for batch in self.batches:
+                exporter.write_batch(batch)
+                exporter.flush()  # как при каждом сбросе журнала
+
+        # Три части по 3 строки слиты в группы по row_group_size
+        parquet_file = pq.ParquetFile(path)
+        self.assertEqual(
+            [parquet_file.metadata.row_group(i).num_rows
+             for i in range(parquet_file.metadata.num_row_groups)],
+            [6, 3],
+        )
+        self.assertEqual(parquet_file.read().to_pylist(), self.rows)
+
+
+class TestLazyImports(unittest.TestCase):
+    def test_exporter_imports_only_its_module(self):
+        for statement in (
+            "from exporters import CSVExporter",
+            "import exporters; exporters.create_exporter('csv', 'out/products.csv')",
+            "import async_parser",
+        ):
+            with self.subTest(statement), tempfile.TemporaryDirectory() as tmp:
+                code = (
+                    f"import os, sys; sys.path.insert(0, os.getcwd()); os.chdir({tmp!r}); {statement}; "
+                    "print(sorted(m for m in ('database', 'pyarrow', 'exporters.sqlite_exporter') "
+                    "if m in sys.modules))"
+                )
+                output = subprocess.run(
+                    [sys.executable, "-c", code], cwd=os.path.join(os.path.dirname(__file__), os.pardir),
+                    capture_output=True, text=True, check=True,
+                ).stdout
+                self.assertEqual(output.strip(), "[]")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from http_cache import PageCache
+from parser import DivanParser
+from tests.helpers import CountingHandler, MockSiteTestCase
+
+
+class TestPageCache(MockSiteTestCase):
+    handler = CountingHandler
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.tmp.name, "pages.cache")
+        CountingHandler.statuses.clear()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def crawl(self, **kwargs):
+        parser = DivanParser(
+            engine="http", base_url=self.base_url, rate=0, max_pages=1,
+            cache=self.cache_path, **kwargs
+        )
+        parser.parse_category("mock_divan.html")
+        parser.close()
+        return parser
+
+    def test_fresh_page_is_not_requested(self):
+        first = self.crawl()
+        self.assertEqual(CountingHandler.statuses, [200])
+
+        second = self.crawl()
+        self.assertEqual(CountingHandler.statuses, [200])
+        self.assertEqual(second.cache.hits, 1)
+        self.assertEqual(second.products, first.products)
+
+    def test_conditional_get(self):
+        first = self.crawl(cache_ttl=0)
+        # Устаревшая запись: сервер отвечает 304 по Last-Modified, товары из кэша
+        second = self.crawl(cache_ttl=0)
+        self.assertEqual(CountingHandler.statuses, [200, 304])
+        self.assertEqual(second.products, first.products)
+
+    @patch("selenium.webdriver.Chrome")
+    def test_cache_only(self, mock_chrome):
+        first = self.crawl()
+        CountingHandler.statuses.clear()
+
+        replay = DivanParser(
+            engine="http", base_url=self.base_url, rate=0,
+            cache=self.cache_path, cache_only=True,
+        )
+        replay.parse_category("mock_divan.html")
+        replay.parse_category("no-such-category")
+        replay.close()
+
+        self.assertEqual(CountingHandler.statuses, [])
+        mock_chrome.assert_not_called()
+        self.assertEqual(replay.products, first.products)
+
+    def test_cache_hits_are_not_throttled(self):
+        # Две страницы категории (вторая повторяет первую) в кэше
+        seed = DivanParser(engine="http", base_url=self.base_url, rate=0, cache=self.cache_path)
+        seed.parse_category("mock_divan.html")
+        seed.close()
+        self.assertEqual(len(CountingHandler.statuses), 2)
+
+        # Частота по умолчанию (раз в 2 с) не тормозит ни свежие страницы, ни режим только кэша
+        for cache_only in (False, True):
+            start = time.monotonic()
+            replay = DivanParser(
+                engine="http", base_url=self.base_url, cache=self.cache_path, cache_only=cache_only,
+            )
+            replay.parse_category("mock_divan.html")
+            replay.close()
+            self.assertLess(time.monotonic() - start, 1.0)
+            self.assertEqual(replay.cache.hits, 2)
+            self.assertEqual(replay.scheduler.stats["throttle_seconds"], 0)
+        self.assertEqual(len(CountingHandler.statuses), 2)
+
+    def test_lru_eviction(self):
+        cache = PageCache(self.cache_path, max_bytes=250)
+        for name in ("a", "b"):
+            cache.put(name, "x" * 100)
+            time.sleep(0.01)
+        cache.get("a")  # «a» использована позже «b»
+        cache.put("c", "x" * 100)
+
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("c"))
+        cache.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
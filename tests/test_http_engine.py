@@ -0,0 +1,88 @@
+import csv
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from parser import DivanParser
+from tests.helpers import MOCK_PAGES_DIR, MockSiteTestCase
+
+
+class TestHTTPEngine(MockSiteTestCase):
+    @patch("selenium.webdriver.Chrome")
+    def test_parse_without_browser(self, mock_chrome):
+        # Категория обходится дважды — повторы не отсеиваются
+        parser = DivanParser(engine="http", base_url=self.base_url, rate=0, dedup=False)
+        parser.parse_category("mock_divan.html")
+
+        # Chrome не запускался
+        mock_chrome.assert_not_called()
+        self.assertEqual(len(parser.products), 3)
+        self.assertEqual(parser.products[0], {
+            "name": "Лампа Ralf",
+            "price": "4999 ₽",
+            "link": "https://www.divan.ru/product/torsher-ralf-beige",
+            "category": "mock_divan.html",
+            "price_kopecks": 499900,
+            "currency": "RUB",
+        })
+
+        # Повторный запрос идёт по тому же keep-alive соединению
+        parser.parse_category("mock_divan.html")
+        self.assertEqual(len(parser.products), 6)
+        pool = parser.fetcher.pool.connection_from_url(self.base_url)
+        self.assertEqual(pool.num_connections, 1)
+
+        parser.close()
+
+    def test_streaming_export(self):
+        # Страницы сразу уходят в файл и не копятся в self.products
+        with tempfile.TemporaryDirectory() as tmp:
+            output_path = os.path.join(tmp, "products.csv")
+            parser = DivanParser(
+                export_format="csv", engine="http", base_url=self.base_url, rate=0
+            )
+            parser.start_export(output_path)
+            parser.parse_category("mock_divan.html")
+            self.assertEqual(parser.products, [])
+            parser.close()
+
+            with open(output_path, encoding="utf-8-sig", newline="") as f:
+                rows = list(csv.DictReader(f, delimiter=";"))
+        self.assertEqual([row["name"] for row in rows], [
+            "Лампа Ralf", "Лампа Ferum", "Настольная лампа Nidls"
+        ])
+
+    @patch("selenium.webdriver.Chrome")
+    def test_missing_page(self, mock_chrome):
+        parser = DivanParser(engine="http", base_url=self.base_url, rate=0)
+        parser.parse_category("no-such-category")
+
+        mock_chrome.assert_not_called()
+        self.assertEqual(parser.products, [])
+        parser.close()
+
+    @patch("selenium.webdriver.Chrome")
+    def test_js_fallback(self, mock_chrome):
+        # В отданном HTML нет карточек — страницу открывает Chrome
+        mock_driver = MagicMock()
+        mock_chrome.return_value = mock_driver
+        with open(os.path.join(MOCK_PAGES_DIR, "mock_divan.html"), encoding="utf-8") as f:
+            mock_driver.page_source = f.read()
+        mock_driver.execute_script.return_value = {"cards": 3, "empty": False, "ready": "complete"}
+
+        parser = DivanParser(
+            engine="http", base_url=self.base_url, extraction="batch", max_pages=1
+        )
+        parser.parse_category("")  # листинг каталога, карточек в нём нет
+
+        mock_chrome.assert_called_once()
+        mock_driver.get.assert_called_once_with(self.base_url)
+        self.assertEqual(len(parser.products), 3)
+
+        parser.close()
+        mock_driver.quit.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import json
+import os
+import tempfile
+import unittest
+import urllib.request
+
+from metrics import Histogram, Metrics
+from parser import DivanParser
+from tests.helpers import start_server, stop_server
+
+
+class TestMetrics(unittest.TestCase):
+    def test_histogram(self):
+        histogram = Histogram(buckets=(0.1, 1, 10))
+        for value in (0.05, 0.05, 0.5, 5):
+            histogram.observe(value)
+
+        self.assertEqual(histogram.counts, [2, 1, 1, 0])
+        self.assertEqual(histogram.quantile(0.5), 0.1)
+        self.assertEqual(histogram.quantile(0.95), 5)  # не больше максимума
+        self.assertAlmostEqual(histogram.summary()["mean"], 1.4)
+
+    def test_prometheus_format(self):
+        metrics = Metrics()
+        metrics.inc("selector_hits", 3, field="price", selector="meta[itemprop='price']")
+        metrics.observe("phase_seconds", 0.2, phase="export")
+
+        text = metrics.to_prometheus()
+        self.assertIn("# TYPE divan_selector_hits_total counter", text)
+        self.assertIn(
+            "divan_selector_hits_total{field=\"price\",selector=\"meta[itemprop='price']\"} 3", text
+        )
+        self.assertIn('divan_phase_seconds_bucket{le="0.25",phase="export"} 1', text)
+        self.assertIn('divan_phase_seconds_count{phase="export"} 1', text)
+
+        port = metrics.serve(0)
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as response:
+            self.assertEqual(response.read().decode("utf-8"), text)
+        metrics.close()
+
+    def test_parser_metrics(self):
+        server = start_server()
+        try:
+            parser = DivanParser(
+                engine="http", base_url=f"http://127.0.0.1:{server.server_port}/",
+                rate=0, max_pages=1,
+            )
+            parser.parse_category("mock_divan.html")
+            parser.close()
+        finally:
+            stop_server(server)
+
+        metrics = parser.metrics
+        self.assertEqual(metrics.counter("cards_found"), 3)
+        self.assertEqual(metrics.counter("selector_hits", field="name", selector="span[itemprop='name']"), 3)
+        self.assertEqual(metrics.counter("selector_hits", field="link", selector="a"), 3)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "metrics.json")
+            metrics.write_json(path)
+            with open(path, encoding="utf-8") as f:
+                summary = json.load(f)
+        self.assertEqual(summary["counters"]["cards_found"], 3)
+        self.assertEqual(summary["timers"]['phase_seconds{phase="page_load"}']["count"], 1)
+        self.assertEqual(summary["timers"]['phase_seconds{phase="extraction"}']["count"], 1)
+        self.assertEqual(summary["timers"]["page_seconds"]["count"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
 import unittest
 import os
 from unittest.mock import MagicMock, patch
+from selenium.common.exceptions import NoSuchElementException
 from parser import DivanParser
 
 
@@ -14,7 +15,7 @@ class TestDivanParser(unittest.TestCase):
         if not os.path.exists(cls.mock_html_path):
             raise FileNotFoundError(f"Mock HTML file не найден: {cls.mock_html_path}")
 
-    @patch("parser.webdriver.Chrome")  # Подменяем реальный Chrome
+    @patch("selenium.webdriver.Chrome")  # Подменяем реальный Chrome
     def test_parse_mock_html(self, mock_chrome):
         # Создаем мок-драйвер и мок-элементы
         mock_driver = MagicMock()
@@ -26,6 +27,8 @@ class TestDivanParser(unittest.TestCase):
 
         # Подменяем метод get и find_elements, чтобы вернуть наши мок-элементы
         mock_driver.get.return_value = None
+        # Опрос готовности страницы: три карточки, страница загружена
+        mock_driver.execute_script.return_value = {"cards": 3, "empty": False, "ready": "complete"}
 
         class MockWebElement:
             def __init__(self, name, price, link):
@@ -40,7 +43,7 @@ class TestDivanParser(unittest.TestCase):
                     return MagicMock(text=self._price)
                 if by == "tag name" and value == "a":
                     return MagicMock(get_attribute=MagicMock(return_value=self._link))
-                raise Exception("Не найден элемент")
+                raise NoSuchElementException("Не найден элемент")
 
             def get_attribute(self, attr):
                 return html_content  # Не используем для теста
@@ -83,6 +86,91 @@ class TestDivanParser(unittest.TestCase):
         # Закрываем парсер
         parser.close()
 
+    @patch("selenium.webdriver.Chrome")
+    def test_parse_mock_html_batch(self, mock_chrome):
+        # В режиме batch парсер читает page_source один раз и разбирает его сам
+        mock_driver = MagicMock()
+        mock_chrome.return_value = mock_driver
+
+        with open(self.mock_html_path, "r", encoding="utf-8") as f:
+            mock_driver.page_source = f.read()
+        mock_driver.execute_script.return_value = {"cards": 3, "empty": False, "ready": "complete"}
+
+        parser = DivanParser(headless=True, extraction="batch", max_pages=1)
+        parser.parse_category("svet")
+
+        self.assertEqual(parser.products, [
+            {
+                "name": "Лампа Ralf",
+                "price": "4999 ₽",
+                "link": "https://www.divan.ru/product/torsher-ralf-beige",
+                "category": "svet",
+                "price_kopecks": 499900,
+                "currency": "RUB",
+            },
+            {
+                "name": "Лампа Ferum",
+                "price": "2999 ₽",
+                "link": "https://www.divan.ru/product/podvesnoj-svetilnik-ferum-orange",
+                "category": "svet",
+                "price_kopecks": 299900,
+                "currency": "RUB",
+            },
+            {
+                "name": "Настольная лампа Nidls",
+                "price": "3999 ₽",
+                "link": "https://www.divan.ru/product/nastolnaya-lampa-nidls-raffia-beige",
+                "category": "svet",
+                "price_kopecks": 399900,
+                "currency": "RUB",
+            },
+        ])
+        # Ни одного find_element по карточкам: готовность страницы проверяется
+        # скриптом, а товары берутся из одного снимка страницы
+        mock_driver.find_elements.assert_not_called()
+
+        parser.close()
+
+    @patch("selenium.webdriver.Chrome")
+    def test_empty_category(self, mock_chrome):
+        # Признак пустой категории: ждать карточки до таймаута не нужно
+        mock_driver = MagicMock()
+        mock_chrome.return_value = mock_driver
+        mock_driver.execute_script.return_value = {"cards": 0, "empty": True, "ready": "complete"}
+
+        parser = DivanParser(headless=True, extraction="batch", rate=0)
+        pages = parser.parse_category("empty")
+
+        self.assertEqual(pages, 0)
+        self.assertEqual(parser.products, [])
+        self.assertEqual(parser.stats["empty_pages"], 1)
+        self.assertLess(parser.stats["ready_seconds"], 1)
+        mock_driver.get.assert_called_once()
+        parser.close()
+
+    @patch("selenium.webdriver.Chrome")
+    def test_lean_browser_profile(self, mock_chrome):
+        parser = DivanParser(headless=True, profile_dir="chrome-profile")
+        driver = parser._get_driver()
+
+        options = mock_chrome.call_args.kwargs["options"]
+        self.assertEqual(options.page_load_strategy, "eager")
+        self.assertIn("--disable-extensions", options.arguments)
+        self.assertIn(f"--user-data-dir={os.path.abspath('chrome-profile')}", options.arguments)
+        driver.execute_cdp_cmd.assert_any_call(
+            "Network.setBlockedURLs", {"urls": DivanParser.BLOCKED_URLS}
+        )
+        parser.close()
+
+        # Полный профиль: ничего не блокируется
+        mock_chrome.reset_mock()
+        parser = DivanParser(headless=True, lean_browser=False)
+        driver = parser._get_driver()
+        options = mock_chrome.call_args.kwargs["options"]
+        self.assertEqual(options.page_load_strategy, "normal")
+        driver.execute_cdp_cmd.assert_not_called()
+        parser.close()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+
+from prices import normalize_prices, normalize_batch
+
+
+class TestNormalizePrices(unittest.TestCase):
+    def test_formats(self):
+        self.assertEqual(
+            normalize_prices([
+                "12 990 руб.",
+                "4999 ₽",
+                "12990",
+                "12 990 ₽",
+                "от 1 299,50 $",
+                "€ 12.9",
+                "Не указана",
+                "",
+                None,
+            ]),
+            [
+                (1299000, "RUB"),
+                (499900, "RUB"),
+                (1299000, "RUB"),
+                (1299000, "RUB"),
+                (129950, "USD"),
+                (1290, "EUR"),
+                (None, None),
+                (None, None),
+                (None, None),
+            ],
+        )
+
+    def test_multiline_price_stays_one_row(self):
+        # Перевод строки внутри цены не должен сдвигать результаты
+        self.assertEqual(
+            normalize_prices(["4 990\n₽", "Не указана", "5990"]),
+            [(499000, "RUB"), (None, None), (599000, "RUB")],
+        )
+
+    def test_empty_input(self):
+        self.assertEqual(normalize_prices([]), [])
+        self.assertEqual(normalize_batch([]), [])
+
+    def test_normalize_batch(self):
+        products = [{"price": "13 990 ₽"}, {"price": "Не указана"}]
+        normalize_batch(products)
+        self.assertEqual(products, [
+            {"price": "13 990 ₽", "price_kopecks": 1399000, "currency": "RUB"},
+            {"price": "Не указана", "price_kopecks": None, "currency": None},
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+
+import queries
+from database import add_categories, init_db, save_to_db
+from tests.test_database import product
+
+ROOT = os.path.join(os.path.dirname(__file__), os.pardir)
+
+
+class TestQueries(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_name = os.path.join(self.tmp.name, "products.db")
+        init_db(self.db_name)
+        save_to_db(self.db_name, [
+            product("ralf", "4 999 руб."),
+            product("ferum", "2 999 руб."),
+            product("nidls", "3 999 руб."),
+            product("lampa", "999 руб."),
+            product("bez-ceny", "Не указана"),
+            product("modus", "19 999 руб.", category="divany"),
+        ])
+        self.conn = queries.open_store(self.db_name)
+
+    def tearDown(self):
+        self.conn.close()
+        self.tmp.cleanup()
+
+    def names(self, rows) -> list:
+        return [row["link"].rsplit("/", 1)[-1] for row in rows]
+
+    def test_price_range_pages(self):
+        rows = queries.price_range(self.conn, "svet", 90000, 500000, page_size=2)
+        self.assertEqual(self.names(rows), ["lampa", "ferum", "nidls", "ralf"])
+
+        rows = queries.price_range(self.conn, "svet", min_kopecks=300000, page_size=1)
+        self.assertEqual(self.names(rows), ["nidls", "ralf"])
+
+    def test_category_includes_repeated_products(self):
+        # Диван попал и в распродажу света, но хранится под своей первой категорией
+        add_categories(self.conn, [("https://www.divan.ru/product/modus", "svet")])
+        self.assertEqual(
+            self.names(queries.price_range(self.conn, "svet", 400000, page_size=2)),
+            ["ralf", "modus"],
+        )
+
+    def test_cheapest(self):
+        self.assertEqual(self.names(queries.cheapest(self.conn, 2, page_size=1)), ["lampa", "ferum"])
+        self.assertEqual(self.names(queries.cheapest(self.conn, 10, "divany")), ["modus"])
+
+    def test_price_changes_since(self):
+        with self.conn:
+            self.conn.execute("UPDATE price_history SET changed_at = '2025-01-01 00:00:00'")
+        save_to_db(self.db_name, [product("ralf", "4 499 руб."), product("ferum", "2 999 руб.")])
+
+        changes = list(queries.price_changes(self.conn, "2025-06-01"))
+        self.assertEqual(
+            [(row["link"], row["old_price"], row["new_price"]) for row in changes],
+            [("https://www.divan.ru/product/ralf", "4 999 руб.", "4 499 руб.")],
+        )
+        self.assertEqual(list(queries.price_changes(self.conn, "2025-06-01", "divany")), [])
+        # Первая цена товара изменением не считается
+        self.assertEqual(len(list(queries.price_changes(self.conn, "2024-01-01"))), 1)
+
+    def plan(self, sql: str, params: tuple) -> str:
+        return " ".join(row[3] for row in self.conn.execute(f"EXPLAIN QUERY PLAN {sql}", params))
+
+    def test_queries_use_indexes(self):
+        # Страница категории — проход по индексу без сортировки
+        plan = self.plan(
+            "SELECT id FROM products p WHERE p.category = ? AND p.price_kopecks BETWEEN ? AND ? "
+            "ORDER BY p.price_kopecks, p.id LIMIT 10",
+            ("svet", 0, 100000),
+        )
+        self.assertIn("idx_products_category_price", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+        plan = self.plan("SELECT id FROM price_history WHERE changed_at >= ?", ("2025-06-01",))
+        self.assertIn("idx_price_history_changed", plan)
+
+    def test_missing_db_is_not_created(self):
+        missing = os.path.join(self.tmp.name, "prodcts.db")
+        with self.assertRaises(FileNotFoundError):
+            queries.open_store(missing)
+        with self.assertRaises(SystemExit), redirect_stdout(io.StringIO()):
+            queries.main(["cheapest", "--db", missing])
+        self.assertFalse(os.path.exists(missing))
+
+    def test_cli(self):
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            queries.main([
+                "cheapest", "--db", self.db_name, "--limit", "2", "--output-format", "jsonl",
+            ])
+        rows = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        self.assertEqual([row["price_kopecks"] for row in rows], [99900, 299900])
+        self.assertIn("2", stderr.getvalue())
+
+        stdout = io.StringIO()
+        with redirect_stdout(stdout), redirect_stderr(io.StringIO()):
+            queries.main(["range", "--db", self.db_name, "--category", "svet", "--min", "3000", "--max", "4000"])
+        lines = stdout.getvalue().splitlines()
+        self.assertTrue(lines[0].startswith("id;name;price"))
+        self.assertEqual(len(lines), 2)
+
+    def test_query_subcommand(self):
+        def run(*argv):
+            return subprocess.run(
+                [sys.executable, "sofa_parsing.py", *argv],
+                cwd=ROOT, capture_output=True, text=True, check=True,
+            ).stdout
+
+        # query — подкоманда argparse: её видно в --help
+        self.assertIn("query", run("--help"))
+        output = run("query", "cheapest", "--db", self.db_name, "--limit", "1",
+                     "--output-format", "jsonl")
+        self.assertEqual(json.loads(output)["price_kopecks"], 99900)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import json
+import os
+import pickle
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+from exporters import CSVExporter, JSONExporter, ParquetExporter, SQLiteExporter
+from exporters.parquet_exporter import pq
+from extractor import extract_cards
+from http_cache import PageCache
+from prices import normalize_batch
+from records import Product
+from tests.test_exporters import make_batch
+from tests.helpers import MOCK_PAGES_DIR
+
+
+def as_records(batch: list) -> list:
+    return [Product(item) for item in batch]
+
+
+class TestProduct(unittest.TestCase):
+    def test_behaves_like_dict(self):
+        item = Product(name="Ральф", price="4 999 руб.", link="https://www.divan.ru/product/ralf")
+        item["category"] = "svet"
+        self.assertEqual(item["name"], "Ральф")
+        self.assertNotIn("price_kopecks", item)
+        self.assertIsNone(item.get("price_kopecks"))
+        with self.assertRaises(KeyError):
+            item["price_kopecks"]
+
+        normalize_batch([item])
+        item.update({"brand": "Divan.ru"})
+        self.assertEqual(
+            list(item.keys()),
+            ["name", "price", "link", "category", "price_kopecks", "currency", "brand"],
+        )
+        self.assertEqual(item, {
+            "name": "Ральф", "price": "4 999 руб.", "link": "https://www.divan.ru/product/ralf",
+            "category": "svet", "price_kopecks": 499900, "currency": "RUB", "brand": "Divan.ru",
+        })
+        self.assertEqual(pickle.loads(pickle.dumps(item)), item)
+
+    def test_compact_and_interned(self):
+        fields = dict(name="Ральф", price="4 999 руб.", link="https://www.divan.ru/product/ralf",
+                      category="svet", price_kopecks=499900, currency="RUB")
+        self.assertFalse(hasattr(Product(), "__dict__"))
+        self.assertLess(sys.getsizeof(Product(fields)), sys.getsizeof(dict(fields)) / 2)
+
+        # Одинаковые категория и цена, собранные из разных строк, — один объект
+        first, second = Product(category="".join(["sv", "et"])), Product(category="svet")
+        self.assertIs(first["category"], second["category"])
+        first["price"], second["price"] = "".join(["Не ", "указана"]), "Не указана"
+        self.assertIs(first["price"], second["price"])
+
+    def test_extracted_cards_are_records(self):
+        with open(os.path.join(MOCK_PAGES_DIR, "mock_divan.html"), encoding="utf-8") as f:
+            products = extract_cards(f.read(), "svet")
+        self.assertTrue(all(isinstance(item, Product) for item in products))
+        self.assertEqual(list(products[0].keys()), ["name", "price", "link", "category"])
+
+
+class TestRecordsInExporters(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.batches = [make_batch(0), make_batch(3)]
+        for batch in self.batches:
+            normalize_batch(batch)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def export(self, exporter_class, name: str, batches: list) -> bytes:
+        path = os.path.join(self.tmp.name, name)
+        with exporter_class(path) as exporter:
+            for batch in batches:
+                exporter.write_batch(batch)
+        if name.endswith(".db"):
+            with sqlite3.connect(path) as conn:
+                return repr(conn.execute(
+                    "SELECT name, price, link, category, price_kopecks, currency FROM products ORDER BY id"
+                ).fetchall()).encode()
+        if name.endswith(".parquet"):
+            return repr(pq.read_table(path).to_pylist()).encode()
+        with open(path, "rb") as f:
+            return f.read()
+
+    def test_same_output_as_dicts(self):
+        cases = [
+            (CSVExporter, "csv"), (JSONExporter, "json"), (JSONExporter, "jsonl"), (SQLiteExporter, "db"),
+        ]
+        if pq is not None:
+            cases.append((ParquetExporter, "parquet"))
+        for exporter_class, extension in cases:
+            with self.subTest(extension):
+                records = [as_records(batch) for batch in self.batches]
+                self.assertEqual(
+                    self.export(exporter_class, f"records.{extension}", records),
+                    self.export(exporter_class, f"dicts.{extension}", self.batches),
+                )
+
+    def test_page_cache_returns_records(self):
+        cache = PageCache(os.path.join(self.tmp.name, "cache.sqlite"))
+        cache.put("https://www.divan.ru/category/svet", "<html></html>", products=as_records(self.batches[0]))
+        products = cache.get("https://www.divan.ru/category/svet").products
+        cache.close()
+        self.assertTrue(all(isinstance(item, Product) for item in products))
+        self.assertEqual(products, self.batches[0])
+        self.assertEqual(json.loads(json.dumps(products, default=dict)), self.batches[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+import threading
+import time
+import unittest
+
+from extractor import NO_LINK
+from scheduler import PageScheduler, RateLimiter, page_url
+
+
+def make_page(number: int, size: int = 2) -> list:
+    """Товары одной синтетической страницы."""
+    return [
+        {
+            "name": f"Товар {number}-{i}",
+            "price": "1000",
+            "link": f"https://www.divan.ru/product/{number}-{i}",
+            "category": "svet",
+        }
+        for i in range(size)
+    ]
+
+
+class TestPageScheduler(unittest.TestCase):
+    def test_page_url(self):
+        url = "https://www.divan.ru/category/svet"
+        self.assertEqual(page_url(url, 1), url)
+        self.assertEqual(page_url(url, 3), url + "?page=3")
+        self.assertEqual(page_url(url + "?sort=price&page=2", 4), url + "?sort=price&page=4")
+
+    def test_stops_on_empty_page(self):
+        fetched = []
+
+        def fetch_page(url):
+            fetched.append(url)
+            number = int(url.rsplit("=", 1)[1]) if "page=" in url else 1
+            return make_page(number) if number <= 5 else []
+
+        received = []
+        scheduler = PageScheduler(concurrency=3, rate=0)
+        pages = scheduler.crawl("https://www.divan.ru/category/svet", fetch_page, received.extend)
+
+        self.assertEqual(pages, 5)
+        self.assertEqual(len(received), 10)
+        # После пустой 6-й страницы в работе могли быть максимум ещё две
+        self.assertLessEqual(len(fetched), 8)
+
+    def test_stops_on_repeated_page(self):
+        # Сайт отдаёт последнюю страницу на любой ?page= за пределами каталога
+        def fetch_page(url):
+            number = int(url.rsplit("=", 1)[1]) if "page=" in url else 1
+            return make_page(min(number, 2))
+
+        received = []
+        scheduler = PageScheduler(concurrency=1, rate=0)
+        pages = scheduler.crawl("https://www.divan.ru/category/svet", fetch_page, received.extend)
+
+        self.assertEqual(pages, 2)
+        self.assertEqual(len(received), 4)
+
+    def test_stops_on_repeated_page_without_links(self):
+        # Ссылки не нашлись ни у одной карточки, а сайт повторяет страницу на любой ?page=
+        def fetch_page(url):
+            number = int(url.rsplit("=", 1)[1]) if "page=" in url else 1
+            return [dict(item, link=NO_LINK) for item in make_page(min(number, 2))]
+
+        received = []
+        scheduler = PageScheduler(concurrency=2, rate=0)
+        pages = scheduler.crawl("https://www.divan.ru/category/svet", fetch_page, received.extend)
+
+        self.assertEqual(pages, 2)
+        self.assertEqual(len(received), 4)
+
+    def test_failed_page_is_reported(self):
+        # Ошибка загрузки останавливает обход, но отличается от пустой страницы
+        def fetch_page(url):
+            number = int(url.rsplit("=", 1)[1]) if "page=" in url else 1
+            return None if number == 2 else make_page(number)
+
+        failed = []
+        scheduler = PageScheduler(concurrency=1, rate=0)
+        pages = scheduler.crawl(
+            "https://www.divan.ru/category/svet", fetch_page, lambda products: None,
+            on_failed=failed.append,
+        )
+
+        self.assertEqual(pages, 1)
+        self.assertEqual(failed, ["https://www.divan.ru/category/svet?page=2"])
+
+    def test_page_limit_without_max_pages(self):
+        # Каждая страница новая — обход всё равно конечен
+        scheduler = PageScheduler(concurrency=2, rate=0)
+        scheduler.PAGE_LIMIT = 7
+        pages = scheduler.crawl(
+            "https://www.divan.ru/category/svet",
+            lambda url: make_page(int(url.rsplit("=", 1)[1]) if "page=" in url else 1),
+            lambda products: None,
+        )
+        self.assertEqual(pages, 7)
+
+    def test_concurrency_limit_and_max_pages(self):
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def fetch_page(url):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.02)
+            with lock:
+                active -= 1
+            number = int(url.rsplit("=", 1)[1]) if "page=" in url else 1
+            return make_page(number)
+
+        received = []
+        scheduler = PageScheduler(concurrency=3, rate=0, max_pages=9)
+        pages = scheduler.crawl("https://www.divan.ru/category/svet", fetch_page, received.extend)
+
+        self.assertEqual(pages, 9)
+        self.assertEqual(peak, 3)
+
+    def test_rate_limiter(self):
+        limiter = RateLimiter(rate=50)  # не чаще раза в 20 мс
+        start = time.monotonic()
+        for _ in range(5):
+            limiter.wait("https://www.divan.ru/category/svet")
+        self.assertGreaterEqual(time.monotonic() - start, 0.08)
+
+        # Другой хост ограничивается отдельно
+        start = time.monotonic()
+        limiter.wait("http://127.0.0.1/")
+        self.assertLess(time.monotonic() - start, 0.02)
+
+    def test_rate_limiter_follows_latency(self):
+        # Сервер отвечает за 50 мс — запросы к нему не чаще, чем он успевает ответить
+        limiter = RateLimiter(rate=1000)
+        url = "https://www.divan.ru/category/svet"
+        limiter.observe(url, 0.05)
+        self.assertEqual(limiter.wait(url), 0)
+        self.assertGreaterEqual(limiter.wait(url), 0.04)
+
+    def test_page_stats(self):
+        def fetch_page(url):
+            time.sleep(0.01)
+            return make_page(1) if "page=" not in url else []
+
+        scheduler = PageScheduler(rate=0)
+        scheduler.crawl("https://www.divan.ru/category/svet", fetch_page, lambda products: None)
+
+        self.assertEqual(scheduler.stats["pages"], 2)
+        self.assertGreaterEqual(scheduler.stats["load_seconds"], 0.02)
+        self.assertEqual(scheduler.stats["throttle_seconds"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
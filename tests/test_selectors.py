@@ -0,0 +1,116 @@
+import json
+import os
+import tempfile
+import unittest
+
+from extractor import FIELDS, SelectorStrategy, extract_cards, load_fields
+
+try:
+    import yaml
+except ImportError:  # PyYAML нужен только для конфигурации в YAML
+    yaml = None
+
+EXAMPLE_CONFIG = os.path.join(os.path.dirname(__file__), os.pardir, "examples", "selectors.yaml")
+
+CARD = """
+<div data-testid="product-card">
+    <a data-testid="product-title" href="/product/{0}">Диван {0}</a>
+    <span data-testid="price">{0}0 000 ₽</span>
+</div>
+"""
+
+
+def build_page(cards: int) -> str:
+    return "<html><body>" + "".join(CARD.format(i) for i in range(cards)) + "</body></html>"
+
+
+class TestSelectorStrategy(unittest.TestCase):
+    def test_learned_order(self):
+        strategy = SelectorStrategy()
+        products = extract_cards(
+            build_page(3), "divany", base_url="https://www.divan.ru/", strategy=strategy
+        )
+
+        self.assertEqual(products[1], {
+            "name": "Диван 1",
+            "price": "10 000 ₽",
+            "link": "https://www.divan.ru/product/1",
+            "category": "divany",
+        })
+        # Сработавшие селекторы теперь пробуются первыми
+        self.assertEqual(strategy.chains["name"][0][0], "a[data-testid='product-title']")
+        self.assertEqual(strategy.chains["price"][0][0], "span[data-testid='price']")
+        self.assertEqual(strategy.report()["price"][0], ("span[data-testid='price']", 3))
+
+        # Порядок не меняет результат
+        self.assertEqual(
+            extract_cards(build_page(3), "divany", base_url="https://www.divan.ru/", strategy=strategy),
+            products,
+        )
+
+    def test_learning_keeps_value_of_matching_selectors(self):
+        both = (
+            '<div data-testid="product-card"><a href="/product/{0}">Лампа {0}</a>'
+            '<meta itemprop="price" content="4999"><span class="ui-LD-ZU TA0JV">4999 ₽</span></div>'
+        )
+        text_only = (
+            '<div data-testid="product-card"><a href="/product/{0}">Лампа {0}</a>'
+            '<span class="ui-LD-ZU TA0JV">2999 ₽</span></div>'
+        )
+        strategy = SelectorStrategy()
+        # На первой карточке сработали оба селектора цены, дальше — только текстовый
+        first = extract_cards(
+            "<html><body>" + both.format(0) + "".join(text_only.format(i) for i in range(1, 4))
+            + "</body></html>",
+            "svet", strategy=strategy,
+        )
+        self.assertEqual([item["price"] for item in first], ["4999", "2999 ₽", "2999 ₽", "2999 ₽"])
+
+        # Текстовый селектор срабатывает чаще, но не обгоняет meta: цена карточки с обоими
+        # по-прежнему из meta, как в порядке конфигурации
+        self.assertEqual(
+            [selector for selector, _ in strategy.chains["price"][:2]],
+            ["meta[itemprop='price']", ".ui-LD-ZU.TA0JV"],
+        )
+        second = extract_cards(
+            "<html><body>" + text_only.format(4) + both.format(5) + "</body></html>",
+            "svet", strategy=strategy,
+        )
+        self.assertEqual([item["price"] for item in second], ["2999 ₽", "4999"])
+
+    def test_static_order(self):
+        strategy = SelectorStrategy(learn=False)
+        extract_cards(build_page(2), "divany", strategy=strategy)
+        self.assertEqual(strategy.chains["price"], FIELDS["price"]["selectors"])
+
+    @unittest.skipIf(yaml is None, "PyYAML не установлен")
+    def test_load_example_config(self):
+        fields = load_fields(EXAMPLE_CONFIG)
+        self.assertEqual(fields, FIELDS)
+
+    def test_partial_config_keeps_builtin_fields(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "selectors.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "price": {"selectors": [{"css": "span[data-testid='price']"}]},
+                    "brand": {"selectors": [{"css": "meta[itemprop='brand']", "attr": "content"}]},
+                }, f)
+            fields = load_fields(path)
+            self.assertEqual(list(fields), ["name", "price", "link", "brand"])
+            self.assertEqual(fields["price"], {
+                "selectors": [("span[data-testid='price']", None)], "default": FIELDS["price"]["default"],
+            })
+            self.assertEqual(fields["link"], FIELDS["link"])
+            # Карточки по такой конфигурации разбираются со ссылками
+            products = extract_cards(build_page(2), "divany", strategy=SelectorStrategy(fields))
+            self.assertEqual(products[0]["link"], "/product/0")
+
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"link": {"default": "нет"}}, f)
+            with self.assertRaisesRegex(ValueError, "link"):
+                load_fields(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+
+from parser import DivanParser
+from tests.helpers import MockSiteTestCase
+from workers import BrowserWorkerPool
+
+
+class CrashOnceParser(DivanParser):
+    """Парсер, процесс которого падает на категории 'crash' при первой попытке."""
+
+    def __init__(self, marker: str, **kwargs):
+        super().__init__(**kwargs)
+        self.marker = marker
+
+    def parse_category(self, category, on_page=None):
+        if category == "crash":
+            if not os.path.exists(self.marker):
+                open(self.marker, "w").close()
+                os._exit(1)  # имитация упавшего Chrome
+            category = "mock_divan.html"
+        return super().parse_category(category, on_page)
+
+
+class TestBrowserWorkerPool(MockSiteTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.parser_kwargs = dict(
+            engine="http",
+            base_url=cls.base_url,
+            rate=0,
+            js_fallback=False,
+        )
+
+    def test_merge_results(self):
+        pool = BrowserWorkerPool(2, self.parser_kwargs)
+        products = pool.run(["mock_divan.html", "missing", "mock_divan.html?copy"])
+
+        # Результаты объединены в порядке категорий
+        self.assertEqual(len(products), 6)
+        self.assertEqual(products[0]["category"], "mock_divan.html")
+        self.assertEqual(products[3]["category"], "mock_divan.html?copy")
+        self.assertEqual(pool.failed, [])
+
+    def test_crashed_worker_is_restarted(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            pool = BrowserWorkerPool(
+                2,
+                dict(self.parser_kwargs, marker=os.path.join(tmp, "crashed")),
+                parser_class=CrashOnceParser,
+            )
+            products = pool.run(["crash", "mock_divan.html"])
+
+        # Упавшая категория повторена в новом процессе
+        self.assertEqual(len(products), 6)
+        self.assertEqual(pool.failed, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
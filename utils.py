@@ -1,11 +1,12 @@
 import logging
 import argparse
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.remote.webdriver import WebDriver
-from selenium.webdriver.remote.webelement import WebElement
-from typing import List
+import time
+from typing import List, Sequence, Tuple, TYPE_CHECKING
+
+# Selenium импортируется внутри функций: без браузера (--help, движок http) он не нужен
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+    from selenium.webdriver.remote.webelement import WebElement
 
 
 # ====== ЛОГГЕР ======
@@ -26,22 +27,89 @@ def get_logger(name: str = "DivanParser", level: int = logging.INFO) -> logging.
 
 
 # ====== WebDriverWait ОБЁРТКИ ======
-def wait_for_element(driver: WebDriver, selector: str, timeout: int = 20) -> WebElement:
+def wait_for_element(driver: "WebDriver", selector: str, timeout: int = 20) -> "WebElement":
     """
     Ожидание появления одного элемента на странице.
     """
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
     return WebDriverWait(driver, timeout).until(
         EC.presence_of_element_located((By.CSS_SELECTOR, selector))
     )
 
 
-def wait_for_elements(driver: WebDriver, selector: str, timeout: int = 20) -> List[WebElement]:
+def wait_for_elements(driver: "WebDriver", selector: str, timeout: int = 20,
+                      poll: float = 0.2) -> List["WebElement"]:
     """
     Ожидание появления списка элементов на странице.
+    Возвращает элементы, как только их число перестало расти между опросами,
+    а не первые появившиеся.
     """
-    return WebDriverWait(driver, timeout).until(
-        EC.presence_of_all_elements_located((By.CSS_SELECTOR, selector))
-    )
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    previous = []
+
+    def settled(driver):
+        nonlocal previous
+        elements = driver.find_elements(By.CSS_SELECTOR, selector)
+        stable = elements and len(elements) == len(previous)
+        previous = elements
+        return elements if stable else False
+
+    return WebDriverWait(driver, timeout, poll_frequency=poll).until(settled)
+
+
+# Один запрос к WebDriver на опрос: число карточек, признак пустой страницы, readyState
+_PROBE_SCRIPT = """
+return {
+    cards: document.querySelectorAll(arguments[0]).length,
+    empty: arguments[1].some(function (s) { return document.querySelector(s) !== null; }),
+    ready: document.readyState
+};
+"""
+
+
+def wait_for_cards(driver: "WebDriver", selector: str, empty_selectors: Sequence[str] = (),
+                   timeout: float = 20, poll: float = 0.2,
+                   empty_grace: float = 5) -> Tuple[int, float]:
+    """
+    Адаптивное ожидание карточек вместо фиксированного таймаута.
+
+    Страница считается готовой, как только число карточек перестало расти
+    между двумя опросами. Пустая категория распознаётся сразу — по
+    empty_selectors — или когда страница загружена (readyState complete),
+    а карточек нет дольше empty_grace секунд.
+
+    :param selector: CSS-селектор карточки
+    :param empty_selectors: Селекторы признаков пустой категории
+    :param timeout: Предельное время ожидания
+    :param poll: Пауза между опросами
+    :param empty_grace: Сколько ждать карточки на загруженной странице без них
+    :return: (число карточек — 0 для пустой категории, сколько секунд ждали)
+    :raises TimeoutException: если страница так и не стала готовой
+    """
+    start = time.monotonic()
+    previous = -1
+    while True:
+        state = driver.execute_script(_PROBE_SCRIPT, selector, list(empty_selectors))
+        waited = time.monotonic() - start
+        cards = state["cards"]
+
+        if cards and cards == previous:
+            return cards, waited
+        if not cards and (
+            state["empty"] or (state["ready"] == "complete" and waited >= empty_grace)
+        ):
+            return 0, waited
+        if waited >= timeout:
+            from selenium.common.exceptions import TimeoutException
+            raise TimeoutException(f"карточки не появились за {timeout} с")
+
+        previous = cards
+        time.sleep(poll)
 
 
 # ====== ARGPARSE ======
@@ -63,13 +131,20 @@ def parse_args():
         "--format",
         type=str,
         default="sqlite",
-        choices=["csv", "json", "sqlite"],
-        help="Формат экспорта: csv / json / sqlite"
+        choices=["csv", "json", "sqlite", "parquet"],
+        help="Формат экспорта: csv / json / sqlite / parquet"
     )
     parser.add_argument(
         "--headless",
         action="store_true",
         help="Запуск браузера в headless-режиме"
     )
+    parser.add_argument(
+        "--engine",
+        type=str,
+        default="selenium",
+        choices=["selenium", "http"],
+        help="Загрузка страниц: selenium / http"
+    )
 
     return parser.parse_args()
\ No newline at end of file
@@ -0,0 +1,179 @@
+import multiprocessing
+import os
+import queue
+from collections import deque
+from typing import List, Dict
+
+from parser import DivanParser
+
+
+def _worker_main(worker_id: int, tasks, results, parser_class, parser_kwargs: dict):
+    """
+    Цикл рабочего процесса: один парсер (и один Chrome) на всё время жизни процесса.
+    При любой ошибке категории процесс сообщает о ней и завершается —
+    координатор поднимет вместо него новый.
+    """
+    if parser_kwargs.get("profile_dir"):
+        # Профиль Chrome нельзя открыть из двух браузеров сразу — у процесса свой
+        parser_kwargs = {
+            **parser_kwargs,
+            "profile_dir": os.path.join(parser_kwargs["profile_dir"], f"worker-{worker_id}"),
+        }
+    divan_parser = parser_class(**parser_kwargs)
+    try:
+        while True:
+            category = tasks.get()
+            if category is None:
+                break
+
+            products = []
+            try:
+                divan_parser.parse_category(category, on_page=products.extend)
+            except Exception as e:
+                results.put(("failed", worker_id, category, repr(e)))
+                return
+            if category in divan_parser.failed_categories:
+                # Недогруженная категория уходит на повтор целиком
+                results.put(("failed", worker_id, category, "страница не загрузилась"))
+                return
+            results.put(("done", worker_id, category, products))
+    finally:
+        try:
+            divan_parser.close()
+        except Exception:
+            pass  # браузер мог уже упасть
+
+
+class BrowserWorkerPool:
+    """
+    Пул долгоживущих процессов-парсеров для обхода нескольких категорий параллельно.
+
+    Каждый процесс создаёт свой DivanParser один раз и переиспользует его для
+    всех выданных ему категорий. Если процесс упал (например, вместе с Chrome)
+    или категория завершилась ошибкой, перезапускается только этот процесс,
+    а его категория возвращается в очередь.
+    """
+
+    def __init__(self, workers: int, parser_kwargs: dict = None,
+                 parser_class=DivanParser, max_attempts: int = 3, logger=None):
+        """
+        :param workers: Число рабочих процессов
+        :param parser_kwargs: Аргументы DivanParser для каждого процесса
+        :param parser_class: Класс парсера (DivanParser или его наследник)
+        :param max_attempts: Сколько раз пробовать категорию, прежде чем отказаться
+        :param logger: Опциональный логгер
+        """
+        self.workers = max(1, workers)
+        self.parser_kwargs = parser_kwargs or {}
+        self.parser_class = parser_class
+        self.max_attempts = max_attempts
+        self.logger = logger
+        self.failed = []  # категории, которые так и не удалось обойти
+
+        self._context = multiprocessing.get_context()
+        self._results = self._context.Queue()
+        self._processes = {}  # worker_id -> (процесс, очередь задач)
+        self._current = {}    # worker_id -> категория в работе
+
+    def _log(self, level: str, message: str):
+        if self.logger:
+            getattr(self.logger, level)(message)
+        else:
+            print(message)
+
+    def _start_worker(self, worker_id: int):
+        """Запуск (или перезапуск) рабочего процесса."""
+        tasks = self._context.Queue()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(worker_id, tasks, self._results, self.parser_class, self.parser_kwargs),
+            daemon=True,
+        )
+        process.start()
+        self._processes[worker_id] = (process, tasks)
+        self._current[worker_id] = None
+
+    def _restart_worker(self, worker_id: int):
+        process, _ = self._processes[worker_id]
+        process.join(timeout=5)
+        if process.is_alive():
+            process.terminate()
+            process.join()
+        self._log("warning", f"Перезапускаю рабочий процесс #{worker_id}")
+        self._start_worker(worker_id)
+
+    def run(self, categories: List[str], on_batch=None) -> List[Dict]:
+        """
+        Обходим категории и возвращаем товары всех категорий одним списком
+        (в порядке категорий на входе).
+
+        :param on_batch: Если задан, вызывается как on_batch(category, products) для каждой
+            категории сразу по готовности, а в памяти товары не копятся
+            (возвращается пустой список)
+        """
+        pending = deque(categories)
+        attempts = {category: 0 for category in categories}
+        results = {}
+        self.failed = []
+
+        def retry(worker_id: int, category: str, reason: str):
+            self._current[worker_id] = None
+            if attempts[category] >= self.max_attempts:
+                self._log("error", f"Категория {category} пропущена: {reason}")
+                self.failed.append(category)
+            else:
+                self._log("warning", f"Категория {category} вернулась в очередь: {reason}")
+                pending.appendleft(category)
+            self._restart_worker(worker_id)
+
+        for worker_id in range(min(self.workers, len(categories))):
+            self._start_worker(worker_id)
+
+        try:
+            while pending or any(self._current.values()):
+                # Раздаём категории свободным процессам
+                for worker_id, (_, tasks) in self._processes.items():
+                    if pending and self._current[worker_id] is None:
+                        category = pending.popleft()
+                        attempts[category] += 1
+                        self._current[worker_id] = category
+                        tasks.put(category)
+
+                try:
+                    status, worker_id, category, payload = self._results.get(timeout=0.5)
+                except queue.Empty:
+                    pass
+                else:
+                    if self._current.get(worker_id) == category:
+                        if status == "done":
+                            self._current[worker_id] = None
+                            self._log("info", f"Категория {category}: {len(payload)} товаров")
+                            if on_batch is not None:
+                                on_batch(category, payload)
+                            else:
+                                results[category] = payload
+                        else:
+                            retry(worker_id, category, payload)
+                    continue
+
+                # Процесс умер, не успев ответить
+                for worker_id, (process, _) in list(self._processes.items()):
+                    category = self._current[worker_id]
+                    if category is not None and not process.is_alive():
+                        retry(worker_id, category, f"процесс завершился с кодом {process.exitcode}")
+        finally:
+            self.close()
+
+        return [item for category in categories for item in results.get(category, [])]
+
+    def close(self):
+        """Останавливаем все рабочие процессы."""
+        for process, tasks in self._processes.values():
+            if process.is_alive():
+                tasks.put(None)
+        for process, _ in self._processes.values():
+            process.join(timeout=10)
+            if process.is_alive():
+                process.terminate()
+        self._processes.clear()
+        self._current.clear()